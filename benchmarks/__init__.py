@@ -0,0 +1,10 @@
+"""
+Benchmarks for CityTime.
+
+Run all of them from the repository root with:
+
+    python -m benchmarks
+
+See benchmarks/__main__.py for the options controlling output, baselines and thresholds.
+
+"""
@@ -0,0 +1,95 @@
+"""
+Run the CityTime benchmarks and compare them against a stored baseline.
+
+    python -m benchmarks                        # run, print JSON, compare with baseline.json
+    python -m benchmarks -o results.json        # write the JSON report to a file
+    python -m benchmarks --save-baseline        # store this run as the new baseline
+    python -m benchmarks -k 'range_*' -t 0.5    # only Range benchmarks, allow 50% slowdown
+    python -m benchmarks scenarios --steps 5    # scenario benchmarks at 5 doubling sizes
+    python -m benchmarks importtime -r 20       # cold start, median of 20 interpreter runs
+
+The exit status is 1 if any benchmark regressed beyond its threshold.
+
+"""
+
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from . import harness
+from . import importtime
+from . import micro
+from . import scenarios
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+SUITES = [micro.SUITE, scenarios.SUITE, importtime.SUITE]
+
+
+def parse_args(argv: Optional[List[str]]=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('suites', nargs='*', metavar='suite',
+                        help='Suites to run: {} (default: all).'.format(', '.join(SUITES)))
+    parser.add_argument('-k', '--filter', dest='pattern', default=None,
+                        help='Only run benchmarks whose name matches this fnmatch pattern.')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Write the JSON report to this file instead of stdout.')
+    parser.add_argument('-b', '--baseline', default=BASELINE,
+                        help='Baseline report to compare against (default: %(default)s).')
+    parser.add_argument('-t', '--threshold', type=float, default=harness.DEFAULT_THRESHOLD,
+                        help='Allowed slowdown as a fraction of the baseline (default: %(default)s).')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='Number of timing runs per benchmark, or interpreter runs per import time '
+                             'snippet (default: %(default)s).')
+    parser.add_argument('--steps', type=int, default=4,
+                        help='Number of doubling input sizes per scenario (default: %(default)s).')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiplier for the base input size of scenarios (default: %(default)s).')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store the results as the new baseline instead of comparing.')
+    args = parser.parse_args(argv)
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error('unknown suite {!r}'.format(suite))
+    return args
+
+
+def run(suite: str, args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    if suite == scenarios.SUITE:
+        return scenarios.run_suite(args.pattern, args.steps, args.scale)
+    if suite == importtime.SUITE:
+        return importtime.run_suite(args.pattern, args.repeat)
+    return harness.run_suite(suite, args.pattern, args.repeat)
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    args = parse_args(argv)
+    results = {}
+    for suite in args.suites or SUITES:
+        for name, result in run(suite, args).items():
+            results['{}.{}'.format(suite, name)] = result
+    report = {'environment': harness.environment(), 'results': results}
+
+    if args.save_baseline:
+        if os.path.exists(args.baseline):
+            # Keep hand tuned per-benchmark thresholds.
+            report['thresholds'] = harness.load(args.baseline).get('thresholds', {})
+        harness.dump(report, args.baseline)
+        return 0
+
+    harness.dump(report, args.output)
+    if not os.path.exists(args.baseline):
+        return 0
+    regressions = harness.compare(results, harness.load(args.baseline), args.threshold)
+    for regression in regressions:
+        sys.stderr.write('REGRESSION {0.name}: {0.baseline_ns:.0f} ns -> {0.current_ns:.0f} ns '
+                         '({0.ratio:.2f}x, allowed {1:.2f}x)\n'.format(regression, 1 + regression.threshold))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
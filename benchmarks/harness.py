@@ -0,0 +1,178 @@
+"""
+Timing harness shared by the benchmark suites.
+
+A benchmark is a factory registered with the @benchmark decorator. The factory does all of
+the setup work and returns a zero argument callable, which is the only thing that is timed.
+A factory that has to clean up afterwards, e.g. remove temporary files, is a generator instead:
+it yields the callable once and cleans up when it resumes (see prepared()).
+Results are plain dictionaries so that they can be written out as JSON and compared with a
+stored baseline later.
+
+"""
+
+
+import contextlib
+import fnmatch
+import json
+import platform
+import sys
+import timeit
+import types
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import citytime
+
+
+Operation = Callable[[], Any]
+# Returns an Operation, or a generator yielding one.
+Factory = Callable[[], Any]
+
+_REGISTRY: Dict[str, Dict[str, Factory]] = {}
+
+DEFAULT_THRESHOLD = 0.25
+
+
+class Regression(NamedTuple):
+    """
+    A benchmark that got slower than its baseline by more than the allowed threshold.
+    """
+    name: str
+    baseline_ns: float
+    current_ns: float
+    ratio: float
+    threshold: float
+
+
+def benchmark(suite: str, name: Optional[str]=None) -> Callable[[Factory], Factory]:
+    """
+    Register a benchmark factory under the given suite.
+
+    The name defaults to the name of the decorated function.
+    """
+    def register(factory: Factory) -> Factory:
+        _REGISTRY.setdefault(suite, {})[name or factory.__name__] = factory
+        return factory
+    return register
+
+
+def registered(suite: str) -> Dict[str, Factory]:
+    """
+    Returns the benchmark factories registered for a suite, by name.
+
+    :rtype: dict
+    """
+    return dict(_REGISTRY.get(suite, {}))
+
+
+@contextlib.contextmanager
+def prepared(factory: Factory) -> Iterator[Operation]:
+    """
+    Run a factory and provide the operation it returns or yields, cleaning up after a generator
+    factory when the with block ends.
+    """
+    result = factory()
+    if not isinstance(result, types.GeneratorType):
+        yield result
+        return
+    generator: Iterator[Operation] = result
+    try:
+        yield next(generator)
+    finally:
+        next(generator, None)
+
+
+def measure(operation: Operation, repeat: int=5) -> Dict[str, float]:
+    """
+    Time a single operation.
+
+    The number of calls per run is picked by timeit's autorange (at least 0.2 seconds per run),
+    and the best of 'repeat' runs is reported, which is the figure least disturbed by other
+    activity on the machine.
+
+    :rtype: dict
+    """
+    timer = timeit.Timer(operation)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {
+        'ns_per_op': best * 1e9,
+        'ops_per_sec': 1 / best if best else float('inf'),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def run_suite(suite: str, pattern: Optional[str]=None, repeat: int=5) -> Dict[str, Dict[str, float]]:
+    """
+    Run every benchmark of a suite whose name matches the optional fnmatch pattern.
+
+    :rtype: dict
+    """
+    results = {}
+    for name, factory in sorted(registered(suite).items()):
+        if pattern and not fnmatch.fnmatch(name, pattern):
+            continue
+        with prepared(factory) as operation:
+            results[name] = measure(operation, repeat=repeat)
+    return results
+
+
+def environment() -> Dict[str, str]:
+    """
+    Describe the interpreter and library versions the results were produced with.
+
+    :rtype: dict
+    """
+    import pytz
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'citytime': citytime.__version__,
+        'pytz': pytz.__version__,
+    }
+
+
+def compare(
+        current: Dict[str, Dict[str, float]],
+        baseline: Dict[str, Any],
+        threshold: float=DEFAULT_THRESHOLD,
+) -> List[Regression]:
+    """
+    Compare results with a baseline report.
+
+    A benchmark regresses when its time per operation exceeds the baseline by more than
+    the threshold (0.25 = 25% slower). The baseline may override the threshold of individual
+    benchmarks in its 'thresholds' mapping. Benchmarks missing from either side are ignored.
+
+    :rtype: list
+    """
+    baseline_results = baseline.get('results', {})
+    overrides = baseline.get('thresholds', {})
+    regressions = []
+    for name, result in sorted(current.items()):
+        if name not in baseline_results:
+            continue
+        baseline_ns = baseline_results[name]['ns_per_op']
+        allowed = overrides.get(name, threshold)
+        ratio = result['ns_per_op'] / baseline_ns
+        if ratio > 1 + allowed:
+            regressions.append(Regression(name, baseline_ns, result['ns_per_op'], ratio, allowed))
+    return regressions
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dump(data: Dict[str, Any], path: Optional[str]=None) -> None:
+    """
+    Write a report as JSON to the given path, or to stdout if no path is given.
+    """
+    text = json.dumps(data, indent=2, sort_keys=True)
+    if path is None or path == '-':
+        sys.stdout.write(text + '\n')
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
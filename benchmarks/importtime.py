@@ -0,0 +1,103 @@
+"""
+Cold start benchmarks.
+
+Each snippet is run in a fresh interpreter with 'python -X importtime', several times. The report
+gives the median wall clock time of the whole interpreter run (ns_per_op), the median cumulative
+import time of the citytime package as reported by -X importtime, and which of the heavier
+dependencies the snippet ended up importing.
+
+"""
+
+
+import fnmatch
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import citytime
+
+
+SUITE = 'importtime'
+
+SNIPPETS = {
+    'interpreter': 'pass',
+    'import_citytime': 'import citytime',
+    'import_names': 'from citytime import CityTime, Range',
+    'first_conversion': (
+        'import datetime\n'
+        'from citytime import CityTime\n'
+        'CityTime(datetime.datetime(2018, 1, 1), "Asia/Kolkata").local()'
+    ),
+}
+
+WATCHED_MODULES = ('pytz', 'calendar', 'zoneinfo')
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)\s*$')
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    source = os.path.dirname(os.path.dirname(os.path.abspath(citytime.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [source, env.get('PYTHONPATH')]))
+    return env
+
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    """
+    Returns the cumulative import time in microseconds of every module in -X importtime output.
+
+    :rtype: dict
+    """
+    modules = {}
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    return modules
+
+
+def run_snippet(code: str) -> Dict[str, Any]:
+    """
+    Run a snippet once in a fresh interpreter.
+
+    :rtype: dict
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        env=_environment(), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True,
+    )
+    seconds = time.perf_counter() - start
+    return {'seconds': seconds, 'modules': parse_importtime(completed.stderr)}
+
+
+def _imported(module: str, modules: Dict[str, int]) -> bool:
+    # -X importtime doesn't always report the package itself when it is imported from a
+    # function, but it does report its submodules.
+    return any(name == module or name.startswith(module + '.') for name in modules)
+
+
+def run_suite(pattern: Optional[str]=None, runs: int=5) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every snippet whose name matches the optional fnmatch pattern 'runs' times.
+
+    :rtype: dict
+    """
+    results = {}
+    for name, code in sorted(SNIPPETS.items()):
+        if pattern and not fnmatch.fnmatch(name, pattern):
+            continue
+        samples: List[Dict[str, Any]] = [run_snippet(code) for _ in range(runs)]
+        imported = samples[-1]['modules']
+        results[name] = {
+            'ns_per_op': statistics.median(s['seconds'] for s in samples) * 1e9,
+            'citytime_import_us': statistics.median(s['modules'].get('citytime', 0) for s in samples),
+            'module_count': len(imported),
+            'imports': {module: _imported(module, imported) for module in WATCHED_MODULES},
+        }
+    return results
@@ -0,0 +1,482 @@
+"""
+Micro-benchmarks for the CityTime and Range hot paths.
+
+Each benchmark times one call of one method on a prepared object. Benchmarks of the methods
+that go through the time zone backend are also registered with a _zoneinfo suffix, running the
+same call on the zoneinfo backend instead of pytz.
+
+"""
+
+
+import datetime
+import logging
+import os
+import random
+import tempfile
+from typing import Any, Callable, Iterator
+
+import pytz
+
+import citytime
+from citytime import (
+    CityTime, Clock, CronSchedule, Formatter, Range, format_many, get_zone, histogram, histogram_by_zone,
+    next_fire_times, upcoming_transitions, validate_local,
+)
+from citytime.logformat import ZoneFormatter
+from citytime.scheduler import Scheduler
+from citytime.registry import get_registry
+from citytime.snapshot import Snapshot, build_snapshot
+from citytime.tables import compile_table
+
+from .harness import benchmark
+
+
+SUITE = 'micro'
+
+ZONE = 'America/New_York'
+LOCAL_TIME = datetime.datetime(2018, 6, 1, 12, 30)
+ISO_TIME = '2018-06-01T16:30:00'
+HOUR = datetime.timedelta(hours=1)
+
+
+def _city_time(backend: str='pytz') -> CityTime:
+    return CityTime(LOCAL_TIME, ZONE, backend=backend)
+
+
+def _ranges(count: int) -> list:
+    rng = random.Random(27)
+    start = _city_time()
+    ranges = []
+    for _ in range(count):
+        begin = start + datetime.timedelta(minutes=rng.randrange(0, 60 * 24 * 30))
+        ranges.append(Range(begin, datetime.timedelta(minutes=rng.randrange(1, 600))))
+    return ranges
+
+
+@benchmark(SUITE)
+def construct_citytime() -> Callable[[], Any]:
+    ct = _city_time()
+    return lambda: CityTime(ct)
+
+
+@benchmark(SUITE)
+def compare_eq() -> Callable[[], Any]:
+    a, b = _city_time(), _city_time()
+    return lambda: a == b
+
+
+@benchmark(SUITE)
+def compare_lt() -> Callable[[], Any]:
+    a, b = _city_time(), _city_time() + HOUR
+    return lambda: a < b
+
+
+@benchmark(SUITE)
+def epoch() -> Callable[[], Any]:
+    return _city_time().epoch
+
+
+@benchmark(SUITE)
+def epoch_ms() -> Callable[[], Any]:
+    return _city_time().epoch_ms
+
+
+@benchmark(SUITE)
+def from_epoch_ms() -> Callable[[], Any]:
+    return lambda: CityTime.from_epoch(1527870615000, ZONE, unit='ms')
+
+
+@benchmark(SUITE)
+def from_epoch_many_ms_1000() -> Callable[[], Any]:
+    values = [1527870615000 + i * 60000 for i in range(1000)]
+    return lambda: CityTime.from_epoch_many(values, ZONE, unit='ms')
+
+
+@benchmark(SUITE)
+def range_create() -> Callable[[], Any]:
+    a, b = _city_time(), _city_time() + HOUR
+    return lambda: Range(a, b)
+
+
+@benchmark(SUITE)
+def range_create_timedelta() -> Callable[[], Any]:
+    a = _city_time()
+    return lambda: Range(a, HOUR)
+
+
+@benchmark(SUITE)
+def range_overlaps() -> Callable[[], Any]:
+    a = Range(_city_time(), HOUR)
+    b = Range(_city_time() + datetime.timedelta(minutes=30), HOUR)
+    return lambda: a.overlaps(b)
+
+
+@benchmark(SUITE)
+def range_intersection() -> Callable[[], Any]:
+    a = Range(_city_time(), HOUR)
+    b = Range(_city_time() + datetime.timedelta(minutes=30), HOUR)
+    return lambda: a.intersection(b)
+
+
+@benchmark(SUITE)
+def sort_citytimes_1000() -> Callable[[], Any]:
+    rng = random.Random(27)
+    start = _city_time()
+    times = [start + datetime.timedelta(seconds=rng.randrange(0, 10 ** 7)) for _ in range(1000)]
+    return lambda: sorted(times)
+
+
+@benchmark(SUITE)
+def group_by_zone_1000() -> Callable[[], Any]:
+    rng = random.Random(27)
+    zones = ['America/New_York', 'Europe/London', 'Asia/Kolkata', 'Asia/Tokyo', 'Australia/Sydney']
+    start = _city_time()
+    times = []
+    for _ in range(1000):
+        ct = start + datetime.timedelta(seconds=rng.randrange(0, 10 ** 7))
+        ct.change_tz(rng.choice(zones))
+        times.append(ct)
+
+    def group() -> Any:
+        groups: dict = {}
+        for ct in times:
+            groups.setdefault(ct.zone(), []).append(ct)
+        return groups
+    return group
+
+
+@benchmark(SUITE)
+def sort_ranges_100() -> Callable[[], Any]:
+    ranges = _ranges(100)
+    return lambda: sorted(ranges)
+
+
+@benchmark(SUITE)
+def compile_zone_table() -> Callable[[], Any]:
+    tz = pytz.timezone(ZONE)
+    return lambda: compile_table(ZONE, tz)
+
+
+@benchmark(SUITE)
+def snapshot_zone_table() -> Iterator[Callable[[], Any]]:
+    with tempfile.TemporaryDirectory() as directory:
+        snap = Snapshot(build_snapshot(os.path.join(directory, 'zones.bin'), [ZONE]))
+        yield lambda: snap.table(ZONE)
+
+
+@benchmark(SUITE)
+def snapshot_open() -> Iterator[Callable[[], Any]]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = build_snapshot(os.path.join(directory, 'zones.bin'))
+        yield lambda: Snapshot(path)
+
+
+def _week_of_stamps() -> list:
+    rng = random.Random(27)
+    return [1528000000 + rng.randrange(0, 7 * 86400) for _ in range(500)]
+
+
+@benchmark(SUITE)
+def histogram_all_zones() -> Callable[[], Any]:
+    stamps = _week_of_stamps()
+    zones = get_registry().zones()
+    return lambda: {zone: histogram(stamps, zone) for zone in zones}
+
+
+@benchmark(SUITE)
+def histogram_by_zone_all_zones() -> Callable[[], Any]:
+    stamps = _week_of_stamps()
+    zones = get_registry().zones()
+    return lambda: histogram_by_zone(stamps, zones)
+
+
+@benchmark(SUITE)
+def astimezone_common_zones() -> Callable[[], Any]:
+    ct = _city_time()
+    zones = list(pytz.common_timezones)
+    return lambda: [ct.astimezone(zone) for zone in zones]
+
+
+@benchmark(SUITE)
+def astimezone_all() -> Callable[[], Any]:
+    return _city_time().astimezone_all
+
+
+def _at_nine(ct: CityTime, zones: list) -> list:
+    start, end = datetime.time(9), datetime.time(9, 5)
+    return [zone for zone in zones if start <= ct.astimezone(zone).time() < end]
+
+
+@benchmark(SUITE)
+def zones_at_local_time_loop() -> Callable[[], Any]:
+    ct = _city_time()
+    zones = get_registry().names()
+    return lambda: _at_nine(ct, zones)
+
+
+@benchmark(SUITE)
+def zones_at_local_time() -> Callable[[], Any]:
+    ct = _city_time()
+    start, end = datetime.time(9), datetime.time(9, 5)
+    return lambda: citytime.zones_at_local_time(ct, start, end)
+
+
+@benchmark(SUITE)
+def upcoming_transitions_all_zones() -> Callable[[], Any]:
+    now = datetime.datetime(2018, 10, 25)
+    return lambda: upcoming_transitions(within=datetime.timedelta(days=7), now=now)
+
+
+def _wall_times() -> list:
+    # Every other wall time is skipped or repeated by a New York DST change.
+    rng = random.Random(27)
+    gaps = [datetime.datetime(year, 3, 8 + (6 - datetime.date(year, 3, 1).weekday()) % 7, 2, 30)
+            for year in range(2010, 2020)]
+    return [
+        rng.choice(gaps) if i % 2 else LOCAL_TIME + datetime.timedelta(minutes=rng.randrange(0, 100000))
+        for i in range(1000)
+    ]
+
+
+def _set_all(wall_times: list) -> list:
+    results = []
+    for wall_time in wall_times:
+        try:
+            results.append(CityTime(wall_time, ZONE))
+        except (pytz.exceptions.NonExistentTimeError, pytz.exceptions.AmbiguousTimeError):
+            results.append(None)
+    return results
+
+
+@benchmark(SUITE)
+def set_with_exceptions_1000() -> Callable[[], Any]:
+    wall_times = _wall_times()
+    return lambda: _set_all(wall_times)
+
+
+@benchmark(SUITE)
+def try_set_1000() -> Callable[[], Any]:
+    wall_times = _wall_times()
+    ct = CityTime()
+    return lambda: [ct.try_set(wall_time, ZONE) for wall_time in wall_times]
+
+
+@benchmark(SUITE)
+def validate_local_1000() -> Callable[[], Any]:
+    wall_times = _wall_times()
+    return lambda: validate_local(wall_times, ZONE)
+
+
+def _minutes_of_week() -> list:
+    start = _city_time()
+    return [start + datetime.timedelta(minutes=7 * i) for i in range(1000)]
+
+
+@benchmark(SUITE)
+def local_strftime_1000() -> Callable[[], Any]:
+    instants = _minutes_of_week()
+    return lambda: [ct.local_strftime('%Y-%m-%d %H:%M:%S%z') for ct in instants]
+
+
+@benchmark(SUITE)
+def format_many_1000() -> Callable[[], Any]:
+    instants = _minutes_of_week()
+    return lambda: format_many(instants, ZONE, '%Y-%m-%d %H:%M:%S%z')
+
+
+@benchmark(SUITE)
+def format_many_timestamps_1000() -> Callable[[], Any]:
+    stamps = [ct.epoch() for ct in _minutes_of_week()]
+    return lambda: format_many(stamps, ZONE, '%Y-%m-%d %H:%M:%S%z')
+
+
+@benchmark(SUITE)
+def format_1000() -> Callable[[], Any]:
+    instants = _minutes_of_week()
+    formatter = Formatter('%Y-%m-%d %H:%M:%S%z')
+    return lambda: [ct.format(formatter) for ct in instants]
+
+
+@benchmark(SUITE)
+def format_fresh_1000() -> Callable[[], Any]:
+    # Without a cached local time, as for objects that are formatted once.
+    instants = _minutes_of_week()
+    formatter = Formatter('%Y-%m-%d %H:%M:%S%z')
+    return lambda: [ct.copy().format(formatter) for ct in instants]
+
+
+@benchmark(SUITE)
+def local_strftime_fresh_1000() -> Callable[[], Any]:
+    instants = _minutes_of_week()
+    return lambda: [ct.copy().local_strftime('%Y-%m-%d %H:%M:%S%z') for ct in instants]
+
+
+@benchmark(SUITE)
+def now() -> Callable[[], Any]:
+    return lambda: CityTime.now(ZONE)
+
+
+@benchmark(SUITE)
+def clock_now() -> Callable[[], Any]:
+    clock = Clock()
+    return lambda: clock.now(ZONE)
+
+
+@benchmark(SUITE)
+def clock_now_every_tick() -> Callable[[], Any]:
+    # A new tick for every call, so only the per-zone offset is reused.
+    clock = Clock(datetime.timedelta(microseconds=1))
+    return lambda: clock.now(ZONE)
+
+
+LOG_ZONES = ['America/New_York', 'Europe/London', 'Asia/Tokyo']
+
+
+class _NaiveZoneFormatter(logging.Formatter):
+    # Converts the time of every record to every zone.
+    def formatTime(self, record: logging.LogRecord, datefmt: Any=None) -> str:
+        return ' '.join(
+            '{},{:03d} {}'.format(local.strftime('%Y-%m-%d %H:%M:%S'), int(record.msecs), local.strftime('%Z'))
+            for local in (CityTime.from_epoch(record.created, zone).local() for zone in LOG_ZONES)
+        )
+
+
+def _log_records() -> list:
+    # 1000 records over 10 seconds.
+    start = LOCAL_TIME.replace(tzinfo=pytz.utc).timestamp()
+    records = []
+    for i in range(1000):
+        record = logging.LogRecord('benchmark', logging.INFO, __file__, 1, 'message %d', (i,), None)
+        record.created = start + i / 100
+        record.msecs = i % 100 * 10
+        records.append(record)
+    return records
+
+
+@benchmark(SUITE)
+def log_format_zones_1000() -> Callable[[], Any]:
+    records = _log_records()
+    formatter = ZoneFormatter('%(asctime)s %(levelname)s %(message)s', zones=LOG_ZONES)
+    return lambda: [formatter.format(record) for record in records]
+
+
+@benchmark(SUITE)
+def log_format_naive_zones_1000() -> Callable[[], Any]:
+    records = _log_records()
+    formatter = _NaiveZoneFormatter('%(asctime)s %(levelname)s %(message)s')
+    return lambda: [formatter.format(record) for record in records]
+
+
+@benchmark(SUITE)
+def scheduler_call_daily_1000() -> Callable[[], Any]:
+    # Registering daily triggers, and so computing their first fire time, in many zones.
+    zones = get_registry().zones()
+    start = LOCAL_TIME.replace(tzinfo=pytz.utc).timestamp()
+    times = [datetime.time(i % 24, i % 60) for i in range(1000)]
+
+    def register() -> Any:
+        scheduler = Scheduler(time_function=lambda: start)
+        for i, local_time in enumerate(times):
+            scheduler.call_daily(local_time, zones[i % len(zones)], print)
+        return scheduler
+    return register
+
+
+@benchmark(SUITE)
+def cron_next() -> Callable[[], Any]:
+    schedule = CronSchedule('30 8 * * 1-5', ZONE)
+    ct = _city_time()
+    return lambda: schedule.next(ct)
+
+
+@benchmark(SUITE)
+def cron_next_by_increment() -> Callable[[], Any]:
+    # The same search done by stepping a minute at a time and testing the local time.
+    ct = _city_time()
+
+    def search() -> CityTime:
+        current = ct.copy()
+        while True:
+            current.increment(minutes=1)
+            local = current.local()
+            if local.hour == 8 and local.minute == 30 and local.weekday() < 5:
+                return current
+    return search
+
+
+@benchmark(SUITE)
+def next_fire_times_1000() -> Callable[[], Any]:
+    zones = get_registry().zones()
+    schedules = [CronSchedule('{} {} * * *'.format(i % 60, i % 24), zones[i % len(zones)]) for i in range(1000)]
+    ct = _city_time()
+    return lambda: next_fire_times(schedules, ct)
+
+
+@benchmark(SUITE)
+def construct_datetime_utc() -> Callable[[], Any]:
+    return lambda: CityTime(LOCAL_TIME, 'UTC')
+
+
+@benchmark(SUITE)
+def construct_datetime_fixed_offset() -> Callable[[], Any]:
+    return lambda: CityTime(LOCAL_TIME, '+05:30')
+
+
+@benchmark(SUITE)
+def local_utc() -> Callable[[], Any]:
+    return CityTime(LOCAL_TIME, 'UTC').local
+
+
+@benchmark(SUITE)
+def local_fixed_offset() -> Callable[[], Any]:
+    return CityTime(LOCAL_TIME, 'Etc/GMT-3').local
+
+
+@benchmark(SUITE)
+def increment_utc() -> Callable[[], Any]:
+    ct = CityTime(LOCAL_TIME, 'UTC')
+    return lambda: ct.increment(hours=1)
+
+
+@benchmark(SUITE)
+def from_trusted() -> Callable[[], Any]:
+    zone = get_zone(ZONE)
+    micros = _city_time().epoch() * 1000000
+    return lambda: CityTime.from_trusted(micros, zone)
+
+
+@benchmark(SUITE)
+def from_trusted_many_1000() -> Callable[[], Any]:
+    zone = get_zone(ZONE)
+    micros = [_city_time().epoch() * 1000000 + i * 60000000 for i in range(1000)]
+    return lambda: CityTime.from_trusted_many(micros, zone.id)
+
+
+def _register_backend_benchmarks(backend: str, suffix: str) -> None:
+    def construct_datetime() -> Callable[[], Any]:
+        return lambda: CityTime(LOCAL_TIME, ZONE, backend=backend)
+
+    def construct_iso() -> Callable[[], Any]:
+        return lambda: CityTime(ISO_TIME, ZONE, backend=backend)
+
+    def local() -> Callable[[], Any]:
+        return _city_time(backend).local
+
+    def astimezone() -> Callable[[], Any]:
+        ct = _city_time(backend)
+        return lambda: ct.astimezone('Asia/Kolkata')
+
+    def increment() -> Callable[[], Any]:
+        ct = _city_time(backend)
+        return lambda: ct.increment(minutes=1)
+
+    def add_timedelta() -> Callable[[], Any]:
+        ct = _city_time(backend)
+        return lambda: ct + HOUR
+
+    for factory in (construct_datetime, construct_iso, local, astimezone, increment, add_timedelta):
+        benchmark(SUITE, factory.__name__ + suffix)(factory)
+
+
+_register_backend_benchmarks('pytz', '')
+_register_backend_benchmarks('zoneinfo', '_zoneinfo')
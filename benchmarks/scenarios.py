@@ -0,0 +1,206 @@
+"""
+End-to-end scenario benchmarks modeled on scheduling workloads.
+
+Every scenario has a seeded data generator and a workload. The workload is run at a base input
+size and then with the size doubled a number of times, so that the report shows how the cost
+grows with the input (a ratio close to 2.0 between consecutive sizes means linear growth,
+4.0 means quadratic) as well as throughput and peak memory as seen by tracemalloc.
+
+"""
+
+
+import datetime
+import fnmatch
+import random
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from citytime import CityTime, Range
+
+
+SUITE = 'scenarios'
+
+CITIES = [
+    'America/New_York', 'America/Chicago', 'America/Denver', 'America/Los_Angeles',
+    'America/Sao_Paulo', 'America/Mexico_City', 'Europe/London', 'Europe/Paris',
+    'Europe/Berlin', 'Europe/Moscow', 'Africa/Cairo', 'Africa/Johannesburg',
+    'Asia/Dubai', 'Asia/Kolkata', 'Asia/Shanghai', 'Asia/Tokyo', 'Asia/Singapore',
+    'Australia/Sydney', 'Pacific/Auckland', 'Pacific/Honolulu',
+]
+
+START = datetime.datetime(2018, 1, 1)
+
+
+class Scenario(NamedTuple):
+    """
+    generate(size, rng) builds the input data, run(data) is the timed workload. base_size is
+    the smallest input size the scenario is run with.
+    """
+    generate: Callable[[int, random.Random], Any]
+    run: Callable[[Any], Any]
+    base_size: int
+
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def scenario(base_size: int) -> Callable[[Callable[[Any], Any]], Callable[[Any], Any]]:
+    """
+    Register a workload. The data generator is the function named generate_<workload name>.
+    """
+    def register(run: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        SCENARIOS[run.__name__] = Scenario(globals()['generate_' + run.__name__], run, base_size)
+        return run
+    return register
+
+
+###
+# Roster conflict detection: find every pair of overlapping shifts of the same employee.
+###
+
+def generate_roster_conflicts(size: int, rng: random.Random) -> List[Any]:
+    employees = max(1, size // 20)
+    shifts = []
+    for _ in range(size):
+        start = CityTime(START + datetime.timedelta(hours=rng.randrange(0, 24 * 90)), 'UTC')
+        start.change_tz(rng.choice(CITIES))
+        shift = Range(start, datetime.timedelta(hours=rng.choice([4, 6, 8, 10, 12])))
+        shifts.append((rng.randrange(employees), shift))
+    return shifts
+
+
+@scenario(base_size=2000)
+def roster_conflicts(shifts: List[Any]) -> int:
+    by_employee: Dict[int, List[Range]] = {}
+    for employee, shift in shifts:
+        by_employee.setdefault(employee, []).append(shift)
+    conflicts = 0
+    for employee_shifts in by_employee.values():
+        employee_shifts.sort(key=lambda r: r.start_time())
+        active: List[Range] = []
+        for shift in employee_shifts:
+            start = shift.start_time()
+            active = [other for other in active if other.end_time() >= start]
+            conflicts += sum(1 for other in active if other.overlaps(shift))
+            active.append(shift)
+    return conflicts
+
+
+###
+# Meeting slot search: find the half hour slots that fall within 09:00-17:00 local time on a
+# weekday in the largest number of 20 cities.
+###
+
+def generate_meeting_slot_search(size: int, rng: random.Random) -> List[CityTime]:
+    offset = rng.randrange(0, 48)
+    return [CityTime(START + datetime.timedelta(minutes=30 * (offset + i)), 'UTC') for i in range(size)]
+
+
+@scenario(base_size=1000)
+def meeting_slot_search(slots: List[CityTime]) -> List[CityTime]:
+    best = 0
+    best_slots: List[CityTime] = []
+    for slot in slots:
+        available = 0
+        for zone in CITIES:
+            local = slot.astimezone(zone)
+            if local.weekday() < 5 and 9 <= local.hour < 17:
+                available += 1
+        if available > best:
+            best, best_slots = available, [slot]
+        elif available == best:
+            best_slots.append(slot)
+    return best_slots
+
+
+###
+# Minute grid generation: step a CityTime through consecutive local minutes. 525600 steps is
+# a full year, which can be reached with --scale.
+###
+
+def generate_minute_grid(size: int, rng: random.Random) -> Any:
+    return CityTime(START + datetime.timedelta(minutes=rng.randrange(0, 1440)), rng.choice(CITIES)), size
+
+
+@scenario(base_size=4096)
+def minute_grid(data: Any) -> List[CityTime]:
+    current, size = data
+    current = current.copy()
+    grid = []
+    for _ in range(size):
+        grid.append(current.copy())
+        current.increment(minutes=1)
+    return grid
+
+
+###
+# Bulk ISO ingestion: build CityTime objects from UTC ISO 8601 strings with a zone per row.
+###
+
+def generate_bulk_iso_ingestion(size: int, rng: random.Random) -> List[Any]:
+    rows = []
+    for _ in range(size):
+        moment = START + datetime.timedelta(seconds=rng.randrange(0, 365 * 86400))
+        rows.append((moment.isoformat(), rng.choice(CITIES)))
+    return rows
+
+
+@scenario(base_size=2048)
+def bulk_iso_ingestion(rows: List[Any]) -> List[CityTime]:
+    return [CityTime(iso, zone) for iso, zone in rows]
+
+
+###
+# Runner
+###
+
+def measure(workload: Scenario, size: int, seed: int) -> Dict[str, float]:
+    """
+    Run a workload once for timing and once more under tracemalloc for its peak memory.
+
+    :rtype: dict
+    """
+    data = workload.generate(size, random.Random(seed))
+    start = time.perf_counter()
+    workload.run(data)
+    seconds = time.perf_counter() - start
+
+    data = workload.generate(size, random.Random(seed))
+    tracemalloc.start()
+    try:
+        workload.run(data)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'size': size, 'seconds': seconds, 'items_per_sec': size / seconds, 'peak_bytes': peak}
+
+
+def run_suite(
+        pattern: Optional[str]=None,
+        steps: int=4,
+        scale: float=1.0,
+        seed: int=28,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every scenario whose name matches the optional fnmatch pattern at 'steps' doubling
+    input sizes, starting from its base size multiplied by 'scale'.
+
+    ns_per_op is the time per input item at the largest size, so that scenario results can be
+    compared with a baseline the same way as micro-benchmarks.
+
+    :rtype: dict
+    """
+    results = {}
+    for name, workload in sorted(SCENARIOS.items()):
+        if pattern and not fnmatch.fnmatch(name, pattern):
+            continue
+        base = max(1, int(workload.base_size * scale))
+        runs = [measure(workload, base * 2 ** step, seed) for step in range(steps)]
+        scaling = [later['seconds'] / earlier['seconds'] for earlier, later in zip(runs, runs[1:])]
+        results[name] = {
+            'runs': runs,
+            'scaling': scaling,
+            'ns_per_op': runs[-1]['seconds'] / runs[-1]['size'] * 1e9,
+        }
+    return results
@@ -1,5 +1,52 @@
+import importlib
+import sys
+from typing import Any
 
+from .backends import get_backend, set_backend
 from .citytime import CityTime, Range
+from .registry import canonical_name, same_rules
+from .zones import Zone, get_zone
+
+
+# Names imported from their submodule on first use, so that 'import citytime' only loads what
+# CityTime itself needs.
+_SUBMODULES = {
+    'Clock': 'clock',
+    'get_clock': 'clock',
+    'CronSchedule': 'cron',
+    'next_fire_times': 'cron',
+    'previous_fire_times': 'cron',
+    'equivalence_classes': 'equivalence',
+    'histogram': 'fields',
+    'histogram_by_zone': 'fields',
+    'local_fields': 'fields',
+    'local_fields_by_zone': 'fields',
+    'Formatter': 'formatting',
+    'format_many': 'formatting',
+    'zones_at_local_time': 'localindex',
+    'ZoneFormatter': 'logformat',
+    'transitions': 'offsets',
+    'upcoming_transitions': 'offsets',
+    'Scheduler': 'scheduler',
+    'validate_local': 'validation',
+    'warm_up': 'warmup',
+    'warm_up_in_background': 'warmup',
+}
+
+
+def __getattr__(name: str) -> Any:
+    submodule = _SUBMODULES.get(name)
+    if submodule is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module('.' + submodule, __name__), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) is new in 3.7; before that every name is imported eagerly.
+    for _name in _SUBMODULES:
+        __getattr__(_name)
 
 
 __version__ = "1.0.0"
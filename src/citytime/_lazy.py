@@ -0,0 +1,39 @@
+"""
+Deferred module imports.
+
+pytz and calendar are only needed once a time is actually converted, so the modules of this
+package bind them to a LazyModule placeholder instead of importing them at import time. The first
+attribute access imports the real module and rebinds the global name in the owning module, so
+every later access goes straight to the real module at no extra cost.
+
+"""
+
+
+import importlib
+from typing import Any, Dict
+
+
+class LazyModule(object):
+    """
+    Placeholder for a module that is imported on first attribute access.
+
+    :param name: the module to import
+    :param namespace: globals() of the module holding the placeholder
+    :param binding: the global name to rebind, if it differs from the module name
+    """
+    def __init__(self, name: str, namespace: Dict[str, Any], binding: str='') -> None:
+        self._name = name
+        self._namespace = namespace
+        self._binding = binding or name
+
+    def __repr__(self) -> str:
+        return '<lazy module {!r}>'.format(self._name)
+
+    def load(self) -> Any:
+        module = importlib.import_module(self._name)
+        if self._namespace.get(self._binding) is self:
+            self._namespace[self._binding] = module
+        return module
+
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self.load(), attribute)
@@ -0,0 +1,257 @@
+"""
+Time zone backends.
+
+CityTime was written against pytz, whose localize/normalize dance is needed to get correct
+offsets out of its tzinfo objects. Python 3.9 added zoneinfo to the standard library, whose
+tzinfo objects work directly with datetime arithmetic and are considerably cheaper to use.
+
+A backend bundles the handful of operations CityTime needs from a time zone library: looking up
+a zone, attaching a zone to a local wall time, and converting a UTC time to local time. Both
+backends signal problems with the same pytz exception classes, so code that catches
+UnknownTimeZoneError, NonExistentTimeError or AmbiguousTimeError works the same way whichever
+backend is in use.
+
+The default backend is pytz. It can be changed for the whole process with set_backend(), or with
+the CITYTIME_BACKEND environment variable, and most CityTime methods also accept a backend
+argument for a single call.
+
+"""
+
+
+import datetime
+import os
+import sys
+from typing import Any, Dict, Optional, Union
+
+from ._lazy import LazyModule
+from .tables import get_table
+
+
+pytz: Any = LazyModule('pytz', globals())
+
+ENVIRONMENT_VARIABLE = 'CITYTIME_BACKEND'
+
+
+class Backend(object):
+    """
+    Interface of a time zone backend.
+    """
+    name = ''
+
+    @property
+    def utc(self) -> datetime.tzinfo:
+        """
+        The UTC tzinfo used for the UTC times CityTime stores.
+
+        :rtype: datetime.tzinfo
+        """
+        raise NotImplementedError
+
+    def timezone(self, zone: str) -> datetime.tzinfo:
+        """
+        Look up a time zone in the Olson database.
+
+        :raises UnknownTimeZoneError: If the time zone does not exist.
+        :rtype: datetime.tzinfo
+        """
+        raise NotImplementedError
+
+    def zone_name(self, tz: datetime.tzinfo) -> str:
+        """
+        Returns the name of a zone returned by timezone(), as spelled in the Olson database.
+
+        :rtype: str
+        """
+        return str(tz)
+
+    def fixed_offset(self, seconds: int) -> datetime.tzinfo:
+        """
+        Returns a tzinfo with a fixed UTC offset, in seconds.
+
+        :rtype: datetime.tzinfo
+        """
+        return datetime.timezone(datetime.timedelta(seconds=seconds))
+
+    def static_offset(self, tz: datetime.tzinfo) -> Optional[datetime.timedelta]:
+        """
+        Returns the UTC offset of a zone that has never changed it, such as UTC, Etc/GMT-3 or
+        the zones returned by fixed_offset(), or None for any other zone.
+
+        :rtype: datetime.timedelta or None
+        """
+        if isinstance(tz, datetime.timezone):
+            return tz.utcoffset(None)
+        try:
+            table = get_table(self.zone_name(tz))
+        except pytz.exceptions.UnknownTimeZoneError:
+            return None
+        if not table.is_fixed():
+            return None
+        return datetime.timedelta(seconds=table.offsets[0])
+
+    def localize(self, date_time: datetime.datetime, tz: datetime.tzinfo) -> datetime.datetime:
+        """
+        Attach a time zone to a naive local wall time.
+
+        :raises NonExistentTimeError: If the wall time is skipped by a DST change.
+        :raises AmbiguousTimeError: If the wall time occurs twice because of a DST change.
+        :rtype: datetime.datetime
+        """
+        raise NotImplementedError
+
+    def is_utc(self, tz: Optional[datetime.tzinfo]) -> bool:
+        """
+        Returns True if tz is the backend's UTC tzinfo.
+
+        :rtype: bool
+        """
+        return tz is not None and tz is self.utc
+
+    def to_local(self, date_time: datetime.datetime, tz: datetime.tzinfo) -> datetime.datetime:
+        """
+        Convert an aware datetime to local time in the given zone.
+
+        :rtype: datetime.datetime
+        """
+        return date_time.astimezone(tz)
+
+    def __repr__(self) -> str:
+        return '<{} backend>'.format(self.name)
+
+    def __reduce__(self) -> Any:
+        # Backends are shared per process, so unpickling looks the backend up by name.
+        return get_backend, (self.name,)
+
+
+class PytzBackend(Backend):
+    """
+    The original pytz implementation.
+    """
+    name = 'pytz'
+
+    @property
+    def utc(self) -> datetime.tzinfo:
+        return pytz.utc
+
+    def timezone(self, zone: str) -> datetime.tzinfo:
+        return pytz.timezone(zone)
+
+    def zone_name(self, tz: Any) -> str:
+        return str(tz.zone)
+
+    def fixed_offset(self, seconds: int) -> datetime.tzinfo:
+        return pytz.FixedOffset(seconds // 60)
+
+    def static_offset(self, tz: Any) -> Optional[datetime.timedelta]:
+        # UTC, StaticTzInfo and FixedOffset zones have no transitions.
+        if getattr(tz, '_utc_transition_times', None) is not None:
+            return None
+        offset: datetime.timedelta = tz.utcoffset(None)
+        return offset
+
+    def localize(self, date_time: datetime.datetime, tz: Any) -> datetime.datetime:
+        return tz.localize(date_time, is_dst=None)
+
+    def to_local(self, date_time: datetime.datetime, tz: Any) -> datetime.datetime:
+        return tz.normalize(date_time.astimezone(tz))
+
+
+class ZoneInfoBackend(Backend):
+    """
+    Standard library zoneinfo implementation (Python 3.9+).
+
+    Zone names are matched case-insensitively like pytz does, and the same pytz exceptions are
+    raised for unknown zones and for non-existent or ambiguous wall times.
+    """
+    name = 'zoneinfo'
+
+    def __init__(self) -> None:
+        try:
+            import zoneinfo
+        except ImportError:
+            raise ValueError('The zoneinfo backend requires Python 3.9 or later.')
+        self._zoneinfo = zoneinfo
+        self._utc = zoneinfo.ZoneInfo('UTC')
+        self._case_insensitive: Optional[Dict[str, str]] = None
+
+    @property
+    def utc(self) -> datetime.tzinfo:
+        return self._utc
+
+    def is_utc(self, tz: Optional[datetime.tzinfo]) -> bool:
+        # UTC times made with pytz are accepted as UTC too, without importing pytz for the check.
+        if tz is None:
+            return False
+        loaded_pytz = sys.modules.get('pytz')
+        return tz is self._utc or (loaded_pytz is not None and tz is loaded_pytz.utc)
+
+    def timezone(self, zone: str) -> datetime.tzinfo:
+        try:
+            return self._zoneinfo.ZoneInfo(zone)
+        except (self._zoneinfo.ZoneInfoNotFoundError, ValueError):
+            pass
+        if self._case_insensitive is None:
+            self._case_insensitive = {name.lower(): name for name in self._zoneinfo.available_timezones()}
+        try:
+            return self._zoneinfo.ZoneInfo(self._case_insensitive[zone.lower()])
+        except KeyError:
+            raise pytz.exceptions.UnknownTimeZoneError(zone)
+
+    def zone_name(self, tz: Any) -> str:
+        return str(tz.key)
+
+    def localize(self, date_time: datetime.datetime, tz: datetime.tzinfo) -> datetime.datetime:
+        local = date_time.replace(tzinfo=tz)
+        if local.utcoffset() == local.replace(fold=1).utcoffset():
+            return local
+        # The two folds disagree, so the wall time is either in a gap or in an overlap. A time
+        # in the gap doesn't survive a round trip through UTC.
+        if local.astimezone(self._utc).astimezone(tz).replace(tzinfo=None) != date_time:
+            raise pytz.exceptions.NonExistentTimeError(date_time)
+        raise pytz.exceptions.AmbiguousTimeError(date_time)
+
+
+BACKENDS = {
+    PytzBackend.name: PytzBackend,
+    ZoneInfoBackend.name: ZoneInfoBackend,
+}
+
+_instances: Dict[str, Backend] = {}
+_default: Optional[Backend] = None
+
+
+def get_backend(backend: Optional[Union[str, Backend]]=None) -> Backend:
+    """
+    Returns a backend by name, the given Backend instance itself, or the default backend if
+    backend is None.
+
+    :raises ValueError: If there is no backend of that name.
+    :rtype: Backend
+    """
+    global _default
+    if backend is None:
+        if _default is None:
+            _default = get_backend(os.environ.get(ENVIRONMENT_VARIABLE) or PytzBackend.name)
+        return _default
+    if isinstance(backend, Backend):
+        return backend
+    instance = _instances.get(backend)
+    if instance is None:
+        try:
+            backend_class = BACKENDS[backend]
+        except KeyError:
+            raise ValueError('Unknown backend {!r}, expected one of {}'.format(backend, ', '.join(BACKENDS)))
+        instance = _instances[backend] = backend_class()
+    return instance
+
+
+def set_backend(backend: Union[str, Backend]) -> Backend:
+    """
+    Set the default backend for the whole process and return it.
+
+    :raises ValueError: If there is no backend of that name.
+    :rtype: Backend
+    """
+    global _default
+    _default = get_backend(backend)
+    return _default
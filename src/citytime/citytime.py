@@ -27,14 +27,44 @@ and end of Daylight Savings Time are accounted for.
 """
 
 
-from calendar import day_name
 import datetime
-from typing import Optional, Union, Any, Set
+import itertools
+import sys
+from typing import Optional, Union, Any, Dict, Iterable, List, Set, Tuple
 
-import pytz
-from pytz.exceptions import AmbiguousTimeError
-from pytz.exceptions import NonExistentTimeError
-from pytz.exceptions import UnknownTimeZoneError
+from ._lazy import LazyModule
+from . import zones
+from .backends import Backend, get_backend
+from .formatting import Formatter, get_formatter
+from .tables import MICROSECOND, convert_epochs
+from .validation import OK, SetResult, check_local
+from .worldclock import ZoneTimes, common_zones, local_times
+from .zones import Zone
+
+
+# pytz and calendar are imported on first use, see _lazy.py.
+pytz: Any = LazyModule('pytz', globals())
+calendar: Any = LazyModule('calendar', globals())
+
+# Backend name -> 1970-01-01 00:00 in the backend's UTC tzinfo.
+_UTC_EPOCHS: Dict[str, datetime.datetime] = {}
+
+_PYTZ_EXCEPTIONS = ('AmbiguousTimeError', 'NonExistentTimeError', 'UnknownTimeZoneError')
+
+
+def __getattr__(name: str) -> Any:
+    # The pytz exceptions used to be imported into this module eagerly.
+    if name in _PYTZ_EXCEPTIONS:
+        return getattr(pytz.exceptions, name)
+    if name == 'day_name':
+        return calendar.day_name
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) is new in 3.7; before that the old names are bound eagerly.
+    from calendar import day_name
+    from pytz.exceptions import AmbiguousTimeError, NonExistentTimeError, UnknownTimeZoneError
 
 
 class CityTime(object):
@@ -50,28 +80,38 @@ class CityTime(object):
 
     Parameter tz will be ignored if parameter time is of type CityTime.
 
+    The time zone backend (see backends.py) defaults to the process wide default backend, and is
+    kept by the object for later conversions. Parameter backend will be ignored if parameter time is
+    of type CityTime.
+
+    The time zone can be given as a name from the Olson database or as a Zone (see zones.py).
+    Either way the object refers to the interned Zone, shared by every CityTime in that zone.
+
     :param time: str or datetime.datetime or CityTime
+    :param tz: str or Zone
+    :param backend: str or Backend
     :raises TypeError: If time argument is not CityTime, datetime.datetime or ISO8601
     """
     def __init__(
             self,
             time: Optional[Union['CityTime', datetime.datetime, str]]=None,
-            tz: Optional[str]=None,
+            tz: Optional[Union[str, Zone]]=None,
+            backend: Optional[Union[str, Backend]]=None,
     ) -> None:
         self._is_set = False
         if time and isinstance(time, CityTime):
-            self._tz: Any = time.tzinfo()
             self._datetime: datetime.datetime = time.utc()
-            self._t_zone: str = time.timezone()
+            self._zone: Any = time._zone
+            self._backend: Backend = time._backend
             self._is_set: bool = True
-        elif isinstance(time, datetime.datetime) and isinstance(tz, str):
-            self.set(time, tz)
-        elif isinstance(time, str) and isinstance(tz, str):
-            self.set_iso_format(time, tz)
+        elif isinstance(time, datetime.datetime) and isinstance(tz, (str, Zone)):
+            self.set(time, tz, backend)
+        elif isinstance(time, str) and isinstance(tz, (str, Zone)):
+            self.set_iso_format(time, tz, backend)
         elif time is None:
+            self._backend = get_backend(backend)
             self._datetime = datetime.datetime.min
-            self._t_zone = str()
-            self._tz = pytz.timezone('utc')
+            self._zone = None
         else:
             raise TypeError("Argument 'time' must be of type 'CityTime' or 'datetime.datetime'")
 
@@ -94,7 +134,7 @@ class CityTime(object):
             no_offset = self._datetime.isoformat().split(sep='+')[0]
             _repr = 'CityTime("{}", "{}")'.format(
                 no_offset,
-                self._tz
+                self._zone.name
             )
             return _repr
         else:
@@ -239,7 +279,7 @@ class CityTime(object):
         if not isinstance(other, datetime.timedelta):
             return NotImplemented
         new_object = CityTime()
-        new_object.set(self.local(), self.timezone())
+        new_object.set(self.local(), self._zone, self._backend)
         new_object.increment(seconds=other.total_seconds())
         return new_object
 
@@ -256,18 +296,23 @@ class CityTime(object):
         """
         if isinstance(other, datetime.timedelta):
             new_object = CityTime()
-            new_object.set(self.local(), self.timezone())
+            new_object.set(self.local(), self._zone, self._backend)
             new_object.increment(seconds=-other.total_seconds())
             return new_object
         elif isinstance(other, CityTime):
             return self.utc() - other.utc()
         elif isinstance(other, datetime.datetime):
-            raise UnknownTimeZoneError("Can't subtract regular datetime from CityTime object due to lack of"
-                                       " Olson timezone database information.")
+            raise pytz.exceptions.UnknownTimeZoneError("Can't subtract regular datetime from CityTime object due to"
+                                                       " lack of Olson timezone database information.")
         else:
             return NotImplemented
 
-    def set(self, date_time: datetime.datetime, time_zone: str) -> None:
+    def set(
+            self,
+            date_time: datetime.datetime,
+            time_zone: Union[str, Zone],
+            backend: Optional[Union[str, Backend]]=None,
+    ) -> None:
 
         """
         Allows setting the local time after a CityTime object has been created.
@@ -278,37 +323,84 @@ class CityTime(object):
         the local time must include the date and the time zone. Otherwise, there would be no
         way to account for Daylight Savings Time.
 
-        """
-        try:
-            time_zone.upper()
-        except AttributeError:
-            raise UnknownTimeZoneError("Attribute 'time_zone' must be of type 'str'")
+        The optional backend replaces the time zone backend of the object.
 
-        try:
-            tz = pytz.timezone(time_zone)
-        except pytz.exceptions.UnknownTimeZoneError:
-            raise UnknownTimeZoneError(time_zone)
+        """
+        _backend = get_backend(backend)
+        zone = _get_zone(time_zone, _backend)
+        tz = zone.tzinfo
 
-        if getattr(date_time, 'tzinfo', None) == pytz.timezone('UTC'):
+        if _backend.is_utc(getattr(date_time, 'tzinfo', None)):
             self._datetime = date_time
+        elif zone.fixed_offset is not None:
+            # No DST changes, so every wall time exists exactly once.
+            try:
+                naive = date_time.replace(tzinfo=None)
+            except AttributeError:
+                raise AttributeError("Attribute 'date_time' should be of type 'datetime.datetime")
+            except TypeError:
+                raise TypeError("Attribute 'date_time' should be of type 'datetime.datetime")
+            self._datetime = (naive - zone.fixed_offset).replace(tzinfo=_backend.utc)
         else:
             try:
-                dt = tz.localize(date_time.replace(tzinfo=None), is_dst=None)
+                dt = _backend.localize(date_time.replace(tzinfo=None), tz)
             except AttributeError:
                 raise AttributeError("Attribute 'date_time' should be of type 'datetime.datetime")
             except TypeError:
                 raise TypeError("Attribute 'date_time' should be of type 'datetime.datetime")
-            except NonExistentTimeError:
-                raise NonExistentTimeError('That time does not exist due to the change in DST')
-            except AmbiguousTimeError:
-                raise AmbiguousTimeError('That time is undefined due to the change in DST')
-            self._datetime = dt.astimezone(pytz.utc)
-
-        self._t_zone = time_zone
-        self._tz = tz
+            except pytz.exceptions.NonExistentTimeError:
+                raise pytz.exceptions.NonExistentTimeError('That time does not exist due to the change in DST')
+            except pytz.exceptions.AmbiguousTimeError:
+                raise pytz.exceptions.AmbiguousTimeError('That time is undefined due to the change in DST')
+            self._datetime = dt.astimezone(_backend.utc)
+
+        self._zone = zone
+        self._backend = _backend
         self._is_set = True
 
-    def set_iso_format(self, date_time: str, time_zone: str) -> None:
+    def try_set(
+            self,
+            date_time: datetime.datetime,
+            time_zone: Union[str, Zone],
+            backend: Optional[Union[str, Backend]]=None,
+    ) -> SetResult:
+        """
+        Like set(), but returns a SetResult instead of raising when the local time doesn't exist
+        or is ambiguous because of a DST change. The object is only changed if the result is ok.
+        The candidate UTC instants of the result can be passed to set() to pick one.
+
+        The status comes from the compiled transition table of the zone (see validation.py).
+
+        :raises UnknownTimeZoneError: If the time zone is not in the Olson database.
+        :raises TypeError: If date_time is not a datetime.datetime.
+        :rtype: SetResult
+        """
+        _backend = get_backend(backend)
+        zone = _get_zone(time_zone, _backend)
+        if not isinstance(date_time, datetime.datetime):
+            raise TypeError("Attribute 'date_time' should be of type 'datetime.datetime")
+
+        candidates: Tuple[datetime.datetime, ...]
+        if _backend.is_utc(date_time.tzinfo):
+            status, candidates = OK, (date_time,)
+        else:
+            naive = date_time.replace(tzinfo=None)
+            status, offsets = check_local(zone.table, naive)
+            utc = _backend.utc
+            candidates = tuple((naive - datetime.timedelta(seconds=offset)).replace(tzinfo=utc) for offset in offsets)
+        if status == OK:
+            self._datetime = candidates[0]
+            self._zone = zone
+            self._backend = _backend
+            self._is_set = True
+        return SetResult(status, candidates)
+
+    def set_iso_format(
+            self,
+            date_time: str,
+            time_zone: Union[str, Zone],
+            backend: Optional[Union[str, Backend]]=None,
+    ) -> None:
         """
         This method is called when setting the CityTime object using an ISO 8601 format
         string.
@@ -323,16 +415,12 @@ class CityTime(object):
         YYYY-MM-DDTHH:MM:SS
         It will strip out and disregard any microseconds
 
-        """
-        try:
-            time_zone.upper()
-        except AttributeError:
-            raise UnknownTimeZoneError("Attribute 'time_zone' must be of type 'str'")
+        The optional backend replaces the time zone backend of the object.
 
-        try:
-            tz = pytz.timezone(time_zone)
-        except pytz.exceptions.UnknownTimeZoneError:
-            raise UnknownTimeZoneError(time_zone)
+        """
+        _backend = get_backend(backend)
+        zone = _get_zone(time_zone, _backend)
+        tz = zone.tzinfo
 
         try:
             no_offset = date_time.split(sep='+')
@@ -348,16 +436,16 @@ class CityTime(object):
         utc_time = datetime.datetime.strptime(split_time[0], form)
 
         if len(split_time) == 2:
-            dt = utc_time.replace(microsecond=int(split_time[1]), tzinfo=pytz.utc)
+            dt = utc_time.replace(microsecond=int(split_time[1]), tzinfo=_backend.utc)
         else:
-            dt = utc_time.replace(tzinfo=pytz.utc)
+            dt = utc_time.replace(tzinfo=_backend.utc)
 
-        self._datetime = dt.astimezone(pytz.utc)
-        self._t_zone = time_zone
-        self._tz = tz
+        self._datetime = dt.astimezone(_backend.utc)
+        self._zone = zone
+        self._backend = _backend
         self._is_set = True
 
-    def change_tz(self, time_zone: str) -> None:
+    def change_tz(self, time_zone: Union[str, Zone]) -> None:
         """
         Change the time zone of a CityTime object that has already been set.
         
@@ -367,18 +455,7 @@ class CityTime(object):
         Los Angeles time and will no longer give New York City's local time
 
         """
-        try:
-            time_zone.upper()
-        except AttributeError:
-            raise UnknownTimeZoneError("Attribute 'time_zone' must be of type 'str'")
-
-        try:
-            tz = pytz.timezone(time_zone)
-        except pytz.exceptions.UnknownTimeZoneError:
-            raise UnknownTimeZoneError(time_zone)
-
-        self._tz = tz
-        self._t_zone = time_zone
+        self._zone = _get_zone(time_zone, self._backend)
 
     def is_set(self) -> bool:
         """
@@ -391,7 +468,7 @@ class CityTime(object):
         if self._datetime == datetime.datetime.min:
             return False
 
-        if self._t_zone == '':
+        if self._zone is None:
             return False
 
         return True
@@ -412,19 +489,35 @@ class CityTime(object):
         else:
             raise ValueError('Date/Time zone has not been set.')
 
-    def local(self) -> datetime.datetime:
+    def local(self, backend: Optional[Union[str, Backend]]=None) -> datetime.datetime:
         """
         Outputs the time as a datetime.datetime object with the local time zone.
 
+        If a backend other than the object's own is given, the result carries that backend's
+        tzinfo.
+
         :rtype : datetime.datetime
         """
         if self._is_set is False:
             raise ValueError()
 
-        dt = self._datetime
-        return dt.astimezone(self._tz)
+        if backend is None:
+            return self._local()
+        return self._datetime.astimezone(self._backend_tzinfo(get_backend(backend)))
+
+    def _local(self) -> datetime.datetime:
+        # The local time is kept with the UTC time and zone it was computed from, and is
+        # computed again when either has been replaced. Objects made with __new__, see
+        # from_trusted(), start without one.
+        cache = getattr(self, '_local_cache', None)
+        if cache is not None and cache[0] is self._datetime and cache[1] is self._zone:
+            local: datetime.datetime = cache[2]
+            return local
+        local = _to_zone(self._datetime, self._zone)
+        self._local_cache = (self._datetime, self._zone, local)
+        return local
 
-    def astimezone(self, time_zone: str) -> datetime.datetime:
+    def astimezone(self, time_zone: Union[str, Zone], backend: Optional[Union[str, Backend]]=None) -> datetime.datetime:
         """
         Check to see what the local time would be in a different time zone.
 
@@ -432,12 +525,47 @@ class CityTime(object):
         it is in New York. Calling .astimezone('America/New_York') from our CityTime object will
         show that it is 7am in New York.
 
+        The zone is looked up with the object's backend, unless another backend is given.
+
         """
         if self._is_set is False:
             raise ValueError()
-        dt = self._datetime
-        tz = pytz.timezone(time_zone)
-        return dt.astimezone(tz)
+        zone = zones.get_zone(time_zone, self._backend if backend is None else backend)
+        return _to_zone(self._datetime, zone)
+
+    def astimezone_many(
+            self,
+            time_zones: Iterable[Union[str, Zone]],
+            backend: Optional[Union[str, Backend]]=None,
+    ) -> ZoneTimes:
+        """
+        Check to see what the local time would be in several time zones at once.
+
+        Returns a ZoneTimes table (see worldclock.py) with the zone names, local times, UTC offsets
+        and abbreviations, in the order of time_zones. The local times are identical to what
+        astimezone() returns for each zone, but are computed from the compiled zone tables in a
+        single pass.
+
+        :raises UnknownTimeZoneError: If a time zone is not in the Olson database.
+        :rtype: ZoneTimes
+        """
+        if self._is_set is False:
+            raise ValueError()
+        return local_times(self._datetime, time_zones, self._backend if backend is None else backend)
+
+    def astimezone_all(self, backend: Optional[Union[str, Backend]]=None) -> ZoneTimes:
+        """
+        Returns astimezone_many() for all of pytz.common_timezones, the zones a world clock would
+        show.
+
+        :rtype: ZoneTimes
+        """
+        return self.astimezone_many(common_zones(), backend)
+
+    def _backend_tzinfo(self, backend: Backend) -> Any:
+        if backend is self._backend:
+            return self._zone.tzinfo
+        return zones.get_zone(self._zone, backend).tzinfo
 
     def local_minute(self) -> int:
         """
@@ -447,8 +575,7 @@ class CityTime(object):
         """
         if self._is_set is False:
             raise ValueError()
-        dt = self._datetime
-        lt = dt.astimezone(self._tz)
+        lt = self._local()
         minutes = lt.hour * 60 + lt.minute
         return minutes
 
@@ -460,20 +587,33 @@ class CityTime(object):
         """
         if self._is_set is False:
             raise ValueError()
-        return self._t_zone
+        return self._zone.name
+
+    def zone(self) -> Zone:
+        """
+        Outputs the local time zone as an interned Zone object.
+
+        CityTime objects in the same time zone share one Zone object, so they can be grouped by
+        zone with an identity comparison.
+
+        :rtype: Zone
+        """
+        if self._is_set is False:
+            raise ValueError()
+        return self._zone
 
     def tzinfo(self) -> Any:
         """
         Return a datetime.tzinfo implementation for the given timezone.
 
         Equivalent to pytz.timezone('Time_zone_string'). It can then be used with datetime,
-        with pytz.localize, etc.
+        with pytz.localize, etc. With the zoneinfo backend this is a zoneinfo.ZoneInfo object.
 
         :rtype : timezone
         """
         if self._is_set is False:
             raise ValueError()
-        return self._tz
+        return self._zone.tzinfo
 
     def weekday(self) -> int:
         """
@@ -483,8 +623,7 @@ class CityTime(object):
         """
         if self._is_set is False:
             raise ValueError()
-        dt = self._datetime
-        local = dt.astimezone(self._tz)
+        local = self._local()
 
         return local.weekday()
 
@@ -496,9 +635,8 @@ class CityTime(object):
         """
         if self._is_set is False:
             raise ValueError()
-        dt = self._datetime
-        local = dt.astimezone(self._tz)
-        name = day_name[local.weekday()]  # from calendar
+        local = self._local()
+        name = calendar.day_name[local.weekday()]
 
         return name
 
@@ -512,8 +650,7 @@ class CityTime(object):
 
         if self._is_set is False:
             raise ValueError()
-        dt = self._datetime
-        local = dt.astimezone(self._tz)
+        local = self._local()
         abbr = weekdays[local.weekday()]
 
         return abbr
@@ -526,8 +663,7 @@ class CityTime(object):
         """
         if self._is_set is False:
             raise ValueError()
-        dt = self._datetime
-        local = dt.astimezone(self._tz)
+        local = self._local()
         time_string = local.strftime('%H%M')
 
         return time_string
@@ -536,7 +672,8 @@ class CityTime(object):
             self, days: Optional[Union[int, float]]=None,
             hours: Optional[Union[int, float]]=None,
             minutes: Optional[Union[int, float]]=None,
-            seconds: Optional[Union[int, float]]=None
+            seconds: Optional[Union[int, float]]=None,
+            backend: Optional[Union[str, Backend]]=None,
     ) -> None:
         """
         Increment the time forward or back while adjusting for daylight savings time.
@@ -548,6 +685,8 @@ class CityTime(object):
         time will be 24 hours later. By incrementing the time by +24 hours, it will show that the
         local time is now 6am. This is due to daylight savings time ending at 2am on November 2.
 
+        The local time is checked with the object's backend, unless another backend is given.
+
         """
 
         if self._is_set is False:
@@ -568,7 +707,14 @@ class CityTime(object):
             increment += datetime.timedelta(seconds=seconds)
         result = self._datetime + increment
         assert isinstance(result, datetime.datetime)
-        self._tz.normalize(result.astimezone(self._tz))
+        if self._zone.fixed_offset is not None:
+            # Zones with a fixed offset have no DST changes to check for.
+            pass
+        elif backend is None:
+            self._backend.to_local(result, self._zone.tzinfo)
+        else:
+            _backend = get_backend(backend)
+            _backend.to_local(result, self._backend_tzinfo(_backend))
         self._datetime = result
 
     def local_strftime(self, form: str) -> str:
@@ -583,6 +729,20 @@ class CityTime(object):
         result = local_datetime.strftime(form)
         return result
 
+    def format(self, formatter: Union[Formatter, str]) -> str:
+        """
+        Convert the local time to a string with a Formatter (see formatting.py), or with a
+        strftime pattern, which is compiled to a Formatter once and cached.
+
+        Gives the same string as local_strftime(), but without interpreting the pattern again,
+        and the local time is only computed once for any number of calls.
+
+        :rtype: str
+        """
+        if self._is_set is False:
+            raise ValueError()
+        return get_formatter(formatter).format(self._local())
+
     def utc_strftime(self, form: str) -> str:
         """
         The equivalent of datetime.datetime.strftime, but for UTC time.
@@ -611,16 +771,96 @@ class CityTime(object):
         Returns a CityTime object set to the user's current local time, but taking a user input
         time zone.
 
+        For the current instant in a zone, see Clock.now() in clock.py.
+
         """
         if not zone:
             raise ValueError
-        try:
-            pytz.timezone(zone)
-        except UnknownTimeZoneError:
-            raise UnknownTimeZoneError(zone)
+        _zone = _get_zone(zone, get_backend())
+        current_time = datetime.datetime.now()
+        return cls(current_time, _zone)
+
+    @classmethod
+    def from_utc(
+            cls,
+            date_time: datetime.datetime,
+            zone: Zone,
+            local: Optional[datetime.datetime]=None,
+    ) -> 'CityTime':
+        """
+        Returns a CityTime object for an aware UTC datetime.datetime in a Zone, assigning both
+        directly without any of the checks of set(). The tzinfo of date_time must be the UTC
+        tzinfo of the zone's backend, as returned by CityTime.utc(). If the local time is
+        already known, as returned by CityTime.local(), it can be given too.
+
+        Only use this for values that are known to be valid, such as ones read back from storage.
+
+        :rtype: CityTime
+        """
+        new_object = cls.__new__(cls)
+        new_object._datetime = date_time
+        new_object._zone = zone
+        new_object._backend = zone.backend
+        new_object._is_set = True
+        if local is not None:
+            new_object._local_cache = (date_time, zone, local)
+        return new_object
+
+    @classmethod
+    def from_trusted(cls, utc_micros: int, zone: Union[Zone, int]) -> 'CityTime':
+        """
+        Returns a CityTime object for a UTC time in microseconds since the POSIX epoch, in a Zone
+        or the zone with the given Zone.id, without any of the checks of set().
+
+        Only use this for values that are known to be valid, such as ones read back from storage.
+
+        :raises IndexError: If there is no zone with the given id.
+        :rtype: CityTime
+        """
+        if not isinstance(zone, Zone):
+            zone = zones.zone_by_id(zone)
+        new_object = cls.__new__(cls)
+        new_object._datetime = _utc_epoch(zone.backend) + datetime.timedelta(microseconds=utc_micros)
+        new_object._zone = zone
+        new_object._backend = zone.backend
+        new_object._is_set = True
+        return new_object
+
+    @classmethod
+    def from_trusted_many(
+            cls,
+            utc_micros: Iterable[int],
+            zone: Union[Zone, int, Iterable[Union[Zone, int]]],
+    ) -> List['CityTime']:
+        """
+        Returns a list of CityTime objects for a column of UTC times in microseconds since the
+        POSIX epoch, like from_trusted(). zone is either one Zone or Zone.id for all of them, or
+        an iterable of them with one zone per time.
+
+        :raises IndexError: If there is no zone with one of the given ids.
+        :rtype: list
+        """
+        if isinstance(zone, (Zone, int)):
+            column: Iterable[Union[Zone, int]] = itertools.repeat(zone)
         else:
-            current_time = datetime.datetime.now()
-            return cls(current_time, zone)
+            column = zone
+        resolved: Dict[Union[Zone, int], Zone] = {}
+        epochs: Dict[Zone, datetime.datetime] = {}
+        new = cls.__new__
+        timedelta = datetime.timedelta
+        result = []
+        for micros, key in zip(utc_micros, column):
+            _zone = resolved.get(key)
+            if _zone is None:
+                _zone = resolved[key] = key if isinstance(key, Zone) else zones.zone_by_id(key)
+                epochs[_zone] = _utc_epoch(_zone.backend)
+            new_object = new(cls)
+            new_object._datetime = epochs[_zone] + timedelta(microseconds=micros)
+            new_object._zone = _zone
+            new_object._backend = _zone.backend
+            new_object._is_set = True
+            result.append(new_object)
+        return result
 
     def epoch(self) -> int:
         """
@@ -629,11 +869,79 @@ class CityTime(object):
         :rtype: int 
         """
         if self._is_set is True:
-            epoch_base = datetime.datetime(1970, 1, 1, tzinfo=pytz.timezone('UTC'))
-            return int((self.utc() - epoch_base).total_seconds())
+            return int((self.utc() - _utc_epoch(self._backend)).total_seconds())
         else:
             raise ValueError('Date/Time zone has not been set.')
 
+    def epoch_ms(self) -> int:
+        """
+        Returns the POSIX Epoch time in milliseconds, rounded down.
+
+        Unlike epoch(), which truncates towards zero, this rounds down before 1970 as well, so
+        that from_epoch(ct.epoch_ms(), zone, unit='ms') is never later than ct.
+
+        :rtype: int
+        """
+        return self.epoch_us() // 1000
+
+    def epoch_us(self) -> int:
+        """
+        Returns the POSIX Epoch time in microseconds, exactly.
+
+        :rtype: int
+        """
+        if self._is_set is not True:
+            raise ValueError('Date/Time zone has not been set.')
+        return (self._datetime - _utc_epoch(self._backend)) // MICROSECOND
+
+    @classmethod
+    def from_epoch(
+            cls,
+            value: Union[int, float],
+            zone: Union[str, Zone],
+            unit: str='s',
+            backend: Optional[Union[str, Backend]]=None,
+    ) -> 'CityTime':
+        """
+        Returns a CityTime object for a POSIX Epoch time in seconds ('s'), milliseconds ('ms'),
+        microseconds ('us') or nanoseconds ('ns'), in the given time zone.
+
+        Nanoseconds are rounded down to whole microseconds, and floats to the nearest
+        microsecond.
+
+        :raises ValueError: If the unit is not 's', 'ms', 'us' or 'ns'.
+        :raises TypeError: If the value is not a number.
+        :raises UnknownTimeZoneError: If the time zone is not in the Olson database.
+        :rtype: CityTime
+        """
+        if not isinstance(value, (int, float)):
+            raise TypeError("Attribute 'value' should be of type 'int' or 'float'")
+        _backend = get_backend(backend)
+        _zone = _get_zone(zone, _backend)
+        micros = convert_epochs([value], unit, 'us')[0]
+        return cls.from_utc(_utc_epoch(_backend) + datetime.timedelta(microseconds=micros), _zone)
+
+    @classmethod
+    def from_epoch_many(
+            cls,
+            values: Iterable[Union[int, float]],
+            zone: Union[str, Zone],
+            unit: str='s',
+            backend: Optional[Union[str, Backend]]=None,
+    ) -> List['CityTime']:
+        """
+        Returns a list of CityTime objects for a column of POSIX Epoch times, like from_epoch().
+
+        To go the other way, see tables.epochs(), and tables.convert_epochs() to change the
+        unit of a column without creating any objects.
+
+        :raises ValueError: If the unit is not 's', 'ms', 'us' or 'ns'.
+        :raises UnknownTimeZoneError: If the time zone is not in the Olson database.
+        :rtype: list
+        """
+        _zone = _get_zone(zone, get_backend(backend))
+        return cls.from_trusted_many(convert_epochs(values, unit, 'us'), _zone)
+
     def copy(self) -> 'CityTime':
         """
         Returns a copy of this CityTime instance.
@@ -642,8 +950,8 @@ class CityTime(object):
         """
         new_object = CityTime()
         new_object._datetime = self._datetime
-        new_object._t_zone = self._t_zone
-        new_object._tz = self._tz
+        new_object._zone = self._zone
+        new_object._backend = self._backend
         new_object._is_set = True
         return new_object
 
@@ -656,6 +964,33 @@ class CityTime(object):
         return self.local().strftime('%z')
 
 
+def _to_zone(utc: datetime.datetime, zone: Zone) -> datetime.datetime:
+    # datetime.astimezone, with plain arithmetic for zones with a fixed offset.
+    tz = zone.tzinfo
+    fixed_offset = zone.fixed_offset
+    if fixed_offset is None:
+        return utc.astimezone(tz)
+    if utc.tzinfo is tz:
+        return utc
+    return (utc + fixed_offset).replace(tzinfo=tz)
+
+
+def _utc_epoch(backend: Backend) -> datetime.datetime:
+    epoch = _UTC_EPOCHS.get(backend.name)
+    if epoch is None:
+        epoch = _UTC_EPOCHS[backend.name] = datetime.datetime(1970, 1, 1, tzinfo=backend.utc)
+    return epoch
+
+
+def _get_zone(time_zone: Union[str, Zone], backend: Backend) -> Zone:
+    if not isinstance(time_zone, (str, Zone)):
+        raise pytz.exceptions.UnknownTimeZoneError("Attribute 'time_zone' must be of type 'str'")
+    try:
+        return zones.get_zone(time_zone, backend)
+    except pytz.exceptions.UnknownTimeZoneError:
+        raise pytz.exceptions.UnknownTimeZoneError(time_zone)
+
+
 class Range(object):
     """
     Range extends the usefulness of CityTime objects by creating a time range between two
@@ -0,0 +1,203 @@
+"""
+A coarse, cached clock.
+
+Code that stamps every log line or metric with the current time asks for it thousands of times
+per second, and CityTime.now() looks the zone up and localizes the system time on every call.
+A Clock reads the system clock with time.time_ns() and rounds it down to its resolution, 1 ms by
+default. The UTC datetime.datetime of the current tick is built once per tick, and the local time
+in each zone once per tick and zone, so calls within the same tick only build the CityTime object
+they return.
+
+The UTC offset of a zone only changes at its transitions, so a Clock also keeps, for each zone,
+the offset and tzinfo in effect and the span of time until the next transition (see tables.py).
+Within that span the local time is plain datetime arithmetic; outside it the local time is
+converted through the backend again and the span renewed. Right after clocks go back, while the
+local times repeat, every tick is converted through the backend, so that zoneinfo's fold
+attribute is always right.
+
+Unlike CityTime.now(), which takes the local wall clock time of the system and places it in the
+given zone, Clock.now() returns the current instant, seen in the given zone.
+
+"""
+
+
+from bisect import bisect_right
+import datetime
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .backends import Backend, get_backend
+from .citytime import CityTime
+from .zones import Zone, get_zone
+
+
+NANOSECONDS_PER_SECOND = 1000000000
+
+_NEVER = float('inf')
+
+_default: Optional['Clock'] = None
+_lock = threading.Lock()
+
+
+def _time_ns() -> int:
+    return int(time.time() * NANOSECONDS_PER_SECOND)
+
+
+# time.time_ns() is new in Python 3.7.
+_time_ns = getattr(time, 'time_ns', _time_ns)
+
+
+class Clock(object):
+    """
+    A clock that caches the current time at a configurable resolution, and the UTC offset of
+    each zone it is asked about until that zone's next transition.
+
+    State is replaced as a whole rather than updated in place, so a Clock can be shared between
+    threads.
+
+    :param resolution: datetime.timedelta, at least one microsecond
+    :param backend: str or Backend, the default backend if not given
+    :param time_ns: function returning the current POSIX time in nanoseconds, time.time_ns by
+        default
+    :raises ValueError: If the resolution is less than one microsecond.
+    """
+    def __init__(
+            self,
+            resolution: datetime.timedelta=datetime.timedelta(milliseconds=1),
+            backend: Optional[Union[str, Backend]]=None,
+            time_ns: Optional[Callable[[], int]]=None,
+    ) -> None:
+        if resolution < datetime.timedelta(microseconds=1):
+            raise ValueError("Parameter 'resolution' must be at least one microsecond.")
+        self.resolution = resolution
+        self.backend = get_backend(backend)
+        self._step = resolution // datetime.timedelta(microseconds=1) * 1000
+        self._time_ns = _time_ns if time_ns is None else time_ns
+        self._epoch = datetime.datetime(1970, 1, 1, tzinfo=self.backend.utc)
+        # (tick in nanoseconds, UTC datetime.datetime)
+        self._current: Tuple[int, datetime.datetime] = (-1, self._epoch)
+        self._zones: Dict[Union[str, Zone], Zone] = {}
+        # Zone -> (tick, local time, valid from, valid until, offset, tzinfo), with the span in
+        # nanoseconds.
+        self._states: Dict[Zone, Tuple[int, datetime.datetime, float, float, datetime.timedelta, Any]] = {}
+
+    def __repr__(self) -> str:
+        return 'Clock(resolution={!r}, backend={!r})'.format(self.resolution, self.backend.name)
+
+    def _tick(self) -> Tuple[int, datetime.datetime]:
+        now = self._time_ns()
+        current = self._current
+        if current[0] <= now < current[0] + self._step:
+            return current
+        tick = now - now % self._step
+        current = self._current = (tick, self._epoch + datetime.timedelta(microseconds=tick // 1000))
+        return current
+
+    def _zone(self, zone: Union[str, Zone]) -> Zone:
+        resolved = self._zones.get(zone)
+        if resolved is None:
+            resolved = self._zones[zone] = get_zone(zone, self.backend)
+        return resolved
+
+    def _local(self, zone: Zone, tick: int, utc: datetime.datetime) -> datetime.datetime:
+        state = self._states.get(zone)
+        if state is not None:
+            if state[0] == tick:
+                return state[1]
+            if state[2] <= tick < state[3]:
+                local = (utc + state[4]).replace(tzinfo=state[5])
+                self._states[zone] = (tick, local, state[2], state[3], state[4], state[5])
+                return local
+        local = CityTime.from_utc(utc, zone).local()
+        offset = local.utcoffset()
+        assert offset is not None
+        start, end = self._span(zone, tick, offset)
+        self._states[zone] = (tick, local, start, end, offset, local.tzinfo)
+        return local
+
+    @staticmethod
+    def _span(zone: Zone, tick: int, offset: datetime.timedelta) -> Tuple[float, float]:
+        # The span around tick, in nanoseconds, in which the zone keeps the given offset and has
+        # no repeated local times.
+        if zone.fixed_offset is not None:
+            return -_NEVER, _NEVER
+        table = zone.table
+        transitions = table.transitions
+        offsets = table.offsets
+        seconds = tick // NANOSECONDS_PER_SECOND
+        i = max(0, bisect_right(transitions, seconds) - 1)
+        if offsets[i] != offset // datetime.timedelta(seconds=1):
+            # The backend's tzdata disagrees with the compiled table; don't cache at all.
+            return 0, 0
+        start = transitions[i] if i > 0 else -_NEVER
+        if i > 0 and offsets[i - 1] > offsets[i]:
+            # Clocks went back, so local times repeat until the old offset catches up.
+            start += offsets[i - 1] - offsets[i]
+        end = transitions[i + 1] if i + 1 < len(transitions) else _NEVER
+        return start * NANOSECONDS_PER_SECOND, end * NANOSECONDS_PER_SECOND
+
+    def utc(self) -> datetime.datetime:
+        """
+        Returns the current tick as an aware datetime.datetime in UTC.
+
+        :rtype: datetime.datetime
+        """
+        return self._tick()[1]
+
+    def timestamp(self) -> float:
+        """
+        Returns the current tick as a POSIX timestamp.
+
+        :rtype: float
+        """
+        return self._tick()[0] / NANOSECONDS_PER_SECOND
+
+    def local(self, zone: Union[str, Zone]='UTC') -> datetime.datetime:
+        """
+        Returns the current tick as an aware datetime.datetime in the local time of a zone, the
+        same as CityTime.local() would.
+
+        :raises UnknownTimeZoneError: If the zone is not in the Olson database.
+        :rtype: datetime.datetime
+        """
+        tick, utc = self._tick()
+        return self._local(self._zone(zone), tick, utc)
+
+    def now(self, zone: Union[str, Zone]='UTC') -> CityTime:
+        """
+        Returns a CityTime object set to the current tick in a zone. Its local time is already
+        computed, so formatting it doesn't convert it again.
+
+        :raises UnknownTimeZoneError: If the zone is not in the Olson database.
+        :rtype: CityTime
+        """
+        tick, utc = self._tick()
+        _zone = self._zone(zone)
+        return CityTime.from_utc(utc, _zone, self._local(_zone, tick, utc))
+
+    def today(self, zone: Union[str, Zone]='UTC') -> datetime.date:
+        """
+        Returns the current local date in a zone.
+
+        :raises UnknownTimeZoneError: If the zone is not in the Olson database.
+        :rtype: datetime.date
+        """
+        return self.local(zone).date()
+
+
+def get_clock() -> Clock:
+    """
+    Returns the process wide Clock, with a resolution of 1 ms and the default backend. It is
+    replaced when the default backend changes.
+
+    :rtype: Clock
+    """
+    global _default
+    clock = _default
+    if clock is None or clock.backend is not get_backend():
+        with _lock:
+            if _default is None or _default.backend is not get_backend():
+                _default = Clock()
+            clock = _default
+    return clock
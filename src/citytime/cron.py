@@ -0,0 +1,304 @@
+"""
+Cron expressions in local time.
+
+Finding the next run of a cron schedule by incrementing a CityTime a minute at a time and testing
+each minute costs one astimezone() per minute, thousands of them for a daily job. A
+CronSchedule walks the matching local wall times directly instead: months, then days, then the
+sorted minutes of the day that match, so every wall time it looks at is a match. Each one is
+turned into a UTC instant with the transition table of the zone (see tables.py and
+validation.py), one bisect per wall time.
+
+The expressions are the five fields of Vixie cron, minute, hour, day of month, month and day of
+week (0 or 7 = Sunday), each with *, lists, ranges, steps and English month and day names, and
+the @yearly, @monthly, @weekly, @daily and @hourly shortcuts. As in Vixie cron a day matches if
+either the day of month or the day of week does, when both are restricted.
+
+Local times changed by DST are handled as by Vixie cron:
+
+* a wall time skipped when clocks go forward runs at the same time after the change, moved
+  forward by the length of the gap (02:30 runs at 03:30 when clocks go from 02:00 to 03:00), see
+  resolve_offset() in validation.py;
+* a wall time repeated when clocks go back runs once, at its first occurrence, unless the hour
+  field is * or */n, in which case it runs at both, so that a job every 15 minutes keeps running
+  every 15 minutes.
+
+Because of the first rule, the instants of the wall times in order are not always in order
+themselves, so the search goes on past the first match for as long as the UTC offsets in use
+around it allow an earlier instant.
+
+"""
+
+
+from bisect import bisect_left, bisect_right
+import datetime
+import time
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from ._lazy import LazyModule
+from .citytime import CityTime
+from .tables import EPOCH, ZoneTable, timestamp
+from .validation import AMBIGUOUS, NON_EXISTENT, check_local
+from .zones import Zone, get_zone
+
+
+# calendar is imported on first use, see _lazy.py.
+calendar: Any = LazyModule('calendar', globals())
+
+SECONDS_PER_DAY = 86400
+
+# A day of month and a month that exist together turn up within 8 years (29 February).
+MAX_YEARS = 9
+
+ALIASES = {
+    '@yearly': '0 0 1 1 *',
+    '@annually': '0 0 1 1 *',
+    '@monthly': '0 0 1 * *',
+    '@weekly': '0 0 * * 0',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@hourly': '0 * * * *',
+}
+
+# In English whatever the locale, unlike calendar.month_abbr.
+_MONTH_NAMES = {
+    name: number
+    for number, name in enumerate(['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], 1)
+}
+_DAY_NAMES = {name: number for number, name in enumerate(['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'])}
+
+# (lowest, highest, names) of the five fields.
+_FIELDS: List[Tuple[int, int, Dict[str, int]]] = [
+    (0, 59, {}),
+    (0, 23, {}),
+    (1, 31, {}),
+    (1, 12, _MONTH_NAMES),
+    (0, 7, _DAY_NAMES),
+]
+
+_SCHEDULES: Dict[Tuple[str, Union[str, Zone]], 'CronSchedule'] = {}
+_MAX_SCHEDULES = 4096
+
+
+def _parse_value(text: str, names: Dict[str, int], expression: str) -> int:
+    try:
+        return names[text.lower()] if text.lower() in names else int(text)
+    except ValueError:
+        raise ValueError('Invalid cron expression {!r}: {!r} is not a number'.format(expression, text))
+
+
+def _parse_field(text: str, lowest: int, highest: int, names: Dict[str, int], expression: str) -> FrozenSet[int]:
+    values: Set[int] = set()
+    for part in text.split(','):
+        span, _, step_text = part.partition('/')
+        step = _parse_value(step_text, {}, expression) if step_text else 1
+        if span == '*':
+            start, end = lowest, highest
+        elif '-' in span:
+            first, _, last = span.partition('-')
+            start, end = _parse_value(first, names, expression), _parse_value(last, names, expression)
+        else:
+            start = _parse_value(span, names, expression)
+            end = highest if step_text else start
+        if not lowest <= start <= end <= highest or step < 1:
+            raise ValueError('Invalid cron expression {!r}: {!r} is out of range'.format(expression, part))
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule(object):
+    """
+    A cron expression evaluated in the local time of a zone.
+
+    :param expression: str, five fields or one of the @ shortcuts
+    :param zone: str or Zone, UTC by default
+    :raises ValueError: If the expression is not valid.
+    :raises UnknownTimeZoneError: If the zone is not in the Olson database.
+    """
+    def __init__(self, expression: str, zone: Union[str, Zone]='UTC') -> None:
+        self.expression = expression
+        self.zone = get_zone(zone)
+        fields = ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError('Invalid cron expression {!r}: expected 5 fields'.format(expression))
+        minutes, hours, days, months, weekdays = (
+            _parse_field(text, lowest, highest, names, expression) for text, (lowest, highest, names) in zip(fields, _FIELDS)
+        )
+        # Minutes of the day, in order.
+        self.times = sorted(hour * 60 + minute for hour in hours for minute in minutes)
+        self.days = days
+        self.months = sorted(months)
+        # As datetime.date.weekday(): 0 = Monday.
+        self.weekdays = frozenset((day - 1) % 7 for day in weekdays)
+        self._days_restricted = not fields[2].startswith('*')
+        self._weekdays_restricted = not fields[4].startswith('*')
+        self._every_hour = fields[1].startswith('*')
+
+    def __repr__(self) -> str:
+        return 'CronSchedule({!r}, {!r})'.format(self.expression, self.zone.name)
+
+    def _day_matches(self, day: datetime.date) -> bool:
+        # As in Vixie cron, a field starting with * (including */n) doesn't count as restricted
+        # for the choice between "or" and "and".
+        if self._days_restricted and self._weekdays_restricted:
+            return day.day in self.days or day.weekday() in self.weekdays
+        return day.day in self.days and day.weekday() in self.weekdays
+
+    def _wall_times(self, start: datetime.datetime, forward: bool) -> Iterator[int]:
+        # The matching wall times from start onwards (or backwards), start included, as seconds
+        # since 1970-01-01 00:00 local time, for MAX_YEARS years.
+        step = 1 if forward else -1
+        first_year = start.year
+        last_year = min(max(first_year + step * MAX_YEARS, datetime.MINYEAR - 1), datetime.MAXYEAR + 1)
+        start_day = start.date()
+        start_minute = start.hour * 60 + start.minute
+        months = self.months if forward else self.months[::-1]
+        for year in range(first_year, last_year, step):
+            for month in months:
+                if (year - first_year) * step <= 0 and (month - start.month) * step < 0:
+                    continue
+                length = calendar.monthrange(year, month)[1]
+                days = range(1, length + 1) if forward else range(length, 0, -1)
+                for number in days:
+                    day = datetime.date(year, month, number)
+                    if (day - start_day).days * step < 0 or not self._day_matches(day):
+                        continue
+                    base = (day - EPOCH.date()).days * SECONDS_PER_DAY
+                    times = self.times
+                    if day == start_day:
+                        if forward:
+                            times = times[bisect_left(times, start_minute):]
+                        else:
+                            times = times[:bisect_right(times, start_minute)]
+                    if not forward:
+                        times = times[::-1]
+                    for minute in times:
+                        yield base + minute * 60
+
+    def _instants(self, table: ZoneTable, wall_seconds: int) -> List[int]:
+        status, offsets = check_local(table, EPOCH + datetime.timedelta(seconds=wall_seconds))
+        if status == NON_EXISTENT:
+            return [wall_seconds - offsets[-1]]
+        if status == AMBIGUOUS and self._every_hour:
+            return [wall_seconds - offset for offset in offsets]
+        return [wall_seconds - offsets[0]]
+
+    def _search(self, stamp: float, forward: bool) -> int:
+        table = self.zone.table
+        lowest, highest = _offset_range(table, stamp)
+        # Wall times outside these bounds can't be on the right side of stamp with any offset
+        # in use around it.
+        wall = EPOCH + datetime.timedelta(seconds=stamp + (lowest if forward else highest))
+        wall = wall.replace(second=0, microsecond=0)
+        best: Optional[int] = None
+        limit = 0
+        for wall_seconds in self._wall_times(wall, forward):
+            if best is not None and (wall_seconds >= limit if forward else wall_seconds <= limit):
+                return best
+            for instant in self._instants(table, wall_seconds):
+                if forward and instant > stamp and (best is None or instant < best):
+                    best = instant
+                    limit = best + _offset_range(table, best)[1]
+                elif not forward and instant < stamp and (best is None or instant > best):
+                    best = instant
+                    limit = best + _offset_range(table, best)[0]
+        if best is None:
+            raise ValueError('Cron expression {!r} never matches'.format(self.expression))
+        return best
+
+    def next(self, after: Optional[Any]=None) -> CityTime:
+        """
+        Returns the first fire time strictly after an instant, by default now, as a CityTime in
+        the schedule's zone. The instant may be a CityTime object, a datetime.datetime object
+        or a POSIX timestamp.
+
+        :raises ValueError: If the expression never matches, e.g. 30 February.
+        :rtype: CityTime
+        """
+        stamp = time.time() if after is None else timestamp(after)
+        return CityTime.from_trusted(self._search(stamp, True) * 1000000, self.zone)
+
+    def previous(self, before: Optional[Any]=None) -> CityTime:
+        """
+        Returns the last fire time strictly before an instant, by default now, like next().
+
+        :raises ValueError: If the expression never matches, e.g. 30 February.
+        :rtype: CityTime
+        """
+        stamp = time.time() if before is None else timestamp(before)
+        return CityTime.from_trusted(self._search(stamp, False) * 1000000, self.zone)
+
+
+def _offset_range(table: ZoneTable, stamp: float) -> Tuple[int, int]:
+    # The lowest and highest UTC offsets the zone uses within a day of stamp.
+    transitions = table.transitions
+    first = max(0, bisect_right(transitions, stamp - SECONDS_PER_DAY) - 1)
+    last = max(first + 1, bisect_right(transitions, stamp + SECONDS_PER_DAY))
+    offsets = table.offsets[first:last]
+    return min(offsets), max(offsets)
+
+
+def get_schedule(expression: str, zone: Union[str, Zone]='UTC') -> CronSchedule:
+    """
+    Returns the CronSchedule for an expression and zone, from a cache of recently used ones.
+
+    :raises ValueError: If the expression is not valid.
+    :raises UnknownTimeZoneError: If the zone is not in the Olson database.
+    :rtype: CronSchedule
+    """
+    key = (expression, zone)
+    schedule = _SCHEDULES.get(key)
+    if schedule is None:
+        if len(_SCHEDULES) >= _MAX_SCHEDULES:
+            _SCHEDULES.clear()
+        schedule = _SCHEDULES[key] = CronSchedule(expression, zone)
+    return schedule
+
+
+def _schedules(schedules: Iterable[Union[CronSchedule, Tuple[str, Union[str, Zone]]]]) -> List[CronSchedule]:
+    return [item if isinstance(item, CronSchedule) else get_schedule(*item) for item in schedules]
+
+
+def next_fire_times(
+        schedules: Iterable[Union[CronSchedule, Tuple[str, Union[str, Zone]]]],
+        after: Optional[Any]=None,
+) -> List[CityTime]:
+    """
+    Returns CronSchedule.next() for each of many schedules, given as CronSchedule objects or
+    (expression, zone) pairs, after the same instant. Schedules with the same expression and
+    zone are only evaluated once.
+
+    :raises ValueError: If an expression is not valid or never matches.
+    :raises UnknownTimeZoneError: If a zone is not in the Olson database.
+    :rtype: list
+    """
+    stamp = time.time() if after is None else timestamp(after)
+    found: Dict[CronSchedule, int] = {}
+    result = []
+    for schedule in _schedules(schedules):
+        instant = found.get(schedule)
+        if instant is None:
+            instant = found[schedule] = schedule._search(stamp, True)
+        result.append(CityTime.from_trusted(instant * 1000000, schedule.zone))
+    return result
+
+
+def previous_fire_times(
+        schedules: Iterable[Union[CronSchedule, Tuple[str, Union[str, Zone]]]],
+        before: Optional[Any]=None,
+) -> List[CityTime]:
+    """
+    Returns CronSchedule.previous() for each of many schedules, like next_fire_times().
+
+    :raises ValueError: If an expression is not valid or never matches.
+    :raises UnknownTimeZoneError: If a zone is not in the Olson database.
+    :rtype: list
+    """
+    stamp = time.time() if before is None else timestamp(before)
+    found: Dict[CronSchedule, int] = {}
+    result = []
+    for schedule in _schedules(schedules):
+        instant = found.get(schedule)
+        if instant is None:
+            instant = found[schedule] = schedule._search(stamp, False)
+        result.append(CityTime.from_trusted(instant * 1000000, schedule.zone))
+    return result
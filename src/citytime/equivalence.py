@@ -0,0 +1,80 @@
+"""
+Zone equivalence classes.
+
+Hundreds of zones in the Olson database differ only in their history: Africa/Lagos and
+Africa/Kinshasa, or most of the zones of mainland Europe, have used the same UTC offsets at the
+same times for decades. Within a given time window, converting an instant to local time in any
+zone of such a group gives the same result, so batch conversions over many zones only need to
+do the work once per group.
+
+Two zones are equivalent over a window if they have the same UTC offset at its start and change
+to the same offsets at the same instants within it. Changes of abbreviation or of the DST flag
+that leave the total offset alone don't count, as they don't affect local times.
+
+"""
+
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .registry import get_registry
+from .tables import get_table, timestamp
+
+
+def window_signature(zone: str, start: Any, end: Any) -> Tuple[int, ...]:
+    """
+    Returns a tuple describing the UTC offsets of a zone between start and end inclusive: the
+    offset in effect at start, followed by (timestamp, offset) pairs for every change of offset
+    within the window. Zones with equal signatures are equivalent over the window.
+
+    start and end may be CityTime objects, datetime.datetime objects or POSIX timestamps.
+
+    :raises UnknownTimeZoneError: If the zone is not in the Olson database.
+    :rtype: tuple
+    """
+    table = get_table(zone)
+    first = table.index(timestamp(start))
+    last = table.index(timestamp(end))
+    transitions = table.transitions
+    offsets = table.offsets
+    signature = [offsets[first]]
+    for i in range(first + 1, last + 1):
+        if offsets[i] != offsets[i - 1]:
+            signature.append(transitions[i])
+            signature.append(offsets[i])
+    return tuple(signature)
+
+
+def group_zones(start: Any, end: Any, zones: Optional[Iterable[str]]=None) -> Dict[str, List[str]]:
+    """
+    Group zones that are equivalent between start and end. Returns a dict mapping the first
+    zone of each group (its representative) to all the zones of the group, in input order.
+
+    By default all canonical zones of the registry are grouped.
+
+    :raises ValueError: If end is before start.
+    :raises UnknownTimeZoneError: If a zone is not in the Olson database.
+    :rtype: dict
+    """
+    start, end = timestamp(start), timestamp(end)
+    if end < start:
+        raise ValueError('The end of the window must not be before its start.')
+    names = get_registry().zones() if zones is None else zones
+    representatives: Dict[Tuple[int, ...], str] = {}
+    groups: Dict[str, List[str]] = {}
+    for zone in names:
+        signature = window_signature(zone, start, end)
+        representative = representatives.setdefault(signature, zone)
+        groups.setdefault(representative, []).append(zone)
+    return groups
+
+
+def equivalence_classes(start: Any, end: Any, zones: Optional[Iterable[str]]=None) -> List[List[str]]:
+    """
+    Returns the zones (all canonical zones by default) grouped into classes of zones that are
+    equivalent between start and end, in order of first appearance.
+
+    :raises ValueError: If end is before start.
+    :raises UnknownTimeZoneError: If a zone is not in the Olson database.
+    :rtype: list
+    """
+    return list(group_zones(start, end, zones).values())
@@ -0,0 +1,169 @@
+"""
+Array-level local calendar fields.
+
+CityTime.weekday(), CityTime.local_minute() and CityTime.day_name() each convert a single
+object to its local time with datetime.astimezone. When a whole column of events has to be
+grouped by local hour or weekday, the functions in this module do the same conversion for
+every instant at once, using the compiled transition table of the zone (see tables.py) and
+integer arithmetic instead of building a datetime per event.
+
+Instants may be CityTime objects, timezone aware datetime.datetime objects or POSIX timestamps.
+Plain timestamps are by far the fastest input.
+
+The _by_zone variants take many zones at once and do the work once per class of zones that are
+equivalent over the span of the instants (see equivalence.py).
+
+"""
+
+
+from bisect import bisect_right
+from collections import Counter
+import datetime
+from math import floor
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+from .equivalence import group_zones
+from .tables import get_table, timestamps
+
+
+SECONDS_PER_DAY = 86400
+
+_EPOCH_DATE = datetime.date(1970, 1, 1)
+
+# 1970-01-01 was a Thursday (Monday = 0).
+_EPOCH_WEEKDAY = 3
+
+_BUCKET_WIDTHS = {
+    'hour': (3600, 24),
+    'minute_of_day': (60, 1440),
+}
+
+
+class LocalFields(NamedTuple):
+    """
+    Local calendar fields of a column of instants, one list per field.
+
+    weekday follows datetime.datetime.weekday() (0 = Monday, 6 = Sunday).
+    """
+    year: List[int]
+    month: List[int]
+    day: List[int]
+    hour: List[int]
+    minute: List[int]
+    weekday: List[int]
+    iso_week: List[int]
+
+
+def local_seconds(instants: Iterable[Any], zone: str) -> List[int]:
+    """
+    Returns the local wall clock time of each instant as whole seconds since 1970-01-01 00:00
+    local time.
+
+    :rtype: list
+    """
+    table = get_table(zone)
+    stamps = timestamps(instants)
+    if table.is_fixed():
+        offset = table.offsets[0]
+        return [floor(stamp) + offset for stamp in stamps]
+    # The first transition is at datetime.min, so the index can't fall below zero for any
+    # instant a datetime can represent.
+    transitions = table.transitions
+    offsets = table.offsets
+    return [floor(stamp) + offsets[bisect_right(transitions, stamp) - 1] for stamp in stamps]
+
+
+def _calendar_day(days: int) -> Tuple[int, int, int, int, int]:
+    date = _EPOCH_DATE + datetime.timedelta(days=days)
+    return date.year, date.month, date.day, date.weekday(), date.isocalendar()[1]
+
+
+def local_fields(instants: Iterable[Any], zone: str) -> LocalFields:
+    """
+    Returns the local year, month, day, hour, minute, weekday and ISO week of each instant.
+
+    Calendar dates are computed once per distinct local day, so large columns of events that
+    fall on a limited number of days are cheap to process.
+
+    :rtype: LocalFields
+    """
+    fields = LocalFields([], [], [], [], [], [], [])
+    year, month, day, hour, minute, weekday, iso_week = fields
+    days_seen: Dict[int, Tuple[int, int, int, int, int]] = {}
+    for value in local_seconds(instants, zone):
+        days, remainder = divmod(value, SECONDS_PER_DAY)
+        date = days_seen.get(days)
+        if date is None:
+            date = days_seen[days] = _calendar_day(days)
+        year.append(date[0])
+        month.append(date[1])
+        day.append(date[2])
+        weekday.append(date[3])
+        iso_week.append(date[4])
+        hour.append(remainder // 3600)
+        minute.append(remainder % 3600 // 60)
+    return fields
+
+
+def histogram(instants: Iterable[Any], zone: str, by: str='hour') -> List[int]:
+    """
+    Count instants by local hour (24 buckets), weekday (7 buckets, Monday first) or
+    minute of the day (1440 buckets).
+
+    :raises ValueError: If 'by' is not 'hour', 'weekday' or 'minute_of_day'.
+    :rtype: list
+    """
+    if by == 'weekday':
+        seconds = local_seconds(instants, zone)
+        counts = Counter((value // SECONDS_PER_DAY + _EPOCH_WEEKDAY) % 7 for value in seconds)
+        size = 7
+    elif by in _BUCKET_WIDTHS:
+        width, size = _BUCKET_WIDTHS[by]
+        seconds = local_seconds(instants, zone)
+        counts = Counter(value % SECONDS_PER_DAY // width for value in seconds)
+    else:
+        raise ValueError("Parameter 'by' must be 'hour', 'weekday' or 'minute_of_day'")
+    return [counts.get(bucket, 0) for bucket in range(size)]
+
+
+def _by_zone(stamps: List[float], zones: Iterable[str], function: Any, *args: Any) -> Dict[str, Any]:
+    zones = list(zones)
+    if stamps:
+        groups = group_zones(min(stamps), max(stamps), zones)
+    else:
+        groups = {zone: [zone] for zone in zones}
+    results = {}
+    for representative, members in groups.items():
+        result = function(stamps, representative, *args)
+        for zone in members:
+            results[zone] = result
+    return results
+
+
+def local_fields_by_zone(instants: Iterable[Any], zones: Iterable[str]) -> Dict[str, LocalFields]:
+    """
+    Returns local_fields(instants, zone) for each of the zones, as a dict keyed by zone.
+
+    Zones that are equivalent over the span of the instants share one LocalFields object, so
+    treat the results as read-only.
+
+    :raises UnknownTimeZoneError: If a zone is not in the Olson database.
+    :rtype: dict
+    """
+    return _by_zone(timestamps(instants), zones, local_fields)
+
+
+def histogram_by_zone(instants: Iterable[Any], zones: Iterable[str], by: str='hour') -> Dict[str, List[int]]:
+    """
+    Returns histogram(instants, zone, by) for each of the zones, as a dict keyed by zone.
+
+    Zones that are equivalent over the span of the instants share one list, so treat the results
+    as read-only.
+
+    :raises ValueError: If 'by' is not 'hour', 'weekday' or 'minute_of_day'.
+    :raises UnknownTimeZoneError: If a zone is not in the Olson database.
+    :rtype: dict
+    """
+    if by != 'weekday' and by not in _BUCKET_WIDTHS:
+        raise ValueError("Parameter 'by' must be 'hour', 'weekday' or 'minute_of_day'")
+    return _by_zone(timestamps(instants), zones, histogram, by)
@@ -0,0 +1,411 @@
+"""
+Bulk formatting of local times.
+
+Formatting a column of instants with CityTime.local_strftime() converts each one to a local
+datetime and has strftime interpret the format string again for every row. format_many()
+compiles the pattern once instead, and splits it by what each part depends on:
+
+* date directives (%Y, %m, %d, %a, ...) only change from one local day to the next, so they are
+  rendered with strftime once per day and zone offset, together with the literal text and the
+  offset directives %z, %:z and %Z, into a %-style template;
+* time directives (%H, %M, %S, %I, %p, ...) only depend on the second of the day, so their
+  strings are rendered once per distinct second and looked up after that; %f is the only
+  directive computed for every row.
+
+Each row then costs one bisect in the zone's transition table (see tables.py), two dict lookups
+and one string interpolation. Patterns with any other directive, such as %c, which mixes date
+and time, or platform specific ones such as %k, are formatted with strftime row by row.
+
+A Formatter is the same idea for one instant at a time: the pattern is compiled once into a
+str.format() template with one field extractor per directive, reading the field straight off the
+local datetime, so CityTime.format() doesn't interpret the pattern again for every call.
+
+%:z is the ISO 8601 form of %z, '+05:30' rather than '+0530', as in Python 3.12's strftime.
+
+"""
+
+
+from bisect import bisect_right
+import datetime
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .tables import UTC_EPOCH, epochs, get_table
+from .zones import get_zone
+
+
+ISO_8601 = '%Y-%m-%dT%H:%M:%S%:z'
+
+SECONDS_PER_DAY = 86400
+
+# Directives that only depend on the date, and those that only depend on the time of day. The
+# offset directives %z, %:z and %Z are rendered per day and offset; format_many() leaves patterns
+# with any other directive, such as %c or platform ones like %k, to strftime.
+_DATE_DIRECTIVES = frozenset('aAbBdjmuUVwWyYGgCDFxhne')
+_TIME_DIRECTIVES = frozenset('HIMSfpXTRr')
+_OFFSET_DIRECTIVES = frozenset(['z', ':z', 'Z'])
+# Directives that depend on both the date and the time of day, and the flags some platforms
+# accept between % and the directive, such as %-d. A Formatter leaves patterns with any of them to
+# strftime.
+_STRFTIME_ONLY = frozenset('cs-_0^#EO')
+
+_EPOCH_DATE = datetime.date(1970, 1, 1)
+_TWO_DIGITS = ['{:02d}'.format(value) for value in range(100)]
+
+_PATTERNS: Dict[str, '_CompiledPattern'] = {}
+_FORMATTERS: Dict[str, 'Formatter'] = {}
+_MAX_PATTERNS = 256
+
+
+def _offset_string(seconds: int, separator: str='') -> str:
+    sign = '-' if seconds < 0 else '+'
+    minutes, seconds = divmod(abs(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    text = '{}{:02d}{}{:02d}'.format(sign, hours, separator, minutes)
+    if seconds:
+        text += '{}{:02d}'.format(separator, seconds)
+    return text
+
+
+def _tokenize(pattern: str) -> List[Tuple[bool, str]]:
+    # (True, directive) or (False, literal text)
+    tokens: List[Tuple[bool, str]] = []
+    literal = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '%' and i + 1 < len(pattern):
+            code = pattern[i + 1]
+            if code == '%':
+                literal.append('%')
+                i += 2
+                continue
+            if code == ':' and pattern[i + 2:i + 3] == 'z':
+                code = ':z'
+            if literal:
+                tokens.append((False, ''.join(literal)))
+                literal = []
+            tokens.append((True, code))
+            i += 1 + len(code)
+        else:
+            literal.append(char)
+            i += 1
+    if literal:
+        tokens.append((False, ''.join(literal)))
+    return tokens
+
+
+class _CompiledPattern(object):
+    """
+    A strftime pattern split into per-day templates and per-second time strings.
+
+    :param pattern: str
+    """
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        self.tokens = _tokenize(pattern)
+        codes = [code for is_directive, code in self.tokens if is_directive]
+        self.time_codes = [code for code in codes if code in _TIME_DIRECTIVES]
+        self.has_microseconds = 'f' in self.time_codes
+        known = _DATE_DIRECTIVES | _TIME_DIRECTIVES | _OFFSET_DIRECTIVES
+        self.mixed = any(code not in known for code in codes)
+
+    def __repr__(self) -> str:
+        return '_CompiledPattern({!r})'.format(self.pattern)
+
+    def day_template(self, day: int, offset: int, abbreviation: str) -> str:
+        """
+        Returns the %-style template for a local day, as a number of days since 1970-01-01, and
+        UTC offset, with a %s for each time directive.
+
+        :rtype: str
+        """
+        date = _EPOCH_DATE + datetime.timedelta(days=day)
+        pieces = []
+        for is_directive, code in self.tokens:
+            if not is_directive:
+                text = code
+            elif code in _TIME_DIRECTIVES:
+                pieces.append('%s')
+                continue
+            elif code == 'z':
+                text = _offset_string(offset)
+            elif code == ':z':
+                text = _offset_string(offset, ':')
+            elif code == 'Z':
+                text = abbreviation
+            else:
+                text = date.strftime('%' + code)
+            pieces.append(text.replace('%', '%%'))
+        return ''.join(pieces)
+
+    def time_strings(self, second: int) -> List[Optional[str]]:
+        """
+        Returns the strings of the time directives at a second of the day, with None for %f.
+
+        :rtype: list
+        """
+        hour, rest = divmod(second, 3600)
+        minute, second = divmod(rest, 60)
+        moment = datetime.time(hour, minute, second)
+        strings: List[Optional[str]] = []
+        for code in self.time_codes:
+            if code == 'H':
+                strings.append(_TWO_DIGITS[hour])
+            elif code == 'M':
+                strings.append(_TWO_DIGITS[minute])
+            elif code == 'S':
+                strings.append(_TWO_DIGITS[second])
+            elif code == 'f':
+                strings.append(None)
+            else:
+                strings.append(moment.strftime('%' + code))
+        return strings
+
+
+def compile_pattern(pattern: str) -> _CompiledPattern:
+    """
+    Returns the compiled form of a strftime pattern, from a cache of recently used patterns.
+
+    :rtype: _CompiledPattern
+    """
+    compiled = _PATTERNS.get(pattern)
+    if compiled is None:
+        if len(_PATTERNS) >= _MAX_PATTERNS:
+            _PATTERNS.clear()
+        compiled = _PATTERNS[pattern] = _CompiledPattern(pattern)
+    return compiled
+
+
+def _split_iso_offset(pattern: str) -> List[str]:
+    # The parts of a pattern between its %:z directives, which strftime doesn't know before
+    # Python 3.12. A literal %% followed by ':z' is not one.
+    parts = []
+    start = i = 0
+    while True:
+        i = pattern.find('%', i)
+        if i < 0:
+            break
+        if pattern.startswith('%:z', i):
+            parts.append(pattern[start:i])
+            start = i = i + 3
+        else:
+            i += 2
+    parts.append(pattern[start:])
+    return parts
+
+
+def _format_with_strftime(micros: List[int], zone: str, pattern: str) -> List[str]:
+    tz = get_zone(zone).tzinfo
+    timedelta = datetime.timedelta
+    # Each part is formatted on its own and joined with the offset.
+    parts = _split_iso_offset(pattern)
+    result = []
+    for value in micros:
+        local = (UTC_EPOCH + timedelta(microseconds=value)).astimezone(tz)
+        if len(parts) == 1:
+            result.append(local.strftime(pattern))
+        else:
+            result.append(_offset(local, ':').join([local.strftime(part) for part in parts]))
+    return result
+
+
+def format_many(instants: Iterable[Any], zone: str, pattern: str=ISO_8601) -> List[str]:
+    """
+    Format a column of instants as local times in a zone, like CityTime.local_strftime() but
+    compiling the pattern once for the whole column. The default pattern is ISO_8601,
+    e.g. '2018-06-01T12:30:00-04:00'. Use zone 'UTC' for UTC strings.
+
+    Instants may be CityTime objects, timezone aware datetime.datetime objects or POSIX
+    timestamps (naive datetime.datetime objects are taken to be UTC).
+
+    :raises UnknownTimeZoneError: If the zone is not in the Olson database.
+    :rtype: list
+    """
+    micros = epochs(instants, 'us')
+    compiled = compile_pattern(pattern)
+    if compiled.mixed:
+        return _format_with_strftime(micros, zone, pattern)
+    table = get_table(zone)
+    transitions = table.transitions
+    offsets = table.offsets
+    abbreviations = table.abbreviations
+    fixed = table.is_fixed()
+    templates: Dict[Tuple[int, int], str] = {}
+    times: Dict[int, Tuple[Optional[str], ...]] = {}
+    has_microseconds = compiled.has_microseconds
+    result = []
+    for value in micros:
+        seconds, fraction = divmod(value, 1000000)
+        index = 0 if fixed else bisect_right(transitions, seconds) - 1
+        day, second = divmod(seconds + offsets[index], SECONDS_PER_DAY)
+        template = templates.get((day, index))
+        if template is None:
+            template = templates[day, index] = compiled.day_template(day, offsets[index], abbreviations[index])
+        strings = times.get(second)
+        if strings is None:
+            strings = times[second] = tuple(compiled.time_strings(second))
+        if has_microseconds:
+            microseconds = '{:06d}'.format(fraction)
+            strings = tuple(microseconds if text is None else text for text in strings)
+        result.append(template % strings)
+    return result
+
+
+# Directives that are a plain attribute of the local datetime, with their str.format() spec.
+# strftime pads years before 1000 on some platforms but not on others.
+_ATTRIBUTE_FIELDS = {
+    'Y': ('year', ':04d' if datetime.date(999, 1, 1).strftime('%Y') == '0999' else ''),
+    'm': ('month', ':02d'),
+    'd': ('day', ':02d'),
+    'H': ('hour', ':02d'),
+    'M': ('minute', ':02d'),
+    'S': ('second', ':02d'),
+    'f': ('microsecond', ':06d'),
+}
+
+# (UTC offset, separator) -> offset string
+_OFFSET_STRINGS: Dict[Tuple[Optional[datetime.timedelta], str], str] = {}
+
+
+def _offset(local: datetime.datetime, separator: str) -> str:
+    offset = local.utcoffset()
+    text = _OFFSET_STRINGS.get((offset, separator))
+    if text is None:
+        text = '' if offset is None else _offset_string(offset // datetime.timedelta(seconds=1), separator)
+        _OFFSET_STRINGS[offset, separator] = text
+    return text
+
+
+def _offset_field(separator: str) -> Callable[[datetime.datetime], str]:
+    # The offset string of tzinfo objects that always have the same UTC offset, which includes
+    # the tzinfo of any local time made with pytz, is kept by tzinfo. Looking up the offset of a
+    # pytz tzinfo costs a Python method call.
+    by_tzinfo: Dict[datetime.tzinfo, str] = {}
+
+    def extractor(local: datetime.datetime) -> str:
+        tzinfo = local.tzinfo
+        text = by_tzinfo.get(tzinfo)  # type: ignore
+        if text is None:
+            text = _offset(local, separator)
+            if tzinfo is not None and (hasattr(tzinfo, '_utcoffset') or tzinfo.utcoffset(None) is not None):
+                by_tzinfo[tzinfo] = text
+        return text
+    return extractor
+
+
+def _names(code: str, dates: Iterable[datetime.date]) -> List[str]:
+    return [date.strftime('%' + code) for date in dates]
+
+
+# 2018-01-01 was a Monday.
+_WEEKDAY_NAMES = {code: _names(code, (datetime.date(2018, 1, day) for day in range(1, 8))) for code in 'aA'}
+_MONTH_NAMES = {code: [''] + _names(code, (datetime.date(2018, month, 1) for month in range(1, 13))) for code in 'bB'}
+_AM_PM = _names('p', (datetime.datetime(2018, 1, 1, hour) for hour in (0, 12)))
+
+_EXTRACTORS: Dict[str, Callable[[datetime.datetime], str]] = {
+    'y': lambda local: _TWO_DIGITS[local.year % 100],
+    'I': lambda local: _TWO_DIGITS[(local.hour + 11) % 12 + 1],
+    'p': lambda local: _AM_PM[local.hour >= 12],
+    'a': lambda local: _WEEKDAY_NAMES['a'][local.weekday()],
+    'A': lambda local: _WEEKDAY_NAMES['A'][local.weekday()],
+    'b': lambda local: _MONTH_NAMES['b'][local.month],
+    'B': lambda local: _MONTH_NAMES['B'][local.month],
+    'w': lambda local: str(local.isoweekday() % 7),
+    'z': _offset_field(''),
+    ':z': _offset_field(':'),
+    'Z': lambda local: local.tzname() or '',
+}
+
+
+def _strftime_field(directive: str) -> Callable[[datetime.datetime], str]:
+    def extractor(local: datetime.datetime) -> str:
+        return local.strftime(directive)
+    return extractor
+
+
+class Formatter(object):
+    """
+    A strftime pattern compiled once, for formatting many single instants with the same pattern.
+    Formatting a local datetime gives the same string as its strftime(), with %:z as the ISO
+    8601 offset.
+
+    The pattern becomes a str.format() template. Directives that are an attribute of the local
+    datetime, such as %Y or %H, are read with a single operator.attrgetter() call, and each of
+    the others has an extractor function.
+
+    Day, month and AM/PM names are those of the locale in use when the Formatter is created.
+    Patterns with directives that mix date and time, such as %c, are formatted with strftime.
+
+    :param pattern: str
+    """
+    def __init__(self, pattern: str) -> None:
+        self.pattern = pattern
+        # The parts of the pattern between its %:z directives, for patterns left to strftime.
+        self._strftime_parts: Optional[List[str]] = None
+        tokens = _tokenize(pattern)
+        if any(is_directive and code in _STRFTIME_ONLY for is_directive, code in tokens):
+            self._strftime_parts = _split_iso_offset(pattern)
+        attributes = [
+            _ATTRIBUTE_FIELDS[code][0] for is_directive, code in tokens if is_directive and code in _ATTRIBUTE_FIELDS
+        ]
+        pieces = []
+        extractors: List[Callable[[datetime.datetime], str]] = []
+        position = 0
+        for is_directive, code in tokens:
+            if not is_directive:
+                pieces.append(code.replace('{', '{{').replace('}', '}}'))
+            elif code in _ATTRIBUTE_FIELDS:
+                # Attribute values come first in the arguments, then the extracted strings.
+                pieces.append('{{{}{}}}'.format(position, _ATTRIBUTE_FIELDS[code][1]))
+                position += 1
+            else:
+                pieces.append('{{{}}}'.format(len(attributes) + len(extractors)))
+                extractors.append(_EXTRACTORS.get(code) or _strftime_field('%' + code))
+        self._template = ''.join(pieces)
+        self._extractors = tuple(extractors)
+        self._attributes: Optional[Callable[[datetime.datetime], Tuple[int, ...]]] = None
+        if len(attributes) == 1:
+            # attrgetter returns a bare value rather than a tuple for a single attribute.
+            attribute = attributes[0]
+            self._attributes = lambda local: (getattr(local, attribute),)
+        elif attributes:
+            self._attributes = attrgetter(*attributes)
+
+    def __repr__(self) -> str:
+        return 'Formatter({!r})'.format(self.pattern)
+
+    def format(self, instant: Union[datetime.datetime, Any]) -> str:
+        """
+        Format an aware local datetime.datetime, or a CityTime object in its own zone.
+
+        :rtype: str
+        """
+        if not isinstance(instant, datetime.datetime):
+            return str(instant.format(self))
+        parts = self._strftime_parts
+        if parts is not None:
+            if len(parts) == 1:
+                return instant.strftime(parts[0])
+            return _offset(instant, ':').join([instant.strftime(part) for part in parts])
+        values: Tuple[Any, ...] = () if self._attributes is None else self._attributes(instant)
+        if self._extractors:
+            values += tuple([extractor(instant) for extractor in self._extractors])
+        return self._template.format(*values)
+
+
+def get_formatter(pattern: Union[str, Formatter]) -> Formatter:
+    """
+    Returns a Formatter for a strftime pattern, from a cache of recently used patterns. A
+    Formatter is returned as it is.
+
+    :rtype: Formatter
+    """
+    if isinstance(pattern, Formatter):
+        return pattern
+    formatter = _FORMATTERS.get(pattern)
+    if formatter is None:
+        if len(_FORMATTERS) >= _MAX_PATTERNS:
+            _FORMATTERS.clear()
+        formatter = _FORMATTERS[pattern] = Formatter(pattern)
+    return formatter
@@ -0,0 +1,323 @@
+"""
+Opt-in instrumentation for CityTime and Range.
+
+Nothing in this module runs until enable() is called. enable() swaps timing wrappers in for the
+CityTime and Range methods and counting wrappers in for the time zone library calls CityTime
+makes (zone lookups, localize, normalize and UTC to local conversions), and disable() puts the
+original functions back. While disabled there is no instrumentation code left on any hot path.
+
+Counters are kept per operation: a zone lookup made while CityTime.set is running is counted
+against 'CityTime.set'. Calls pytz makes internally (localize normalizes several candidate
+times, for example) are not counted, only the ones made by CityTime itself.
+
+Usage:
+
+    from citytime import instrumentation
+
+    with instrumentation.measure() as recorder:
+        run_workload()
+    print(recorder.snapshot())
+
+Note that while enabled, the pytz wrappers count calls made by any code in the process. UTC to
+local conversions are counted for pytz zones only, as zoneinfo does them in C.
+
+"""
+
+
+import contextlib
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import zones
+from .backends import ZoneInfoBackend
+from .citytime import CityTime, Range
+
+
+logger = logging.getLogger(__package__)
+
+CITYTIME_OPERATIONS = (
+    '__init__', 'set', 'set_iso_format', 'change_tz', 'local', 'astimezone', 'increment',
+    '__add__', '__sub__', 'epoch', 'copy',
+)
+
+RANGE_OPERATIONS = (
+    '_create_range', '_create_range_timedelta', 'contains', 'overlaps', 'overlap', 'intersection',
+    'extend', 'extend_prior', 'shift', 'copy',
+)
+
+# Operation name used for events that happen outside of any instrumented method.
+OUTSIDE = 'other'
+
+
+class Histogram(object):
+    """
+    Latency histogram with power of two nanosecond buckets.
+
+    Each bucket is keyed by its upper bound: a call that took 700 ns is counted in bucket 1024.
+    """
+    __slots__ = ('count', 'total_ns', 'min_ns', 'max_ns', 'buckets')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, ns: int) -> None:
+        if not self.count or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.count += 1
+        self.total_ns += ns
+        bucket = 1 << max(0, ns - 1).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_ns': self.total_ns,
+            'mean_ns': self.total_ns / self.count if self.count else 0,
+            'min_ns': self.min_ns,
+            'max_ns': self.max_ns,
+            'buckets': dict(sorted(self.buckets.items())),
+        }
+
+
+class Recorder(object):
+    """
+    Collects event counters and latency histograms per operation.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._latency: Dict[str, Histogram] = {}
+
+    def count(self, operation: str, event: str) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(operation, {})
+            counters[event] = counters.get(event, 0) + 1
+
+    def time(self, operation: str, ns: int) -> None:
+        with self._lock:
+            histogram = self._latency.get(operation)
+            if histogram is None:
+                histogram = self._latency[operation] = Histogram()
+            histogram.add(ns)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters = {}
+            self._latency = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns a copy of everything recorded so far.
+
+        {'counters': {operation: {event: count}}, 'latency': {operation: histogram}}
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'counters': {op: dict(events) for op, events in sorted(self._counters.items())},
+                'latency': {op: hist.snapshot() for op, hist in sorted(self._latency.items())},
+            }
+
+
+class _State(threading.local):
+    def __init__(self) -> None:
+        self.operations: List[str] = []
+        self.in_pytz = False
+        # The exception last counted, so that the operations it propagates through don't count
+        # it again.
+        self.exception: Optional[BaseException] = None
+
+
+_state = _State()
+# Replaced, never changed in place, so that the recording path can iterate it without the lock.
+_recorders: Tuple[Recorder, ...] = ()
+_originals: List[Tuple[Any, str, Any]] = []
+# Held by enable(), disable() and measure() while they change _recorders and _originals.
+_lock = threading.RLock()
+_global = Recorder()
+_dump_interval: Optional[float] = None
+_last_dump = 0.0
+
+
+def _perf_counter_ns() -> int:
+    return int(time.perf_counter() * 1000000000)
+
+
+# time.perf_counter_ns() is new in Python 3.7.
+_perf_counter_ns = getattr(time, 'perf_counter_ns', _perf_counter_ns)
+
+
+def _event_hooks() -> List[Tuple[Any, str, str]]:
+    import pytz
+    from pytz import tzinfo
+    utc = type(pytz.utc)
+    return [
+        (zones, 'get_zone', 'zone_lookup'),
+        (ZoneInfoBackend, 'timezone', 'zone_lookup'),
+        (ZoneInfoBackend, 'localize', 'localize'),
+        (pytz, 'timezone', 'zone_lookup'),
+        (tzinfo.DstTzInfo, 'localize', 'localize'),
+        (tzinfo.StaticTzInfo, 'localize', 'localize'),
+        (utc, 'localize', 'localize'),
+        (tzinfo.DstTzInfo, 'normalize', 'normalize'),
+        (tzinfo.StaticTzInfo, 'normalize', 'normalize'),
+        (utc, 'normalize', 'normalize'),
+        (tzinfo.DstTzInfo, 'fromutc', 'astimezone'),
+        (tzinfo.StaticTzInfo, 'fromutc', 'astimezone'),
+        (utc, 'fromutc', 'astimezone'),
+    ]
+
+
+def _record_event(event: str) -> None:
+    operation = _state.operations[-1] if _state.operations else OUTSIDE
+    for recorder in _recorders:
+        recorder.count(operation, event)
+
+
+def _counting(function: Callable[..., Any], event: str) -> Callable[..., Any]:
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _state.in_pytz:
+            return function(*args, **kwargs)
+        _record_event(event)
+        _state.in_pytz = True
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _state.in_pytz = False
+    return wrapper
+
+
+def _timed(function: Callable[..., Any], operation: str) -> Callable[..., Any]:
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        operations = _state.operations
+        operations.append(operation)
+        start = _perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        except Exception as e:
+            # Counted against the innermost operation only.
+            if e is not _state.exception:
+                _state.exception = e
+                _record_event('exception:' + type(e).__name__)
+            raise
+        finally:
+            elapsed = _perf_counter_ns() - start
+            operations.pop()
+            for recorder in _recorders:
+                recorder.time(operation, elapsed)
+            if not operations:
+                _state.exception = None
+                if _dump_interval is not None:
+                    _maybe_dump()
+    return wrapper
+
+
+def _maybe_dump() -> None:
+    global _last_dump
+    now = time.monotonic()
+    if _dump_interval is not None and now - _last_dump >= _dump_interval:
+        _last_dump = now
+        logger.info('CityTime instrumentation: %s', _global.snapshot())
+
+
+def _patch(owner: Any, name: str, replacement: Callable[..., Any]) -> None:
+    _originals.append((owner, name, owner.__dict__[name]))
+    setattr(owner, name, replacement)
+
+
+def is_enabled() -> bool:
+    """
+    Returns True if instrumentation is currently enabled.
+
+    :rtype: bool
+    """
+    return bool(_originals)
+
+
+def enable(dump_interval: Optional[float]=None) -> None:
+    """
+    Start recording.
+
+    If dump_interval is given, a snapshot of the global recorder is logged at INFO level to the
+    'citytime' logger at most once every dump_interval seconds, whenever an instrumented
+    operation completes.
+    """
+    global _dump_interval, _last_dump, _recorders
+    with _lock:
+        _dump_interval = dump_interval
+        _last_dump = time.monotonic()
+        if is_enabled():
+            return
+        if _global not in _recorders:
+            _recorders = _recorders + (_global,)
+        for owner, operations in ((CityTime, CITYTIME_OPERATIONS), (Range, RANGE_OPERATIONS)):
+            for name in operations:
+                _patch(owner, name, _timed(owner.__dict__[name], '{}.{}'.format(owner.__name__, name)))
+        for owner, name, event in _event_hooks():
+            _patch(owner, name, _counting(owner.__dict__[name], event))
+
+
+def disable() -> None:
+    """
+    Stop recording and restore the original, uninstrumented functions.
+
+    Recorded data is kept until reset() is called.
+    """
+    global _dump_interval, _recorders
+    with _lock:
+        while _originals:
+            owner, name, original = _originals.pop()
+            setattr(owner, name, original)
+        _dump_interval = None
+        _recorders = tuple(recorder for recorder in _recorders if recorder is not _global)
+
+
+def snapshot() -> Dict[str, Any]:
+    """
+    Returns everything the global recorder collected since it was last reset.
+
+    :rtype: dict
+    """
+    return _global.snapshot()
+
+
+def reset() -> None:
+    """
+    Clear the global recorder.
+    """
+    _global.reset()
+
+
+@contextlib.contextmanager
+def measure() -> Iterator[Recorder]:
+    """
+    Record into a fresh Recorder for the duration of a with block.
+
+    Instrumentation is enabled for the block if it isn't already, and disabled again afterwards.
+    """
+    global _recorders
+    recorder = Recorder()
+    with _lock:
+        was_enabled = is_enabled()
+        if not was_enabled:
+            enable()
+        _recorders = _recorders + (recorder,)
+    try:
+        yield recorder
+    finally:
+        with _lock:
+            _recorders = tuple(other for other in _recorders if other is not recorder)
+            if not was_enabled:
+                disable()
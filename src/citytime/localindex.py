@@ -0,0 +1,141 @@
+"""
+Which zones are at a given local time.
+
+Finding every zone where it is now between 09:00 and 09:05 by converting the current instant to
+each zone costs one astimezone() per zone per query. But the answer only depends on the UTC
+offset of each zone, and those offsets change only at transitions. A LocalTimeIndex keeps the
+zones sorted by the offset in effect at the last instant it was asked about, together with the
+span of time until the next transition of any of them. As long as queries fall within that span,
+the zones whose local time is in a window are a contiguous run of the sorted offsets (or two runs
+when the window wraps around a day boundary), found with a bisect at each end. The index is only
+rebuilt when a query falls outside the span.
+
+By default the index covers every zone name CityTime accepts, links included (see registry.py).
+
+"""
+
+
+from bisect import bisect_left, bisect_right
+import datetime
+import threading
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from .registry import get_registry
+from .tables import get_table, timestamp
+
+
+SECONDS_PER_DAY = 86400
+
+_default: Optional['LocalTimeIndex'] = None
+_lock = threading.Lock()
+
+
+def _seconds_of_day(value: datetime.time) -> float:
+    if not isinstance(value, datetime.time):
+        raise TypeError('{} is not a datetime.time'.format(repr(value)))
+    return value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1000000
+
+
+class LocalTimeIndex(object):
+    """
+    Reverse index from local time of day to zones, for a fixed set of zones.
+
+    :param zones: iterable of zone names, all names CityTime accepts by default
+    :raises UnknownTimeZoneError: If a zone is not in the Olson database.
+    """
+    def __init__(self, zones: Optional[Iterable[str]]=None) -> None:
+        self.zones = get_registry().names() if zones is None else list(zones)
+        self._tables = [get_table(zone) for zone in self.zones]
+        # (valid from, valid until, sorted offsets, zone names in the same order), replaced as a
+        # whole so that concurrent queries always see a consistent index.
+        self._state: Tuple[float, float, List[int], List[str]] = (0.0, -1.0, [], [])
+        self.rebuilds = 0
+
+    def __repr__(self) -> str:
+        return 'LocalTimeIndex({} zones)'.format(len(self.zones))
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def _build(self, stamp: float) -> Tuple[float, float, List[int], List[str]]:
+        valid_from = float('-inf')
+        valid_until = float('inf')
+        entries = []
+        for zone, table in zip(self.zones, self._tables):
+            transitions = table.transitions
+            index = max(0, bisect_right(transitions, stamp) - 1)
+            if index > 0 or transitions[0] <= stamp:
+                valid_from = max(valid_from, transitions[index])
+            if index + 1 < len(transitions):
+                valid_until = min(valid_until, transitions[index + 1])
+            entries.append((table.offsets[index], zone))
+        entries.sort()
+        state = (valid_from, valid_until, [entry[0] for entry in entries], [entry[1] for entry in entries])
+        self._state = state
+        self.rebuilds += 1
+        return state
+
+    def offsets(self, instant: Any) -> Sequence[Tuple[int, str]]:
+        """
+        Returns (UTC offset in seconds, zone) pairs for every zone at the given instant, sorted
+        by offset.
+
+        :rtype: list
+        """
+        stamp = timestamp(instant)
+        state = self._state
+        if not state[0] <= stamp < state[1]:
+            state = self._build(stamp)
+        return list(zip(state[2], state[3]))
+
+    def zones_at(self, instant: Any, start: datetime.time, end: datetime.time) -> List[str]:
+        """
+        Returns the zones whose local time at the instant is between start (inclusive) and
+        end (exclusive), sorted by UTC offset. If end is before start the window wraps around
+        midnight, so 23:55 to 00:05 is a ten minute window.
+
+        The instant may be a CityTime object, a datetime.datetime object or a POSIX timestamp.
+
+        :raises TypeError: If start or end is not a datetime.time.
+        :rtype: list
+        """
+        stamp = timestamp(instant)
+        first = _seconds_of_day(start)
+        width = (_seconds_of_day(end) - first) % SECONDS_PER_DAY
+        state = self._state
+        if not state[0] <= stamp < state[1]:
+            state = self._build(stamp)
+        offsets, names = state[2], state[3]
+        if not offsets or not width:
+            return []
+        # A zone is in the window if (stamp + offset) % 86400 is in [first, first + width).
+        # That's a half-open range of offsets repeating every day; walk the repetitions that
+        # overlap the offsets in use, starting with the last one that begins below them all.
+        lowest = offsets[0]
+        low = lowest + (first - stamp - lowest) % SECONDS_PER_DAY - SECONDS_PER_DAY
+        result: List[str] = []
+        while low <= offsets[-1]:
+            result.extend(names[bisect_left(offsets, low):bisect_left(offsets, low + width)])
+            low += SECONDS_PER_DAY
+        return result
+
+
+def _default_index() -> LocalTimeIndex:
+    global _default
+    if _default is None:
+        with _lock:
+            if _default is None:
+                _default = LocalTimeIndex()
+    return _default
+
+
+def zones_at_local_time(instant: Any, start: datetime.time, end: datetime.time) -> List[str]:
+    """
+    Returns all zone names CityTime accepts whose local time at the instant is between start
+    (inclusive) and end (exclusive), e.g. every zone where a CityTime instant falls between 09:00
+    and 09:05 local time. See LocalTimeIndex.zones_at().
+
+    :raises TypeError: If start or end is not a datetime.time.
+    :rtype: list
+    """
+    return _default_index().zones_at(instant, start, end)
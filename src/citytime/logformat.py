@@ -0,0 +1,107 @@
+"""
+Log record times in several zones.
+
+logging.Formatter stamps records with time.localtime() or time.gmtime(), in one zone only. A
+ZoneFormatter renders the time of each record in one or more zones instead, with CityTime
+semantics: the local time follows the zone's DST rules, whatever the zone of the machine.
+
+Converting the time of every record to every zone would cost an astimezone() and a strftime()
+per zone per record. But records logged within the same second share everything except the
+milliseconds, so a ZoneFormatter renders each second once, for all its zones, into a %-style
+template with a hole for the milliseconds, and fills in the milliseconds per record.
+
+"""
+
+
+import logging
+import math
+import sys
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from .backends import Backend
+from .citytime import CityTime
+from .formatting import Formatter, get_formatter
+from .zones import Zone, get_zone
+
+
+class ZoneFormatter(logging.Formatter):
+    """
+    A logging.Formatter whose %(asctime)s is the time of the record in each of the given zones,
+    separated by separator. The other arguments are those of logging.Formatter.
+
+    Without datefmt each zone's time looks like '2018-06-01 12:30:00,123 EDT'. Otherwise datefmt
+    is a strftime pattern for each zone's time, compiled once to a Formatter (see
+    formatting.py). A datefmt with %f is rendered for every record rather than once a second.
+
+    :param zones: iterable of str or Zone, UTC by default
+    :param separator: str
+    :param backend: str or Backend
+    :raises UnknownTimeZoneError: If a zone is not in the Olson database.
+    """
+    default_time_format = '%Y-%m-%d %H:%M:%S'
+
+    # Seconds rendered and kept, enough for records arriving out of order from a few threads.
+    cached_seconds = 16
+
+    def __init__(
+            self,
+            fmt: Optional[str]=None,
+            datefmt: Optional[str]=None,
+            style: str='%',
+            validate: bool=True,
+            zones: Iterable[Union[str, Zone]]=('UTC',),
+            separator: str=' ',
+            backend: Optional[Union[str, Backend]]=None,
+            **kwargs: Any
+    ) -> None:
+        options: Dict[str, Any] = {'style': style}
+        if sys.version_info >= (3, 8):
+            # logging.Formatter only takes validate from Python 3.8.
+            options['validate'] = validate
+        super().__init__(fmt, datefmt, **options, **kwargs)
+        self.zones = [get_zone(zone, backend) for zone in zones]
+        self.separator = separator
+        self._formatter = Formatter(self.default_time_format if datefmt is None else datefmt)
+        self._zone_formatter = Formatter('%Z') if datefmt is None else None
+        self._per_second = datefmt is None or '%f' not in datefmt
+        # Whole POSIX second -> what _render_second() returns for it
+        self._seconds: Dict[int, Tuple[str, int]] = {}
+
+    def _render_second(self, second: int) -> Tuple[str, int]:
+        # The text of the second, or a %-style template and the number of holes in it.
+        parts = []
+        for zone in self.zones:
+            instant = CityTime.from_trusted(second * 1000000, zone)
+            text = instant.format(self._formatter)
+            if self._zone_formatter is not None:
+                abbreviation = instant.format(self._zone_formatter)
+                text = '{},%03d {}'.format(text.replace('%', '%%'), abbreviation.replace('%', '%%'))
+            parts.append(text)
+        if self._zone_formatter is None:
+            return self.separator.join(parts), 0
+        return self.separator.replace('%', '%%').join(parts), len(parts)
+
+    def _render(self, record: logging.LogRecord, formatter: Formatter) -> str:
+        micros = round(record.created * 1000000)
+        return self.separator.join(CityTime.from_trusted(micros, zone).format(formatter) for zone in self.zones)
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str]=None) -> str:
+        """
+        Returns the time of the record in each zone, as described for the class.
+
+        :rtype: str
+        """
+        if datefmt is not None and datefmt != self.datefmt:
+            return self._render(record, get_formatter(datefmt))
+        if not self._per_second:
+            return self._render(record, self._formatter)
+        second = math.floor(record.created)
+        rendered = self._seconds.get(second)
+        if rendered is None:
+            if len(self._seconds) >= self.cached_seconds:
+                self._seconds.clear()
+            rendered = self._seconds[second] = self._render_second(second)
+        text, holes = rendered
+        if not holes:
+            return text
+        return text % ((int(record.msecs),) * holes)
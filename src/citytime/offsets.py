@@ -0,0 +1,112 @@
+"""
+UTC offset transitions.
+
+Every change of a zone's UTC offset, whether for DST or a change of standard time, is an entry
+of its compiled transition table (see tables.py). The transitions of a zone within a time span
+are a contiguous run of that table, found with one bisect at each end, so listing them costs
+O(log n + k) per zone for k transitions.
+
+As in equivalence.py, table entries that only change the abbreviation or the DST flag and leave
+the total offset alone are not transitions.
+
+"""
+
+
+from bisect import bisect_left, bisect_right
+import datetime
+import time
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+from .citytime import CityTime, Range
+from .registry import get_registry
+from .tables import EPOCH, get_table, timestamp
+
+
+class Transition(NamedTuple):
+    """
+    A change of the UTC offset of a zone: the POSIX timestamp at which it happens and the total
+    UTC offsets, in seconds, before and after it.
+    """
+    zone: str
+    timestamp: int
+    before: int
+    after: int
+
+    def is_gap(self) -> bool:
+        """
+        Returns True if clocks go forward, so that local times between the old and the new
+        offset don't exist. Otherwise clocks go back and those local times occur twice.
+
+        :rtype: bool
+        """
+        return self.after > self.before
+
+    def utc(self) -> datetime.datetime:
+        """
+        Returns the instant of the transition as a naive datetime.datetime in UTC.
+
+        :rtype: datetime.datetime
+        """
+        return EPOCH + datetime.timedelta(seconds=self.timestamp)
+
+    def citytime(self) -> CityTime:
+        """
+        Returns the instant of the transition as a CityTime in the zone.
+
+        :rtype: CityTime
+        """
+        instant = CityTime(self.utc(), 'UTC')
+        instant.change_tz(self.zone)
+        return instant
+
+
+def _between(zone: str, start: float, end: float) -> List[Transition]:
+    table = get_table(zone)
+    times = table.transitions
+    offsets = table.offsets
+    result = []
+    for i in range(max(1, bisect_left(times, start)), bisect_right(times, end)):
+        if offsets[i] != offsets[i - 1]:
+            result.append(Transition(zone, times[i], offsets[i - 1], offsets[i]))
+    return result
+
+
+def transitions(zone: str, span: Range) -> List[Transition]:
+    """
+    Returns the transitions of a zone within a Range, start and end time included, in order.
+
+    :raises ValueError: If the Range is not set.
+    :raises UnknownTimeZoneError: If the zone is not in the Olson database.
+    :rtype: list
+    """
+    if not span.check_set():
+        raise ValueError('Range is not set.')
+    return _between(zone, timestamp(span.start_time()), timestamp(span.end_time()))
+
+
+def upcoming_transitions(
+        zones: Optional[Iterable[str]]=None,
+        within: datetime.timedelta=datetime.timedelta(days=7),
+        now: Optional[Any]=None,
+) -> List[Transition]:
+    """
+    Returns the transitions of the zones (all canonical zones by default) from now until within
+    from now, ordered by time and then by zone.
+
+    now may be a CityTime object, a datetime.datetime object or a POSIX timestamp, and defaults
+    to the current time.
+
+    :raises ValueError: If within is negative.
+    :raises UnknownTimeZoneError: If a zone is not in the Olson database.
+    :rtype: list
+    """
+    if within < datetime.timedelta():
+        raise ValueError("Parameter 'within' must not be negative.")
+    start = time.time() if now is None else timestamp(now)
+    end = start + within.total_seconds()
+    names = get_registry().zones() if zones is None else zones
+    result = []
+    for zone in names:
+        result.extend(_between(zone, start, end))
+    result.sort(key=lambda transition: (transition.timestamp, transition.zone))
+    return result
@@ -0,0 +1,206 @@
+"""
+Canonical zone names.
+
+The Olson database has a few hundred zones, plus links: alternative names such as US/Eastern
+for America/New_York, or zones that were merged into another one, such as Europe/Amsterdam into
+Europe/Brussels. A link has exactly the same rules as its target, but a different name, so
+caching or grouping by name treats US/Eastern and America/New_York as two zones.
+
+The registry maps every name, in any capitalisation, to its spelling in the database and to its
+canonical zone with a single dict lookup. The links are read from the tzdata.zi file shipped with
+pytz. If it is missing, every zone is its own canonical zone.
+
+"""
+
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ._lazy import LazyModule
+from .tables import get_table
+
+
+pytz: Any = LazyModule('pytz', globals())
+
+_registry: Optional['Registry'] = None
+
+
+def parse_links(lines: Iterable[str]) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Returns the zone names and a {link: target} dict from the lines of a tzdata.zi file.
+
+    :rtype: tuple
+    """
+    zones = []
+    links = {}
+    for line in lines:
+        if line.startswith('Z '):
+            zones.append(line.split(None, 2)[1])
+        elif line.startswith('L '):
+            _, target, link = line.split()
+            links[link] = target
+    return zones, links
+
+
+class Registry(object):
+    """
+    Maps zone names and links, case-insensitively, to canonical zone names.
+
+    :param zones: iterable of str, the zone names
+    :param links: dict of {link name: target name}
+    """
+    def __init__(self, zones: Iterable[str], links: Dict[str, str]) -> None:
+        self._names: Dict[str, str] = {}
+        self._canonical: Dict[str, str] = {}
+        self._aliases: Dict[str, List[str]] = {}
+        for zone in zones:
+            self._names[zone.lower()] = zone
+            self._canonical[zone] = zone
+            self._aliases.setdefault(zone, [])
+        for link in links:
+            target = links[link]
+            seen = {link}
+            # Links to links aren't used by tzdata.zi, but are valid zic input.
+            while target in links and target not in seen:
+                seen.add(target)
+                target = links[target]
+            self._names[link.lower()] = link
+            self._canonical[link] = target
+            self._aliases.setdefault(target, []).append(link)
+        for aliases in self._aliases.values():
+            aliases.sort()
+
+    def __repr__(self) -> str:
+        return 'Registry({} zones, {} links)'.format(len(self._aliases), len(self._canonical) - len(self._aliases))
+
+    def __len__(self) -> int:
+        return len(self._canonical)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self._names
+
+    def name(self, name: str) -> str:
+        """
+        Returns the name spelled as in the Olson database, e.g. 'US/Eastern' for 'us/eastern'.
+
+        :raises UnknownTimeZoneError: If the name is not in the Olson database.
+        :rtype: str
+        """
+        try:
+            return self._names[name.lower()]
+        except (KeyError, AttributeError):
+            raise pytz.exceptions.UnknownTimeZoneError(name)
+
+    def canonical(self, name: str) -> str:
+        """
+        Returns the canonical zone of a name, e.g. 'America/New_York' for 'us/eastern'.
+
+        :raises UnknownTimeZoneError: If the name is not in the Olson database.
+        :rtype: str
+        """
+        return self._canonical[self.name(name)]
+
+    def is_link(self, name: str) -> bool:
+        """
+        Returns True if the name is a link to another zone.
+
+        :raises UnknownTimeZoneError: If the name is not in the Olson database.
+        :rtype: bool
+        """
+        name = self.name(name)
+        return self._canonical[name] != name
+
+    def aliases(self, name: str) -> List[str]:
+        """
+        Returns the canonical zone of a name and all the links to it.
+
+        :raises UnknownTimeZoneError: If the name is not in the Olson database.
+        :rtype: list
+        """
+        canonical = self.canonical(name)
+        return [canonical] + self._aliases[canonical]
+
+    def zones(self) -> List[str]:
+        """
+        Returns the canonical zone names.
+
+        :rtype: list
+        """
+        return sorted(self._aliases)
+
+    def names(self) -> List[str]:
+        """
+        Returns all names: the canonical zones and the links.
+
+        :rtype: list
+        """
+        return sorted(self._canonical)
+
+    def same_rules(self, first: str, second: str) -> bool:
+        """
+        Returns True if two names have identical rules over all of time: either they resolve to
+        the same canonical zone, or their compiled transition tables are identical.
+
+        :raises UnknownTimeZoneError: If either name is not in the Olson database.
+        :rtype: bool
+        """
+        first, second = self.canonical(first), self.canonical(second)
+        if first == second:
+            return True
+        a, b = get_table(first), get_table(second)
+        return (
+            list(a.transitions) == list(b.transitions) and list(a.offsets) == list(b.offsets)
+            and list(a.dst_offsets) == list(b.dst_offsets) and list(a.abbreviations) == list(b.abbreviations)
+        )
+
+
+def load_registry() -> Registry:
+    """
+    Build a Registry from the tzdata.zi file shipped with pytz.
+
+    :rtype: Registry
+    """
+    try:
+        with pytz.open_resource('tzdata.zi') as f:
+            zones, links = parse_links(f.read().decode('utf-8').splitlines())
+    except (IOError, OSError, ValueError):
+        zones, links = list(pytz.all_timezones), {}
+    # Only names pytz can load are registered. Anything pytz knows that tzdata.zi doesn't
+    # mention is treated as a zone of its own.
+    available = pytz.all_timezones_set
+    zones = [zone for zone in zones if zone in available]
+    links = {link: target for link, target in links.items() if link in available and target in available}
+    known = set(zones) | set(links)
+    zones.extend(name for name in pytz.all_timezones if name not in known)
+    return Registry(zones, links)
+
+
+def get_registry() -> Registry:
+    """
+    Returns the process wide Registry, loading it on first use.
+
+    :rtype: Registry
+    """
+    global _registry
+    if _registry is None:
+        _registry = load_registry()
+    return _registry
+
+
+def canonical_name(name: str) -> str:
+    """
+    Returns the canonical zone of a zone name or link, in any capitalisation.
+
+    :raises UnknownTimeZoneError: If the name is not in the Olson database.
+    :rtype: str
+    """
+    return get_registry().canonical(name)
+
+
+def same_rules(first: str, second: str) -> bool:
+    """
+    Returns True if two zone names or links have identical rules.
+
+    :raises UnknownTimeZoneError: If either name is not in the Olson database.
+    :rtype: bool
+    """
+    return get_registry().same_rules(first, second)
@@ -0,0 +1,289 @@
+"""
+Callbacks at local wall clock times, on an asyncio event loop.
+
+A job that runs at 08:00 local time in hundreds of cities runs at hundreds of different UTC
+instants, and each of those moves twice a year with DST. A Scheduler keeps every trigger in one
+heap keyed by the UTC timestamp of its next fire time, and keeps a single timer on the event loop
+for the earliest one, so it costs nothing between fire times however many triggers there are.
+A recurring trigger computes its next fire time from the local wall time when it fires, with
+the transition table of its zone (see tables.py), and goes back on the heap.
+
+Local times that don't exist or occur twice because of a DST change are resolved as by
+resolve_offset() in validation.py: a daily trigger at 02:30 fires at 03:30 on the day clocks go
+from 02:00 to 03:00, and only once, at the first 01:30, on the day clocks go from 02:00 back to
+01:00.
+
+Cancelled triggers are left in the heap and skipped, like asyncio does with its own timers, and
+the heap is rebuilt when more than half of it is cancelled.
+
+A Scheduler is not thread-safe; use it from the thread running its event loop, as with
+asyncio's own call_at().
+
+asyncio is imported when a Scheduler first needs the event loop, like pytz elsewhere in the
+package (see _lazy.py), since most programs that import citytime never schedule anything.
+
+"""
+
+
+from bisect import bisect_right
+import datetime
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Collection, List, Optional, Tuple, Union
+
+from ._lazy import LazyModule
+from .citytime import CityTime
+from .tables import EPOCH, SECOND
+from .validation import resolve_offset
+from .zones import Zone, get_zone
+
+
+asyncio: Any = LazyModule('asyncio', globals())
+
+SECONDS_PER_DAY = 86400
+
+# The timer on the event loop never waits longer than this, so that a change of the system
+# clock delays triggers by at most this long.
+MAX_SLEEP = 60.0
+
+# Heaps smaller than this are not rebuilt for cancelled triggers.
+_MIN_COMPACT = 100
+
+
+class Trigger(object):
+    """
+    A callback scheduled with a Scheduler, at a single instant or daily at a local time.
+
+    when is the POSIX timestamp of the next fire time, or None once a one-off trigger has fired
+    or the trigger has been cancelled.
+    """
+    __slots__ = ('callback', 'args', 'zone', 'local_time', 'weekdays', 'when', 'cancelled', '_scheduler')
+
+    def __init__(
+            self,
+            scheduler: 'Scheduler',
+            callback: Callable[..., Any],
+            args: Tuple[Any, ...],
+            zone: Zone,
+            local_time: Optional[datetime.time]=None,
+            weekdays: Optional[Collection[int]]=None,
+    ) -> None:
+        self.callback = callback
+        self.args = args
+        self.zone = zone
+        self.local_time = local_time
+        self.weekdays = weekdays
+        self.when: Optional[float] = None
+        self.cancelled = False
+        self._scheduler = scheduler
+
+    def __repr__(self) -> str:
+        if self.local_time is None:
+            return '<Trigger {!r} at {} in {}>'.format(self.callback, self.when, self.zone.name)
+        return '<Trigger {!r} daily at {} in {}>'.format(self.callback, self.local_time, self.zone.name)
+
+    def cancel(self) -> None:
+        """
+        Cancel the trigger. Cancelling it again does nothing.
+        """
+        if not self.cancelled:
+            self.cancelled = True
+            self._scheduler._cancelled_one(self)
+
+    def next_fire_time(self) -> Optional[CityTime]:
+        """
+        Returns the next fire time as a CityTime in the trigger's zone, or None if there is none.
+
+        :rtype: CityTime or None
+        """
+        if self.when is None:
+            return None
+        return CityTime.from_trusted(round(self.when * 1000000), self.zone)
+
+    def _next_after(self, after: float) -> float:
+        # The first fire time of a daily trigger strictly after the timestamp after.
+        assert self.local_time is not None
+        table = self.zone.table
+        transitions = table.transitions
+        index = max(0, bisect_right(transitions, after) - 1)
+        day = EPOCH.date() + datetime.timedelta(days=int((after + table.offsets[index]) // SECONDS_PER_DAY))
+        # A DST change moves a fire time by at most a day, so the day before may still be ahead.
+        day -= datetime.timedelta(days=1)
+        while True:
+            if self.weekdays is None or day.weekday() in self.weekdays:
+                wall_time = datetime.datetime.combine(day, self.local_time)
+                stamp = (wall_time - EPOCH) / SECOND - resolve_offset(table, wall_time)
+                if stamp > after:
+                    return stamp
+            day += datetime.timedelta(days=1)
+
+
+class Scheduler(object):
+    """
+    Runs callbacks at UTC instants and at local wall clock times in any zone, on an asyncio
+    event loop, by default the one running when the first trigger is added. Triggers can be
+    added before the loop runs, and start() then sets the timer.
+
+    A callback that is a coroutine function is run as a task; any other callback is called with
+    loop.call_soon(), and its exceptions go to the loop's exception handler.
+
+    :param loop: asyncio.AbstractEventLoop
+    :param time_function: function returning the current POSIX time, time.time by default
+    """
+    def __init__(
+            self,
+            loop: Any=None,
+            time_function: Callable[[], float]=time.time,
+    ) -> None:
+        self._loop = loop
+        self._time = time_function
+        # (timestamp, sequence number, trigger), the sequence number keeping triggers with the same
+        # fire time in the order they were added.
+        self._heap: List[Tuple[float, int, Trigger]] = []
+        self._sequence = itertools.count()
+        self._cancelled = 0
+        self._timer: Any = None
+        self._timer_when = 0.0
+        self.fired = 0
+
+    def __repr__(self) -> str:
+        return '<Scheduler with {} triggers>'.format(len(self))
+
+    def __len__(self) -> int:
+        return len(self._heap) - self._cancelled
+
+    def call_at(self, instant: Any, callback: Callable[..., Any], *args: Any) -> Trigger:
+        """
+        Call callback(*args) once, at an instant given as a CityTime object or an aware
+        datetime.datetime. Instants in the past fire as soon as possible.
+
+        :raises TypeError: If instant is not a CityTime or aware datetime.datetime.
+        :rtype: Trigger
+        """
+        if isinstance(instant, CityTime):
+            zone = instant.zone()
+            stamp = instant.epoch_us() / 1000000
+        elif isinstance(instant, datetime.datetime) and instant.utcoffset() is not None:
+            zone = get_zone('UTC')
+            stamp = instant.timestamp()
+        else:
+            raise TypeError('{} is not a CityTime or an aware datetime.datetime'.format(repr(instant)))
+        trigger = Trigger(self, callback, args, zone)
+        self._push(stamp, trigger)
+        return trigger
+
+    def call_daily(
+            self,
+            local_time: datetime.time,
+            zone: Union[str, Zone],
+            callback: Callable[..., Any],
+            *args: Any,
+            weekdays: Optional[Collection[int]]=None
+    ) -> Trigger:
+        """
+        Call callback(*args) every day at a local wall clock time in a zone, or only on the
+        given weekdays (0 = Monday, 6 = Sunday), from now on until the trigger is cancelled.
+
+        :raises TypeError: If local_time is not a datetime.time.
+        :raises ValueError: If weekdays is empty.
+        :raises UnknownTimeZoneError: If the zone is not in the Olson database.
+        :rtype: Trigger
+        """
+        if not isinstance(local_time, datetime.time):
+            raise TypeError('{} is not a datetime.time'.format(repr(local_time)))
+        if weekdays is not None:
+            weekdays = frozenset(weekdays)
+            if not weekdays:
+                raise ValueError("Parameter 'weekdays' must not be empty.")
+        trigger = Trigger(self, callback, args, get_zone(zone), local_time.replace(tzinfo=None), weekdays)
+        self._push(trigger._next_after(self._time()), trigger)
+        return trigger
+
+    def start(self) -> None:
+        """
+        Set the timer for triggers added before the event loop was running. Call it from the
+        thread running the loop, e.g. from a coroutine.
+
+        :raises RuntimeError: If no loop was given and none is running.
+        """
+        if self._loop is None:
+            # asyncio.get_running_loop() is new in Python 3.7. Called from the thread running the
+            # loop, get_event_loop() returns the same loop.
+            self._loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)()
+        self._arm()
+
+    def close(self) -> None:
+        """
+        Cancel every trigger and the timer on the event loop.
+        """
+        for _, _, trigger in self._heap:
+            trigger.cancelled = True
+            trigger.when = None
+        self._heap = []
+        self._cancelled = 0
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _push(self, stamp: float, trigger: Trigger) -> None:
+        trigger.when = stamp
+        heapq.heappush(self._heap, (stamp, next(self._sequence), trigger))
+        if self._timer is None or stamp < self._timer_when:
+            self._arm()
+
+    def _cancelled_one(self, trigger: Trigger) -> None:
+        if trigger.when is None:
+            return
+        trigger.when = None
+        self._cancelled += 1
+        if self._cancelled > len(self._heap) // 2 and len(self._heap) > _MIN_COMPACT:
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def _arm(self) -> None:
+        # Set the timer for the earliest trigger.
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+            self._cancelled -= 1
+        if not heap:
+            return
+        if self._loop is None:
+            # Unlike get_running_loop(), _get_running_loop() returns None rather than raising when
+            # no loop is running, which is the case for every trigger added before the loop runs.
+            self._loop = asyncio._get_running_loop()
+            if self._loop is None:
+                # They wait for start().
+                return
+        self._timer_when = heap[0][0]
+        delay = min(max(0.0, self._timer_when - self._time()), MAX_SLEEP)
+        self._timer = self._loop.call_later(delay, self._run_due)
+
+    def _run_due(self) -> None:
+        self._timer = None
+        loop = self._loop
+        assert loop is not None
+        heap = self._heap
+        now = self._time()
+        while heap and heap[0][0] <= now:
+            stamp, _, trigger = heapq.heappop(heap)
+            if trigger.cancelled:
+                self._cancelled -= 1
+                continue
+            if asyncio.iscoroutinefunction(trigger.callback):
+                loop.create_task(trigger.callback(*trigger.args))
+            else:
+                loop.call_soon(trigger.callback, *trigger.args)
+            self.fired += 1
+            if trigger.local_time is None:
+                trigger.when = None
+            else:
+                # Fire times missed while the loop was busy or the machine asleep are skipped.
+                trigger.when = trigger._next_after(max(stamp, now))
+                heapq.heappush(heap, (trigger.when, next(self._sequence), trigger))
+        self._arm()
@@ -0,0 +1,488 @@
+"""
+Precompiled zone table snapshots.
+
+Compiling a ZoneTable means loading the zone from the tzdata files shipped with pytz and building
+a pytz tzinfo object first, which every new worker process repeats for every zone it touches. A
+snapshot is a single binary file holding the compiled tables of every zone, written once with
+build_snapshot() (or 'python -m citytime.snapshot') and memory mapped by each process, so that
+get_table() can hand out tables without going through pytz at all.
+
+The transition, offset and abbreviation columns of all zones are stored back to back as native
+machine integers, and a ZoneTable read from a snapshot uses memoryview slices of the mapped file
+instead of lists. Pages are only read from disk when a zone is actually used, and processes
+sharing the file share the page cache.
+
+Links are stored with the name of their canonical zone, so that get_table() can resolve any name
+spelled as in the Olson database from the snapshot alone, without loading the registry of
+canonical names (see registry.py).
+
+A snapshot is tied to the tzdata version it was compiled from. The default file name includes
+the version, and a snapshot whose version doesn't match the installed pytz is ignored, in which
+case tables are compiled from pytz as usual.
+
+The same snapshot can also be published in a multiprocessing.shared_memory block with
+publish_shared(), so that the workers of a process pool attach to the tables compiled once by
+the parent instead of each compiling and holding their own copy.
+
+"""
+
+
+import argparse
+import array
+import atexit
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from ._lazy import LazyModule
+from . import tables
+from .tables import ZoneTable, compile_table
+
+
+pytz: Any = LazyModule('pytz', globals())
+
+logger = logging.getLogger(__package__)
+
+ENVIRONMENT_VARIABLE = 'CITYTIME_SNAPSHOT'
+SHARED_ENVIRONMENT_VARIABLE = 'CITYTIME_SHARED_TABLES'
+
+MAGIC = b'CTZT'
+FORMAT_VERSION = 1
+
+# magic, format version, tzdata version, length of the JSON index
+_HEADER = struct.Struct('<4sH16sI')
+_ALIGNMENT = 8
+
+# Names of the shared memory blocks published by this process.
+_published: Set[str] = set()
+
+
+class SnapshotError(ValueError):
+    """
+    The file is not a snapshot, or not one that can be used by this process.
+    """
+
+
+def tzdata_version() -> str:
+    """
+    Returns the version of the tzdata compiled into the installed pytz, e.g. '2024a'.
+
+    :rtype: str
+    """
+    return str(pytz.OLSON_VERSION)
+
+
+def default_path() -> str:
+    """
+    Returns the snapshot file used by get_table().
+
+    This is the CITYTIME_SNAPSHOT environment variable if it is set, otherwise a file named after
+    the tzdata version in the user cache directory. An empty CITYTIME_SNAPSHOT disables snapshots.
+
+    :rtype: str
+    """
+    path = os.environ.get(ENVIRONMENT_VARIABLE)
+    if path is not None:
+        return path
+    cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache, 'citytime', 'zones-{}.bin'.format(tzdata_version()))
+
+
+def _padding(size: int) -> bytes:
+    return b'\0' * (-size % _ALIGNMENT)
+
+
+def encode_snapshot(zones: Optional[Iterable[str]]=None) -> bytes:
+    """
+    Compile the tables of the given zones (all zones known to pytz by default) into the binary
+    snapshot format. A link is stored as the name of its canonical zone, whose table is included.
+
+    :raises UnknownTimeZoneError: If one of the zones is not in the Olson database.
+    :rtype: bytes
+    """
+    from .registry import canonical_name
+    names = set()
+    links = {}
+    for name in set(pytz.all_timezones if zones is None else zones):
+        canonical = canonical_name(name)
+        if canonical != name:
+            links[name] = canonical
+        names.add(canonical)
+    transitions = array.array('q')
+    offsets = array.array('i')
+    dst_offsets = array.array('i')
+    abbreviation_ids = array.array('H')
+    abbreviations: Dict[str, int] = {}
+    index = {}
+    for name in sorted(names):
+        table = compile_table(name, pytz.timezone(name))
+        index[name] = [len(transitions), len(table)]
+        transitions.extend(table.transitions)
+        offsets.extend(table.offsets)
+        dst_offsets.extend(table.dst_offsets)
+        abbreviation_ids.extend(abbreviations.setdefault(a, len(abbreviations)) for a in table.abbreviations)
+    header = json.dumps({
+        'byteorder': sys.byteorder,
+        'count': len(transitions),
+        'abbreviations': sorted(abbreviations, key=abbreviations.__getitem__),
+        'zones': index,
+        'links': links,
+    }, separators=(',', ':')).encode('utf-8')
+    chunks = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, tzdata_version().encode('ascii'), len(header)),
+        header,
+        _padding(_HEADER.size + len(header)),
+    ]
+    for column in (transitions, offsets, dst_offsets, abbreviation_ids):
+        data = column.tobytes()
+        chunks.append(data)
+        chunks.append(_padding(len(data)))
+    return b''.join(chunks)
+
+
+def build_snapshot(path: Optional[str]=None, zones: Optional[Iterable[str]]=None) -> str:
+    """
+    Compile the tables of the given zones (all zones known to pytz by default) and write them
+    to a snapshot file. Returns the path written.
+
+    The file is written to a temporary name and moved into place, so processes opening the
+    snapshot at the same time never see a partial file.
+
+    :raises UnknownTimeZoneError: If one of the zones is not in the Olson database.
+    :rtype: str
+    """
+    path = path or default_path()
+    data = encode_snapshot(zones)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+    return path
+
+
+class Snapshot(object):
+    """
+    A memory mapped snapshot file, or a snapshot in some other buffer such as a shared memory
+    block.
+
+    :param path: str, the file to map, or a label for the buffer
+    :param buffer: optional object supporting the buffer protocol holding the snapshot
+    :raises SnapshotError: If the file is not a snapshot written on a machine of the same byte
+        order by this version of CityTime.
+    :raises OSError: If the file can't be opened.
+    """
+    def __init__(self, path: str, buffer: Any=None) -> None:
+        self.path = path
+        self._memory: Any = None
+        if buffer is None:
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._map = buffer
+        try:
+            magic, format_version, version, size = _HEADER.unpack_from(self._map)
+        except struct.error:
+            raise SnapshotError('{} is not a zone table snapshot'.format(path))
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise SnapshotError('{} is not a version {} zone table snapshot'.format(path, FORMAT_VERSION))
+        self.version = version.rstrip(b'\0').decode('ascii')
+        try:
+            index = json.loads(bytes(self._map[_HEADER.size:_HEADER.size + size]).decode('utf-8'))
+        except ValueError:
+            raise SnapshotError('{} has a corrupt index'.format(path))
+        if index['byteorder'] != sys.byteorder:
+            raise SnapshotError('{} was written on a {} endian machine'.format(path, index['byteorder']))
+        self._zones: Dict[str, List[int]] = index['zones']
+        self._links: Dict[str, str] = index.get('links', {})
+        self._abbreviations: List[str] = index['abbreviations']
+        count = index['count']
+        view = self._view = memoryview(self._map)
+        start = _HEADER.size + size
+        start += -start % _ALIGNMENT
+        columns = []
+        for code in ('q', 'i', 'i', 'H'):
+            length = count * array.array(code).itemsize
+            if start + length > len(self._map):
+                raise SnapshotError('{} is truncated'.format(path))
+            columns.append(view[start:start + length].cast(code))
+            start += length + -length % _ALIGNMENT
+        self._transitions, self._offsets, self._dst_offsets, self._abbreviation_ids = columns
+
+    def __repr__(self) -> str:
+        return 'Snapshot("{}", tzdata {}, {} zones)'.format(self.path, self.version, len(self))
+
+    def __len__(self) -> int:
+        return len(self._zones) + len(self._links)
+
+    def __contains__(self, zone: object) -> bool:
+        return zone in self._zones or zone in self._links
+
+    def zones(self) -> List[str]:
+        """
+        Returns the names of the zones in the snapshot, links included.
+
+        :rtype: list
+        """
+        return sorted(list(self._zones) + list(self._links))
+
+    def canonical_name(self, name: str) -> Optional[str]:
+        """
+        Returns the canonical zone of a zone or link in the snapshot, spelled exactly as in the
+        Olson database, or None if the snapshot doesn't have it.
+
+        :rtype: str or None
+        """
+        if name in self._zones:
+            return name
+        return self._links.get(name)
+
+    def table(self, zone: str) -> ZoneTable:
+        """
+        Returns the ZoneTable of a zone, backed by the mapped file. The table of a link is that
+        of its canonical zone.
+
+        :raises KeyError: If the zone is not in the snapshot.
+        :rtype: ZoneTable
+        """
+        zone = self._links.get(zone, zone)
+        start, length = self._zones[zone]
+        end = start + length
+        abbreviations = self._abbreviations
+        return ZoneTable(
+            zone,
+            self._transitions[start:end],
+            self._offsets[start:end],
+            self._dst_offsets[start:end],
+            [abbreviations[i] for i in self._abbreviation_ids[start:end]],
+        )
+
+    def release(self) -> None:
+        """
+        Release the snapshot's views of its buffer, after which table() can't be called any more.
+        Tables already handed out keep working, and keep the buffer mapped until they are garbage
+        collected.
+        """
+        for view in (self._transitions, self._offsets, self._dst_offsets, self._abbreviation_ids, self._view):
+            view.release()
+        if isinstance(self._map, memoryview):
+            self._map.release()
+
+
+def open_snapshot(path: Optional[str]=None) -> Optional[Snapshot]:
+    """
+    Open a snapshot if it exists and was compiled from the installed tzdata version.
+
+    Returns None, rather than raising, for a missing, unusable or stale snapshot, so that the
+    caller can fall back to compiling tables from pytz.
+
+    :rtype: Snapshot or None
+    """
+    path = default_path() if path is None else path
+    if not path:
+        return None
+    try:
+        snapshot = Snapshot(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning('Ignoring zone table snapshot %s: %s', path, e)
+        return None
+    return snapshot if _is_current(snapshot) else None
+
+
+def _is_current(snapshot: Snapshot) -> bool:
+    if snapshot.version == tzdata_version():
+        return True
+    logger.info(
+        'Ignoring zone table snapshot %s: compiled from tzdata %s, but pytz has %s',
+        snapshot.path, snapshot.version, tzdata_version(),
+    )
+    return False
+
+
+def open_default() -> Optional[Snapshot]:
+    """
+    Returns the snapshot get_table() uses when it is first called: the shared memory tables
+    named by CITYTIME_SHARED_TABLES if that is set, otherwise the default snapshot file.
+
+    :rtype: Snapshot or None
+    """
+    name = os.environ.get(SHARED_ENVIRONMENT_VARIABLE)
+    if name:
+        try:
+            return attach_shared(name, install=False).snapshot
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning('Ignoring shared zone tables %s: %s', name, e)
+    return open_snapshot()
+
+
+def use_snapshot(path: Optional[str]=None) -> Optional[Snapshot]:
+    """
+    Make get_table() read tables from the snapshot at path (the default snapshot if path is None,
+    no snapshot at all if path is empty) instead of the one it opened on first use. Returns the
+    snapshot, or None if it doesn't exist or can't be used.
+
+    Tables already handed out by get_table() are forgotten.
+
+    :rtype: Snapshot or None
+    """
+    snapshot = open_snapshot(path)
+    tables._snapshot = snapshot
+    tables.clear_tables()
+    return snapshot
+
+
+class SharedTables(object):
+    """
+    A zone table snapshot in a multiprocessing.shared_memory block.
+
+    The process that published the tables owns the block and should unlink() it once the
+    workers using it are done; using the object as a context manager does that on exit.
+
+    :param memory: multiprocessing.shared_memory.SharedMemory
+    :param owner: bool, True in the process that created the block
+    """
+    def __init__(self, memory: Any, owner: bool) -> None:
+        self.memory = memory
+        self.owner = owner
+        self.snapshot: Optional[Snapshot] = Snapshot(
+            'shared memory {}'.format(memory.name), memory.buf.toreadonly(),
+        )
+        # Tables handed out from the snapshot only reference the mapping, which mustn't be
+        # closed behind their back when the SharedTables object goes away.
+        self.snapshot._memory = memory
+        # Closed at exit, while tables from the block can still be let go of, rather than by
+        # SharedMemory.__del__ during interpreter shutdown, when they may not be.
+        atexit.register(self.close)
+
+    def __repr__(self) -> str:
+        return 'SharedTables("{}", {} bytes)'.format(self.name, self.memory.size)
+
+    def __enter__(self) -> 'SharedTables':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    @property
+    def name(self) -> str:
+        """
+        The name workers pass to attach_shared().
+
+        :rtype: str
+        """
+        return str(self.memory.name)
+
+    def close(self) -> None:
+        """
+        Stop using the tables in this process. get_table() compiles tables again afterwards.
+
+        The block stays mapped until every ZoneTable handed out from it is garbage collected.
+        """
+        atexit.unregister(self.close)
+        if self.snapshot is not None:
+            if tables._snapshot is self.snapshot:
+                tables._snapshot = tables._UNSET
+                tables.clear_tables()
+            self.snapshot.release()
+        self.snapshot = None
+        try:
+            self.memory.close()
+        except BufferError:
+            # Tables handed out from the block are still in use.
+            pass
+
+    def unlink(self) -> None:
+        """
+        Remove the shared memory block, once every process has closed it. Processes started
+        from now on no longer attach to it.
+        """
+        if os.environ.get(SHARED_ENVIRONMENT_VARIABLE) == self.name:
+            del os.environ[SHARED_ENVIRONMENT_VARIABLE]
+        self.memory.unlink()
+
+
+def publish_shared(zones: Optional[Iterable[str]]=None) -> SharedTables:
+    """
+    Compile the tables of the given zones (all zones by default) into a new shared memory block,
+    and make get_table() use it in this process.
+
+    The block name is also put in the CITYTIME_SHARED_TABLES environment variable, so that
+    worker processes started afterwards, with either the fork or the spawn start method, attach
+    to it on their first get_table() call instead of compiling their own tables. Workers that
+    don't inherit the environment can call attach_shared(name) themselves, for example as a
+    pool initializer.
+
+    :raises UnknownTimeZoneError: If one of the zones is not in the Olson database.
+    :rtype: SharedTables
+    """
+    from multiprocessing import shared_memory
+    data = encode_snapshot(zones)
+    memory: Any = shared_memory.SharedMemory(create=True, size=len(data))
+    memory.buf[:len(data)] = data
+    _published.add(memory.name)
+    shared = SharedTables(memory, owner=True)
+    tables._snapshot = shared.snapshot
+    tables.clear_tables()
+    os.environ[SHARED_ENVIRONMENT_VARIABLE] = shared.name
+    return shared
+
+
+def _attach_memory(name: str) -> Any:
+    import multiprocessing
+    from multiprocessing import resource_tracker, shared_memory
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    memory = shared_memory.SharedMemory(name=name)
+    # Before 3.13 attaching registers the block with the resource tracker, which unlinks it
+    # when the process that started the tracker exits, whoever owns the block. Processes started
+    # by multiprocessing share their parent's tracker, where the publishing process has already
+    # registered the block, and must leave that registration alone.
+    if name not in _published and multiprocessing.parent_process() is None:
+        resource_tracker.unregister(memory._name, 'shared_memory')  # type: ignore
+    return memory
+
+
+def attach_shared(name: Optional[str]=None, install: bool=True) -> SharedTables:
+    """
+    Attach read-only to zone tables published by another process, by default the ones named by
+    CITYTIME_SHARED_TABLES, and make get_table() use them unless install is False.
+
+    :raises FileNotFoundError: If there is no shared memory block of that name.
+    :raises SnapshotError: If the block doesn't hold tables of the installed tzdata version.
+    :rtype: SharedTables
+    """
+    name = name or os.environ[SHARED_ENVIRONMENT_VARIABLE]
+    shared = SharedTables(_attach_memory(name), owner=False)
+    assert shared.snapshot is not None
+    if not _is_current(shared.snapshot):
+        shared.close()
+        raise SnapshotError('{} was compiled from a different tzdata version'.format(name))
+    if install:
+        tables._snapshot = shared.snapshot
+        tables.clear_tables()
+    return shared
+
+
+def main(argv: Optional[Sequence[str]]=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m citytime.snapshot',
+        description='Build a precompiled zone table snapshot.',
+    )
+    parser.add_argument('path', nargs='?', help='where to write the snapshot (default: {})'.format(default_path()))
+    parser.add_argument('-z', '--zone', action='append', dest='zones', help='only include this zone (repeatable)')
+    args = parser.parse_args(argv)
+    path = build_snapshot(args.path, args.zones)
+    print('Wrote zone tables for tzdata {} to {}'.format(tzdata_version(), path))
+
+
+if __name__ == '__main__':
+    main()
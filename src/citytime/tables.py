@@ -0,0 +1,312 @@
+"""
+Compiled zone transition tables.
+
+pytz stores every Olson time zone as a list of UTC transition datetimes plus the
+(utcoffset, dst, tzname) that applies after each transition. Converting one instant at a
+time through datetime.astimezone is fine, but bulk work spends most of its time building
+datetime objects. A ZoneTable flattens the same pytz data into plain integers (seconds since
+the POSIX epoch), so that the offset in effect at any instant can be found with a single
+bisect, exactly the way pytz itself does it.
+
+If a precompiled snapshot of the tables exists, in a file or in shared memory (see
+citytime.snapshot), get_table() takes the tables from it instead of compiling them.
+
+Besides the Olson zones, fixed UTC offsets written as '+05:30', '+0530' or '-08' are zones of
+their own, named in the '+05:30' form (see parse_offset()).
+
+"""
+
+
+from bisect import bisect_right
+import datetime
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from ._lazy import LazyModule
+
+
+pytz: Any = LazyModule('pytz', globals())
+
+EPOCH = datetime.datetime(1970, 1, 1)
+UTC_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+SECOND = datetime.timedelta(seconds=1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Nanoseconds per unit of the epoch values accepted by convert_epochs() and epochs().
+EPOCH_UNITS = {'s': 1000000000, 'ms': 1000000, 'us': 1000, 'ns': 1}
+
+# pytz uses datetime(1, 1, 1) as the first transition of every zone.
+MIN_TIMESTAMP = (datetime.datetime.min - EPOCH) // SECOND
+
+_TABLES: Dict[str, 'ZoneTable'] = {}
+
+_OFFSET = re.compile(r'([+-])([01]\d|2[0-3])(?::?([0-5]\d))?\Z')
+
+# The snapshot get_table() reads from: None if there is none, _UNSET until it has been looked for.
+_UNSET: Any = object()
+_snapshot: Any = _UNSET
+
+
+class ZoneTable(object):
+    """
+    The transition history of one time zone, flattened into integer seconds.
+
+    transitions[i] is the UTC timestamp at which offsets[i] (total UTC offset, in seconds),
+    dst_offsets[i] (the DST portion of it) and abbreviations[i] come into effect.
+
+    :param name: str
+    :param transitions: sorted sequence of int
+    :param offsets: sequence of int
+    :param dst_offsets: sequence of int
+    :param abbreviations: sequence of str
+    """
+    __slots__ = ('name', 'transitions', 'offsets', 'dst_offsets', 'abbreviations')
+
+    def __init__(
+            self,
+            name: str,
+            transitions: Sequence[int],
+            offsets: Sequence[int],
+            dst_offsets: Sequence[int],
+            abbreviations: Sequence[str],
+    ) -> None:
+        self.name = name
+        self.transitions = transitions
+        self.offsets = offsets
+        self.dst_offsets = dst_offsets
+        self.abbreviations = abbreviations
+
+    def __repr__(self) -> str:
+        return 'ZoneTable("{}", {} transitions)'.format(self.name, len(self.transitions))
+
+    def __len__(self) -> int:
+        return len(self.transitions)
+
+    def is_fixed(self) -> bool:
+        """
+        Returns True if the zone has never changed its offset.
+
+        :rtype: bool
+        """
+        return len(self.transitions) == 1
+
+    def index(self, timestamp: float) -> int:
+        """
+        Returns the position of the transition in effect at the given UTC timestamp.
+
+        :rtype: int
+        """
+        return max(0, bisect_right(self.transitions, timestamp) - 1)
+
+    def offset(self, timestamp: float) -> int:
+        """
+        Returns the total UTC offset, in seconds, in effect at the given UTC timestamp.
+
+        :rtype: int
+        """
+        return self.offsets[max(0, bisect_right(self.transitions, timestamp) - 1)]
+
+
+def compile_table(name: str, tz: Any) -> ZoneTable:
+    """
+    Build a ZoneTable from a pytz time zone object.
+
+    :rtype: ZoneTable
+    """
+    utc_transitions = getattr(tz, '_utc_transition_times', None)
+    if utc_transitions is None:
+        # UTC, StaticTzInfo and FixedOffset zones have a single offset for all time.
+        return ZoneTable(
+            name,
+            [MIN_TIMESTAMP],
+            [tz.utcoffset(None) // SECOND],
+            [0],
+            [tz.tzname(None) or ''],
+        )
+    transitions = [(moment - EPOCH) // SECOND for moment in utc_transitions]
+    offsets = [info[0] // SECOND for info in tz._transition_info]
+    dst_offsets = [info[1] // SECOND for info in tz._transition_info]
+    abbreviations = [info[2] for info in tz._transition_info]
+    return ZoneTable(name, transitions, offsets, dst_offsets, abbreviations)
+
+
+def parse_offset(name: str) -> Optional[int]:
+    """
+    Returns the UTC offset in seconds of a fixed offset zone name such as '+05:30', '+0530' or
+    '-08', or None if the name is not a fixed offset.
+
+    :rtype: int or None
+    """
+    match = _OFFSET.match(name)
+    if match is None:
+        return None
+    sign, hours, minutes = match.groups()
+    seconds = int(hours) * 3600 + int(minutes or 0) * 60
+    return -seconds if sign == '-' else seconds
+
+
+def offset_name(seconds: int) -> str:
+    """
+    Returns the name of the fixed offset zone with the given UTC offset in seconds, e.g. '+05:30'.
+
+    :rtype: str
+    """
+    sign = '-' if seconds < 0 else '+'
+    hours, minutes = divmod(abs(seconds) // 60, 60)
+    return '{}{:02d}:{:02d}'.format(sign, hours, minutes)
+
+
+def get_table(zone: str) -> ZoneTable:
+    """
+    Returns the compiled ZoneTable for an Olson database time zone string.
+
+    Tables are read from the snapshot if there is one, or compiled from pytz on first use, and
+    cached until clear_tables() is called.
+
+    Links to a zone and other capitalisations of its name share one table, named after the
+    canonical zone (see registry.py). Fixed offset zones have a table with a single entry.
+
+    :raises UnknownTimeZoneError: If the time zone is not in the Olson database.
+    :rtype: ZoneTable
+    """
+    global _snapshot
+    table = _TABLES.get(zone)
+    if table is None:
+        seconds = parse_offset(zone)
+        if seconds is not None:
+            name = offset_name(seconds)
+            table = _TABLES.get(name)
+            if table is None:
+                table = _TABLES[name] = compile_table(name, pytz.FixedOffset(seconds // 60))
+            _TABLES[zone] = table
+            return table
+        if _snapshot is _UNSET:
+            from .snapshot import open_default
+            _snapshot = open_default()
+        if _snapshot is not None:
+            # Names the snapshot knows, links included, are found without loading the registry.
+            canonical = _snapshot.canonical_name(zone)
+            if canonical is not None:
+                table = _TABLES.get(canonical)
+                if table is None:
+                    table = _TABLES[canonical] = _snapshot.table(canonical)
+                _TABLES[zone] = table
+                return table
+        from .registry import canonical_name
+        canonical = canonical_name(zone)
+        if canonical != zone:
+            # Links and other spellings share the table of their canonical zone.
+            table = _TABLES[zone] = get_table(canonical)
+            return table
+        table = _TABLES[zone] = compile_table(zone, pytz.timezone(zone))
+    return table
+
+
+def clear_tables() -> None:
+    """
+    Forget every table handed out by get_table(), including those held by interned Zone objects
+    and by local_times() in worldclock.py, so that they are read from the current snapshot or
+    compiled again on next use.
+    """
+    _TABLES.clear()
+    from .worldclock import _ENTRIES
+    from .zones import _BY_ID
+    _ENTRIES.clear()
+    for zone in _BY_ID:
+        zone._table = None
+
+
+def timestamp(instant: Any) -> float:
+    """
+    Convert a CityTime, datetime.datetime or POSIX timestamp into a POSIX timestamp.
+
+    Naive datetime objects are taken to be UTC, the same way CityTime stores its time.
+
+    :rtype: float
+    """
+    if isinstance(instant, (int, float)):
+        return instant
+    utc = getattr(instant, 'utc', None)
+    if utc is not None:
+        instant = utc()
+    if isinstance(instant, datetime.datetime):
+        if instant.tzinfo is None:
+            return (instant - EPOCH).total_seconds()
+        return (instant - UTC_EPOCH).total_seconds()
+    raise TypeError('{} is not a CityTime, datetime.datetime or POSIX timestamp'.format(repr(instant)))
+
+
+def timestamps(instants: Iterable[Any]) -> List[float]:
+    """
+    Convert an iterable of CityTime objects, datetime.datetime objects or POSIX timestamps
+    into a list of POSIX timestamps.
+
+    If the first item is a number, every item is assumed to be a number and the values are
+    used as they are.
+
+    :rtype: list
+    """
+    values = list(instants)
+    if not values or isinstance(values[0], (int, float)):
+        return values
+    return [timestamp(instant) for instant in values]
+
+
+def _unit(unit: str) -> int:
+    try:
+        return EPOCH_UNITS[unit]
+    except (KeyError, TypeError):
+        raise ValueError("Epoch unit must be 's', 'ms', 'us' or 'ns', not {}".format(repr(unit)))
+
+
+def convert_epochs(values: Iterable[Any], unit: str='s', to: str='s') -> List[int]:
+    """
+    Convert a column of epoch values from one unit ('s', 'ms', 'us' or 'ns') to another, e.g.
+    epoch milliseconds to the POSIX timestamps taken by local_fields(), without creating any
+    datetime objects.
+
+    Integers are converted exactly, rounding down to a coarser unit. Floats are first rounded
+    to the nearest microsecond, the way datetime does. If the first value is an integer, every
+    value is assumed to be an integer.
+
+    :raises ValueError: If a unit is not 's', 'ms', 'us' or 'ns'.
+    :rtype: list
+    """
+    source, target = _unit(unit), _unit(to)
+    values = list(values)
+    if not values or isinstance(values[0], int):
+        if source == target:
+            return values
+        return [value * source // target for value in values]
+    return [round(value * source / 1000) * 1000 // target for value in values]
+
+
+def _micros(instant: Any) -> int:
+    utc = getattr(instant, 'utc', None)
+    if utc is not None:
+        instant = utc()
+    if isinstance(instant, datetime.datetime):
+        if instant.tzinfo is None:
+            return (instant - EPOCH) // MICROSECOND
+        return (instant - UTC_EPOCH) // MICROSECOND
+    raise TypeError('{} is not a CityTime, datetime.datetime or POSIX timestamp'.format(repr(instant)))
+
+
+def epochs(instants: Iterable[Any], unit: str='s') -> List[int]:
+    """
+    Convert an iterable of CityTime objects, datetime.datetime objects or POSIX timestamps into
+    a list of integer epoch values in the given unit ('s', 'ms', 'us' or 'ns'), rounded down.
+
+    Naive datetime objects are taken to be UTC. If the first item is a number, every item is
+    assumed to be a POSIX timestamp in seconds.
+
+    :raises ValueError: If the unit is not 's', 'ms', 'us' or 'ns'.
+    :rtype: list
+    """
+    target = _unit(unit)
+    values = list(instants)
+    if not values or isinstance(values[0], (int, float)):
+        return convert_epochs(values, 's', unit)
+    if target == 1000:
+        return [_micros(instant) for instant in values]
+    return [_micros(instant) * 1000 // target for instant in values]
@@ -0,0 +1,139 @@
+"""
+Checking local wall times without exceptions.
+
+CityTime.set() raises NonExistentTimeError for a local time skipped by a DST change and
+AmbiguousTimeError for one that occurs twice. That's the right thing for a single value, but a
+batch import with many such rows spends more time raising and catching exceptions than
+converting. validate_local() checks a whole column of wall times against the compiled
+transition table of the zone (see tables.py) and reports a status for each instead.
+
+A wall time is valid for every UTC offset the zone uses at the instant it denotes with that
+offset. The offsets in use around a wall time are those of the transitions less than a day away,
+so each check is one bisect and a couple of comparisons.
+
+"""
+
+
+import datetime
+from bisect import bisect_right
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .backends import Backend, get_backend
+from .tables import EPOCH, SECOND, ZoneTable, get_table
+
+
+OK = 'ok'
+AMBIGUOUS = 'ambiguous'
+NON_EXISTENT = 'non-existent'
+
+SECONDS_PER_DAY = 86400
+
+
+class LocalValidation(NamedTuple):
+    """
+    The status of a column of local wall times, OK, AMBIGUOUS or NON_EXISTENT, and the candidate
+    UTC instants of each, as aware datetime.datetime objects in UTC, earliest first.
+
+    A valid wall time has one candidate and an ambiguous one has two. A non-existent wall time
+    has the two instants it would denote with the UTC offsets before and after the gap, which
+    are the times pytz picks with is_dst=False and is_dst=True.
+    """
+    status: List[str]
+    candidates: List[Tuple[datetime.datetime, ...]]
+
+
+class SetResult(NamedTuple):
+    """
+    The result of CityTime.try_set(): the status of the wall time and its candidate UTC
+    instants, as for validate_local().
+    """
+    status: str
+    candidates: Tuple[datetime.datetime, ...]
+
+    @property
+    def ok(self) -> bool:
+        """
+        True if the wall time exists and is unambiguous, so the CityTime was set.
+
+        :rtype: bool
+        """
+        return self.status == OK
+
+
+def check_local(table: ZoneTable, wall_time: datetime.datetime) -> Tuple[str, Tuple[int, ...]]:
+    """
+    Returns the status of a naive local wall time in the zone of the table, and the UTC offsets,
+    in seconds, of its candidate instants, earliest instant first.
+
+    :rtype: tuple
+    """
+    transitions = table.transitions
+    offsets = table.offsets
+    seconds = (wall_time - EPOCH) // SECOND
+    # No zone is more than a day away from UTC, so every transition that can affect the wall
+    # time is between these two.
+    first = max(0, bisect_right(transitions, seconds - SECONDS_PER_DAY) - 1)
+    last = bisect_right(transitions, seconds + SECONDS_PER_DAY)
+    if last - first == 1:
+        return OK, (offsets[first],)
+    # The wall time is valid with offset[i] if the instant it denotes with that offset falls
+    # between transition i and the next one.
+    valid = []
+    for i in range(first, last):
+        offset = offsets[i]
+        instant = seconds - offset
+        if transitions[i] <= instant and (i + 1 == len(transitions) or instant < transitions[i + 1]):
+            if offset not in valid:
+                valid.append(offset)
+    if len(valid) == 1:
+        return OK, (valid[0],)
+    if valid:
+        # A larger offset denotes an earlier instant.
+        return AMBIGUOUS, tuple(sorted(valid, reverse=True))
+    for i in range(first + 1, last):
+        before, after = offsets[i - 1], offsets[i]
+        if transitions[i] + before <= seconds < transitions[i] + after:
+            return NON_EXISTENT, (after, before)
+    # Not reached for tables compiled from the Olson database.
+    raise ValueError('No UTC offset found for {}'.format(wall_time))
+
+
+def resolve_offset(table: ZoneTable, wall_time: datetime.datetime) -> int:
+    """
+    Returns the UTC offset, in seconds, with which to take a naive local wall time when it must
+    denote exactly one instant, as for a scheduled job: the earlier instant of an ambiguous wall
+    time, and for a non-existent one the offset before the gap, which moves it forward by the
+    length of the gap (02:30 becomes 03:30 when clocks go from 02:00 to 03:00).
+
+    :rtype: int
+    """
+    status, offsets = check_local(table, wall_time)
+    return offsets[-1] if status == NON_EXISTENT else offsets[0]
+
+
+def validate_local(
+        wall_times: Iterable[datetime.datetime],
+        zone: str,
+        backend: Optional[Union[str, Backend]]=None,
+) -> LocalValidation:
+    """
+    Check a column of local wall times in a zone without raising for the ones that are skipped
+    or repeated by a DST change. Any tzinfo of the wall times is ignored, like CityTime.set()
+    does. The candidate instants use the UTC tzinfo of the backend, so they can be passed
+    straight to CityTime.set().
+
+    :raises UnknownTimeZoneError: If the zone is not in the Olson database.
+    :rtype: LocalValidation
+    """
+    table = get_table(zone)
+    utc = get_backend(backend).utc
+    result = LocalValidation([], [])
+    status, candidates = result
+    for wall_time in wall_times:
+        naive = wall_time.replace(tzinfo=None)
+        code, offsets = check_local(table, naive)
+        status.append(code)
+        candidates.append(tuple(
+            (naive - datetime.timedelta(seconds=offset)).replace(tzinfo=utc) for offset in offsets
+        ))
+    return result
@@ -0,0 +1,133 @@
+"""
+Zone warm-up.
+
+The first conversion in a zone loads the zone from disk and interns its Zone (see zones.py), and
+the first bulk operation in a zone compiles its transition table. Servers that care about
+latency right after startup can pay those costs up front with warm_up(), or without delaying
+startup with warm_up_in_background().
+
+Interned zones keep their tzinfo object and table for the lifetime of the process, so warming a
+zone is getting its Zone and table once, the same way CityTime does.
+
+"""
+
+
+import datetime
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Union
+
+from ._lazy import LazyModule
+from .backends import Backend, get_backend
+from .zones import get_zone
+
+
+pytz: Any = LazyModule('pytz', globals())
+
+logger = logging.getLogger(__package__)
+
+
+class WarmUpReport(NamedTuple):
+    """
+    What warm_up() did: the zones loaded, the zones that don't exist, the total time taken and
+    the time taken by each zone, in seconds.
+    """
+    zones: List[str]
+    unknown: List[str]
+    seconds: float
+    per_zone: Dict[str, float]
+
+
+def warm_up(
+        zones: Optional[Iterable[str]]=None,
+        backend: Optional[Union[str, Backend]]=None,
+        tables: bool=True,
+) -> WarmUpReport:
+    """
+    Intern the given zones (pytz.common_timezones by default) in the backend, run a conversion
+    through each of them and, unless tables is False, compile or load their transition tables,
+    so that later CityTime conversions and bulk functions find everything cached.
+
+    Zones that don't exist are listed in the report instead of raising UnknownTimeZoneError.
+
+    :rtype: WarmUpReport
+    """
+    start = time.perf_counter()
+    _backend = get_backend(backend)
+    names = list(pytz.common_timezones if zones is None else zones)
+    now = datetime.datetime.now(_backend.utc)
+    warmed = []
+    unknown = []
+    per_zone = {}
+    for zone in names:
+        zone_start = time.perf_counter()
+        try:
+            interned = get_zone(zone, _backend)
+        except pytz.exceptions.UnknownTimeZoneError:
+            unknown.append(zone)
+            continue
+        _backend.to_local(now, interned.tzinfo)
+        if tables:
+            interned.table
+        per_zone[zone] = time.perf_counter() - zone_start
+        warmed.append(zone)
+    report = WarmUpReport(warmed, unknown, time.perf_counter() - start, per_zone)
+    logger.info(
+        'Warmed up %d zones in %.3f seconds with the %s backend', len(warmed), report.seconds, _backend.name,
+    )
+    if unknown:
+        logger.warning('Unknown time zones not warmed up: %s', ', '.join(unknown))
+    return report
+
+
+class WarmUpThread(threading.Thread):
+    """
+    A daemon thread running warm_up(). The report is available once the thread has finished.
+
+    :param zones: optional iterable of str
+    :param backend: optional backend name or Backend
+    :param tables: bool
+    """
+    def __init__(
+            self,
+            zones: Optional[Iterable[str]]=None,
+            backend: Optional[Union[str, Backend]]=None,
+            tables: bool=True,
+    ) -> None:
+        super(WarmUpThread, self).__init__(name='citytime-warm-up', daemon=True)
+        self.zones = None if zones is None else list(zones)
+        self.backend = backend
+        self.tables = tables
+        self.report: Optional[WarmUpReport] = None
+
+    def run(self) -> None:
+        self.report = warm_up(self.zones, self.backend, self.tables)
+
+    def wait(self, timeout: Optional[float]=None) -> Optional[WarmUpReport]:
+        """
+        Wait for the warm-up to finish and return its report, or None if the timeout expired
+        first.
+
+        :rtype: WarmUpReport or None
+        """
+        self.join(timeout)
+        return self.report
+
+
+def warm_up_in_background(
+        zones: Optional[Iterable[str]]=None,
+        backend: Optional[Union[str, Backend]]=None,
+        tables: bool=True,
+) -> WarmUpThread:
+    """
+    Start warm_up() in a daemon thread and return the thread.
+
+    Conversions made while the warm-up is running are correct, they may just pay the loading
+    cost themselves.
+
+    :rtype: WarmUpThread
+    """
+    thread = WarmUpThread(zones, backend, tables)
+    thread.start()
+    return thread
@@ -0,0 +1,117 @@
+"""
+One instant in many zones.
+
+CityTime.astimezone() looks the zone up and converts through the backend's tzinfo for every
+call. A world clock showing one instant in hundreds of zones can skip most of that: each Zone
+already carries its compiled transition table, so the offset in effect is one bisect away, and
+the local wall time only needs to be computed once per distinct offset.
+
+With the pytz backend the tzinfo attached to each local time is picked from the zone's own
+per-offset tzinfo objects, exactly as pytz's fromutc() does, so the results are identical to
+repeated astimezone() calls, tzinfo included. Other backends convert through their tzinfo.
+
+"""
+
+
+import datetime
+from bisect import bisect_right
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from ._lazy import LazyModule
+from .backends import Backend, PytzBackend, get_backend
+from .tables import EPOCH, SECOND
+from .zones import _LOOKUP, Zone, get_zone
+
+
+pytz: Any = LazyModule('pytz', globals())
+
+# Interned Zone -> what local_times() needs to know about it: its name, transition table columns
+# and the pytz tzinfo in effect after each transition. Cleared with the tables by clear_tables().
+_ENTRIES: Dict[Zone, Tuple[str, Sequence[int], Sequence[int], Sequence[str], List[Any]]] = {}
+
+
+class ZoneTimes(NamedTuple):
+    """
+    One instant in several zones: the zone names, the local times as aware datetime.datetime
+    objects, the UTC offsets in seconds and the time zone abbreviations, one entry per zone.
+    """
+    zones: List[str]
+    local: List[datetime.datetime]
+    offsets: List[int]
+    abbreviations: List[str]
+
+
+def _entry(zone: Zone) -> Tuple[str, Sequence[int], Sequence[int], Sequence[str], List[Any]]:
+    tz = zone.tzinfo
+    transition_info = getattr(tz, '_transition_info', None)
+    if transition_info is None:
+        # UTC and StaticTzInfo zones attach themselves.
+        tzinfos = [tz]
+    else:
+        tzinfos = [tz._tzinfos[info] for info in transition_info]
+    table = zone.table
+    entry = _ENTRIES[zone] = (zone.name, table.transitions, table.offsets, table.abbreviations, tzinfos)
+    return entry
+
+
+def local_times(
+        utc: datetime.datetime,
+        zones: Iterable[Union[str, Zone]],
+        backend: Optional[Union[str, Backend]]=None,
+) -> ZoneTimes:
+    """
+    Convert an aware datetime.datetime to local time in each of the zones.
+
+    :raises UnknownTimeZoneError: If a zone is not in the Olson database.
+    :rtype: ZoneTimes
+    """
+    _backend = get_backend(backend)
+    result = ZoneTimes([], [], [], [])
+    names, local, offsets, abbreviations = result
+    if not isinstance(_backend, PytzBackend):
+        for name in zones:
+            zone = get_zone(name, _backend)
+            converted = utc.astimezone(zone.tzinfo)
+            utcoffset = converted.utcoffset()
+            names.append(zone.name)
+            local.append(converted)
+            offsets.append(0 if utcoffset is None else utcoffset // SECOND)
+            abbreviations.append(converted.tzname() or '')
+        return result
+    naive = utc.replace(tzinfo=None) - (utc.utcoffset() or datetime.timedelta())
+    seconds = (naive - EPOCH) // SECOND
+    wall_times: Dict[int, datetime.datetime] = {}
+    # Zone objects are looked up too, and miss.
+    lookup: Callable[[Tuple[str, Any]], Optional[Zone]] = _LOOKUP.get
+    entry_of = _ENTRIES.get
+    backend_name = _backend.name
+    for name in zones:
+        # get_zone(), without the function call for names already looked up.
+        interned = lookup((backend_name, name))
+        if interned is None or interned.backend is not _backend:
+            interned = get_zone(name, _backend)
+        entry = entry_of(interned)
+        if entry is None:
+            entry = _entry(interned)
+        zone_name, transitions, zone_offsets, zone_abbreviations, tzinfos = entry
+        index = bisect_right(transitions, seconds) - 1
+        if index < 0:
+            index = 0
+        offset = zone_offsets[index]
+        wall_time = wall_times.get(offset)
+        if wall_time is None:
+            wall_time = wall_times[offset] = naive + datetime.timedelta(seconds=offset)
+        names.append(zone_name)
+        local.append(wall_time.replace(tzinfo=tzinfos[index]))
+        offsets.append(offset)
+        abbreviations.append(zone_abbreviations[index])
+    return result
+
+
+def common_zones() -> List[str]:
+    """
+    Returns pytz.common_timezones, the zones a world clock usually shows.
+
+    :rtype: list
+    """
+    return list(pytz.common_timezones)
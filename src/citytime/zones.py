@@ -0,0 +1,154 @@
+"""
+Interned time zone objects.
+
+A Zone bundles everything CityTime needs to know about a time zone: its name as spelled in the
+Olson database, the backend's tzinfo object and, on demand, its compiled transition table. Zones
+are interned, so there is exactly one Zone object per zone and backend no matter how the name
+was spelled, every CityTime in that zone refers to the same object, and zones can be compared
+and grouped by identity.
+
+Every Zone also has a small integer id, unique within the process, for use as a compact key.
+
+Links such as US/Eastern are zones of their own, with their own name; Zone.canonical is the
+zone they link to.
+
+Fixed UTC offsets such as '+05:30' are zones too (see tables.parse_offset()). Zones that have
+never changed their offset, fixed offsets, UTC and the Etc/GMT zones among them, carry that offset
+as Zone.fixed_offset, which lets CityTime convert to and from local time with plain datetime
+arithmetic.
+
+"""
+
+
+import datetime
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .backends import Backend, get_backend
+from .registry import canonical_name
+from .tables import ZoneTable, get_table, offset_name, parse_offset
+
+
+# (backend name, zone name as given) -> Zone
+_LOOKUP: Dict[Tuple[str, str], 'Zone'] = {}
+# (backend name, canonical zone name) -> Zone
+_ZONES: Dict[Tuple[str, str], 'Zone'] = {}
+# Zone.id -> Zone
+_BY_ID: List['Zone'] = []
+_lock = threading.Lock()
+
+
+class Zone(object):
+    """
+    An interned time zone. Use get_zone() rather than creating Zone objects directly.
+
+    :param name: str, the zone name as spelled in the Olson database
+    :param id: int
+    :param backend: Backend
+    :param tzinfo: the backend's tzinfo object for the zone
+    :param fixed_offset: datetime.timedelta, the UTC offset if the zone has never changed it
+    """
+    __slots__ = ('name', 'id', 'backend', 'tzinfo', 'fixed_offset', '_table', '_canonical')
+
+    def __init__(
+            self,
+            name: str,
+            id: int,
+            backend: Backend,
+            tzinfo: Any,
+            fixed_offset: Optional[datetime.timedelta]=None,
+    ) -> None:
+        self.name = name
+        self.id = id
+        self.backend = backend
+        self.tzinfo = tzinfo
+        self.fixed_offset = fixed_offset
+        self._table: Optional[ZoneTable] = None
+        self._canonical: Optional[Zone] = None
+
+    def __repr__(self) -> str:
+        return 'Zone("{}")'.format(self.name)
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str, str]]:
+        # Unpickled zones are interned in the receiving process too.
+        return get_zone, (self.name, self.backend.name)
+
+    @property
+    def table(self) -> ZoneTable:
+        """
+        The compiled transition table of the zone (see tables.py).
+
+        :rtype: ZoneTable
+        """
+        table = self._table
+        if table is None:
+            table = self._table = get_table(self.name)
+        return table
+
+    @property
+    def canonical(self) -> 'Zone':
+        """
+        The Zone this zone is a link to, or the zone itself if it isn't a link (see registry.py).
+        Zones with the same canonical Zone have identical rules.
+
+        :rtype: Zone
+        """
+        canonical = self._canonical
+        if canonical is None:
+            if parse_offset(self.name) is not None:
+                canonical = self._canonical = self
+            else:
+                canonical = self._canonical = get_zone(canonical_name(self.name), self.backend)
+        return canonical
+
+
+def get_zone(zone: Union[str, Zone], backend: Optional[Union[str, Backend]]=None) -> Zone:
+    """
+    Returns the interned Zone for a time zone name or fixed UTC offset such as '+05:30', in the
+    given or the default backend.
+
+    A Zone of another backend is translated to the Zone of the same name in the requested backend.
+
+    :raises UnknownTimeZoneError: If the time zone is not in the Olson database.
+    :rtype: Zone
+    """
+    _backend = get_backend(backend)
+    if isinstance(zone, Zone):
+        if zone.backend is _backend:
+            return zone
+        zone = zone.name
+    key = (_backend.name, zone)
+    interned = _LOOKUP.get(key)
+    if interned is not None and interned.backend is _backend:
+        return interned
+    seconds = parse_offset(zone) if isinstance(zone, str) else None
+    if seconds is None:
+        tz = _backend.timezone(zone)
+        name = _backend.zone_name(tz)
+    else:
+        tz = _backend.fixed_offset(seconds)
+        name = offset_name(seconds)
+    fixed_offset = _backend.static_offset(tz)
+    with _lock:
+        interned = _ZONES.get((_backend.name, name))
+        if interned is None or interned.backend is not _backend:
+            interned = Zone(name, len(_BY_ID), _backend, tz, fixed_offset)
+            _BY_ID.append(interned)
+            _ZONES[_backend.name, name] = interned
+        _LOOKUP[key] = interned
+    return interned
+
+
+def zone_by_id(id: int) -> Zone:
+    """
+    Returns the Zone with the given id.
+
+    :raises IndexError: If no zone has that id.
+    :rtype: Zone
+    """
+    if id < 0:
+        raise IndexError(id)
+    return _BY_ID[id]
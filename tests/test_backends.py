@@ -0,0 +1,149 @@
+import datetime
+
+import hypothesis.strategies as st
+import pytz
+from hypothesis import given
+from hypothesis.strategies import datetimes
+from pytz.exceptions import AmbiguousTimeError, NonExistentTimeError, UnknownTimeZoneError
+import pytest
+
+from citytime import CityTime, backends
+from citytime.backends import get_backend, set_backend
+
+try:
+    import zoneinfo
+except ImportError:
+    # Python < 3.9
+    zoneinfo = None
+
+requires_zoneinfo = pytest.mark.skipif(zoneinfo is None, reason='zoneinfo requires Python 3.9')
+
+BACKENDS = ['pytz', pytest.param('zoneinfo', marks=requires_zoneinfo)]
+
+ZONES = [
+    'America/New_York', 'America/Chicago', 'America/Los_Angeles', 'America/Sao_Paulo',
+    'Europe/London', 'Europe/Berlin', 'Australia/Sydney', 'Asia/Tokyo', 'Asia/Kolkata',
+    'Pacific/Auckland', 'UTC',
+]
+
+LOCAL_TIMES = datetimes(
+    min_value=datetime.datetime(1990, 1, 1),
+    max_value=datetime.datetime(2030, 1, 1),
+    timezones=st.none(),
+)
+
+
+@pytest.fixture
+def default_backend():
+    previous = get_backend()
+    yield
+    set_backend(previous)
+
+
+def outcome(dt, zone, backend):
+    try:
+        ct = CityTime(dt, zone, backend=backend)
+    except (NonExistentTimeError, AmbiguousTimeError) as e:
+        return type(e)
+    return ct.utc()
+
+
+@requires_zoneinfo
+@given(LOCAL_TIMES, st.sampled_from(ZONES))
+def test_backends_agree(dt, zone):
+    assert outcome(dt, zone, 'pytz') == outcome(dt, zone, 'zoneinfo')
+
+
+@requires_zoneinfo
+@given(LOCAL_TIMES, st.sampled_from(ZONES), st.sampled_from(ZONES))
+def test_backends_agree_local(dt, zone, other_zone):
+    ct = CityTime(dt, 'UTC', backend='zoneinfo')
+    ct.change_tz(zone)
+    local = ct.local()
+    assert isinstance(local.tzinfo, zoneinfo.ZoneInfo)
+    assert local == ct.local(backend='pytz')
+    assert local.utcoffset() == ct.local(backend='pytz').utcoffset()
+    assert ct.astimezone(other_zone).utcoffset() == ct.astimezone(other_zone, backend='pytz').utcoffset()
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_non_existent_time(backend):
+    with pytest.raises(NonExistentTimeError):
+        CityTime(datetime.datetime(2018, 3, 11, 2, 30), 'America/New_York', backend=backend)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_ambiguous_time(backend):
+    with pytest.raises(AmbiguousTimeError):
+        CityTime(datetime.datetime(2018, 11, 4, 1, 30), 'America/New_York', backend=backend)
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_unknown_time_zone(backend):
+    with pytest.raises(UnknownTimeZoneError):
+        CityTime(datetime.datetime(2018, 1, 1), 'Mars/Olympus_Mons', backend=backend)
+
+
+@requires_zoneinfo
+def test_zoneinfo_case_insensitive():
+    ct = CityTime(datetime.datetime(2018, 1, 1), 'america/new_york', backend='zoneinfo')
+    assert str(ct.tzinfo()) == 'America/New_York'
+    assert ct.timezone() == 'America/New_York'
+
+
+@requires_zoneinfo
+def test_zoneinfo_utc_input():
+    dt = datetime.datetime(2018, 1, 1, 12, tzinfo=pytz.utc)
+    ct = CityTime(dt, 'Asia/Tokyo', backend='zoneinfo')
+    assert ct.utc() == dt
+    assert ct.local().hour == 21
+
+
+@requires_zoneinfo
+def test_increment_across_dst():
+    for backend in ('pytz', 'zoneinfo'):
+        ct = CityTime(datetime.datetime(2018, 11, 3, 7, 0), 'America/New_York', backend=backend)
+        ct.increment(hours=24)
+        assert ct.local().hour == 6
+
+
+@requires_zoneinfo
+def test_iso_format_backend():
+    ct = CityTime('2018-06-01T12:00:00', 'Europe/Berlin', backend='zoneinfo')
+    assert ct.utc().tzinfo is get_backend('zoneinfo').utc
+    assert ct == CityTime('2018-06-01T12:00:00', 'Europe/Berlin', backend='pytz')
+
+
+@requires_zoneinfo
+def test_backend_is_kept():
+    ct = CityTime(datetime.datetime(2018, 6, 1, 12), 'Europe/Berlin', backend='zoneinfo')
+    for other in (ct.copy(), CityTime(ct), ct + datetime.timedelta(hours=1)):
+        assert isinstance(other.tzinfo(), zoneinfo.ZoneInfo)
+    ct.change_tz('Asia/Tokyo')
+    assert isinstance(ct.tzinfo(), zoneinfo.ZoneInfo)
+
+
+@requires_zoneinfo
+def test_set_backend(default_backend):
+    set_backend('zoneinfo')
+    assert isinstance(CityTime(datetime.datetime(2018, 1, 1), 'Asia/Tokyo').tzinfo(), zoneinfo.ZoneInfo)
+    set_backend('pytz')
+    assert CityTime(datetime.datetime(2018, 1, 1), 'Asia/Tokyo').tzinfo() is pytz.timezone('Asia/Tokyo')
+
+
+@requires_zoneinfo
+def test_environment_variable(default_backend, monkeypatch):
+    monkeypatch.setenv(backends.ENVIRONMENT_VARIABLE, 'zoneinfo')
+    monkeypatch.setattr(backends, '_default', None)
+    assert get_backend().name == 'zoneinfo'
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend('dateutil')
+
+
+@pytest.mark.skipif(zoneinfo is not None, reason='zoneinfo is available')
+def test_zoneinfo_unavailable():
+    with pytest.raises(ValueError):
+        get_backend('zoneinfo')
@@ -0,0 +1,83 @@
+import random
+
+from benchmarks import harness
+from benchmarks import importtime
+from benchmarks import micro
+from benchmarks import scenarios
+
+
+def report(**ns_per_op):
+    return {'results': {name: {'ns_per_op': ns} for name, ns in ns_per_op.items()}}
+
+
+def test_compare_within_threshold():
+    current = report(a=120.0)['results']
+    assert harness.compare(current, report(a=100.0), threshold=0.25) == []
+
+
+def test_compare_regression():
+    current = report(a=130.0)['results']
+    regressions = harness.compare(current, report(a=100.0), threshold=0.25)
+    assert [r.name for r in regressions] == ['a']
+    assert regressions[0].ratio == 1.3
+
+
+def test_compare_threshold_override():
+    current = report(a=130.0)['results']
+    baseline = report(a=100.0)
+    baseline['thresholds'] = {'a': 0.5}
+    assert harness.compare(current, baseline, threshold=0.25) == []
+
+
+def test_compare_ignores_new_benchmarks():
+    current = report(a=100.0, b=1000.0)['results']
+    assert harness.compare(current, report(a=100.0)) == []
+
+
+def test_micro_benchmarks_run():
+    benchmarks = harness.registered(micro.SUITE)
+    assert 'range_intersection' in benchmarks
+    for factory in benchmarks.values():
+        with harness.prepared(factory) as operation:
+            operation()
+
+
+def test_prepared_cleans_up():
+    events = []
+
+    def factory():
+        events.append('setup')
+        yield lambda: events.append('run')
+        events.append('cleanup')
+
+    with harness.prepared(factory) as operation:
+        operation()
+        assert events == ['setup', 'run']
+    assert events == ['setup', 'run', 'cleanup']
+    with harness.prepared(lambda: len) as operation:
+        assert operation is len
+
+
+def test_scenarios_run():
+    results = scenarios.run_suite(steps=2, scale=0.01)
+    assert set(results) == set(scenarios.SCENARIOS)
+    for result in results.values():
+        assert [run['size'] * 2 for run in result['runs'][:-1]] == [run['size'] for run in result['runs'][1:]]
+        assert len(result['scaling']) == 1
+        assert all(run['peak_bytes'] > 0 for run in result['runs'])
+
+
+def test_scenario_generators_are_seeded():
+    for name, workload in scenarios.SCENARIOS.items():
+        first = workload.generate(10, random.Random(1))
+        second = workload.generate(10, random.Random(1))
+        assert repr(first) == repr(second), name
+
+
+def test_parse_importtime():
+    output = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       329 |        329 |     pytz.exceptions',
+        'import time:      2202 |      45275 | citytime',
+    ])
+    assert importtime.parse_importtime(output) == {'pytz.exceptions': 329, 'citytime': 45275}
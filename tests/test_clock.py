@@ -0,0 +1,77 @@
+import datetime
+
+import pytz
+import pytest
+
+import citytime
+from citytime import CityTime, Clock, get_clock, set_backend
+from citytime.backends import get_backend
+
+
+class FakeTime(object):
+    def __init__(self, value):
+        self.ns = int(value.timestamp()) * 10 ** 9
+
+    def __call__(self):
+        return self.ns
+
+
+@pytest.mark.parametrize('backend', ['pytz', 'zoneinfo'])
+@pytest.mark.parametrize('zone', ['America/New_York', 'Australia/Lord_Howe', 'Europe/London', 'UTC', '+05:30'])
+def test_across_transitions(backend, zone):
+    # Every 10 minutes through the autumn and spring transitions of both hemispheres.
+    for start in (datetime.datetime(2018, 11, 3, 12, tzinfo=pytz.utc), datetime.datetime(2018, 3, 24, 12, tzinfo=pytz.utc),
+                  datetime.datetime(2018, 3, 31, 0, tzinfo=pytz.utc), datetime.datetime(2018, 10, 6, 0, tzinfo=pytz.utc)):
+        fake = FakeTime(start)
+        clock = Clock(backend=backend, time_ns=fake)
+        for _ in range(6 * 48):
+            now = clock.now(zone)
+            expected = CityTime.from_utc(clock.utc(), citytime.get_zone(zone, backend))
+            assert now == expected
+            local = clock.local(zone)
+            assert local == expected.local()
+            assert (local.utcoffset(), local.tzname(), local.fold) == (
+                expected.local().utcoffset(), expected.local().tzname(), expected.local().fold)
+            assert now.format('%Y-%m-%d %H:%M %Z%z') == expected.local_strftime('%Y-%m-%d %H:%M %Z%z')
+            fake.ns += 600 * 10 ** 9
+
+
+def test_resolution():
+    fake = FakeTime(datetime.datetime(2018, 6, 1, 12, tzinfo=pytz.utc))
+    clock = Clock(datetime.timedelta(milliseconds=10), time_ns=fake)
+    first = clock.now('Europe/Paris')
+    fake.ns += 9 * 10 ** 6
+    second = clock.now('Europe/Paris')
+    assert first == second and first is not second
+    assert first.utc() is second.utc()
+    assert clock.local('Europe/Paris') is second.local()
+    fake.ns += 10 ** 6
+    assert clock.now('Europe/Paris').utc() - first.utc() == datetime.timedelta(milliseconds=10)
+    assert clock.timestamp() == datetime.datetime(2018, 6, 1, 12, 0, 0, 10000, tzinfo=pytz.utc).timestamp()
+    assert clock.today('Pacific/Kiritimati') == datetime.date(2018, 6, 2)
+    with pytest.raises(ValueError):
+        Clock(datetime.timedelta())
+
+
+def test_real_time():
+    clock = Clock()
+    assert abs(clock.now('Asia/Tokyo').utc() - datetime.datetime.now(pytz.utc)) < datetime.timedelta(seconds=60)
+    assert abs(clock.timestamp() - datetime.datetime.now().timestamp()) < 60
+
+
+def test_get_clock():
+    assert get_clock() is get_clock()
+    assert citytime.Clock is Clock and citytime.get_clock is get_clock
+    default = get_backend()
+    try:
+        set_backend('zoneinfo')
+        assert get_clock().backend is get_backend('zoneinfo')
+        assert get_clock().now('Europe/Paris').zone().backend is get_backend('zoneinfo')
+    finally:
+        set_backend(default)
+    assert get_clock().backend is default
+
+
+def test_unknown_zone():
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        Clock().now('Mars/Olympus_Mons')
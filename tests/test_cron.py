@@ -0,0 +1,138 @@
+import datetime
+
+import pytz
+import pytest
+
+import citytime
+from citytime import CityTime, CronSchedule, next_fire_times, previous_fire_times
+from citytime.cron import get_schedule
+
+
+def utc(year, month, day, hour=0, minute=0):
+    return datetime.datetime(year, month, day, hour, minute, tzinfo=pytz.utc)
+
+
+def local_times(schedule, after, count):
+    result = []
+    for _ in range(count):
+        after = schedule.next(after)
+        result.append(after.local().strftime('%Y-%m-%d %H:%M %Z'))
+    return result
+
+
+def brute_force(expression, zone, after, forward):
+    # The next or previous match, a minute at a time, as an instant.
+    minutes, hours, days, months, weekdays = expression.split()
+    tz = pytz.timezone(zone)
+    step = datetime.timedelta(minutes=1 if forward else -1)
+    current = after.replace(second=0, microsecond=0)
+    if not forward and current < after:
+        current += datetime.timedelta(minutes=1)
+    while True:
+        current += step
+        local = current.astimezone(tz)
+        if (local.minute == int(minutes) and local.hour == int(hours)
+                and (weekdays == '*' or local.isoweekday() % 7 in {int(day) for day in weekdays.split(',')})):
+            return current
+
+
+@pytest.mark.parametrize('zone', ['America/New_York', 'Australia/Lord_Howe', 'Asia/Kolkata', 'Europe/London', 'UTC'])
+@pytest.mark.parametrize('expression', ['0 9 * * *', '45 4 * * 1,3', '10 12 * * 0'])
+def test_matches_brute_force(zone, expression):
+    # Every 11 hours through the transitions of both hemispheres, with times that never fall
+    # into a transition, where the brute force result differs.
+    for start in (utc(2018, 3, 9), utc(2018, 10, 5), utc(2018, 3, 30), utc(2018, 10, 27)):
+        for hours in range(0, 24 * 5, 11):
+            after = start + datetime.timedelta(hours=hours, seconds=17)
+            schedule = CronSchedule(expression, zone)
+            assert schedule.next(after).utc() == brute_force(expression, zone, after, True)
+            assert schedule.previous(after).utc() == brute_force(expression, zone, after, False)
+
+
+def test_skipped_and_repeated_hours():
+    # 2018-03-11: New York clocks go from 02:00 to 03:00. 2018-11-04: from 02:00 back to 01:00.
+    assert local_times(CronSchedule('30 2 * * *', 'America/New_York'), utc(2018, 3, 10, 12), 3) == [
+        '2018-03-11 03:30 EDT', '2018-03-12 02:30 EDT', '2018-03-13 02:30 EDT']
+    assert local_times(CronSchedule('30 1 * * *', 'America/New_York'), utc(2018, 11, 3, 12), 2) == [
+        '2018-11-04 01:30 EDT', '2018-11-05 01:30 EST']
+    assert local_times(CronSchedule('*/30 * * * *', 'America/New_York'), utc(2018, 11, 4, 4, 50), 6) == [
+        '2018-11-04 01:00 EDT', '2018-11-04 01:30 EDT', '2018-11-04 01:00 EST', '2018-11-04 01:30 EST',
+        '2018-11-04 02:00 EST', '2018-11-04 02:30 EST']
+    # The skipped 02:00 to 02:45 run at 03:00 to 03:45, once each.
+    assert local_times(CronSchedule('*/15 2-3 * * *', 'America/New_York'), utc(2018, 3, 11, 6, 50), 5) == [
+        '2018-03-11 03:00 EDT', '2018-03-11 03:15 EDT', '2018-03-11 03:30 EDT', '2018-03-11 03:45 EDT',
+        '2018-03-12 02:00 EDT']
+    schedule = CronSchedule('30 2 * * *', 'America/New_York')
+    assert schedule.previous(utc(2018, 3, 12)).local().strftime('%Y-%m-%d %H:%M %Z') == '2018-03-11 03:30 EDT'
+    # Lord Howe moves by half an hour.
+    assert local_times(CronSchedule('15 2 * * *', 'Australia/Lord_Howe'), utc(2018, 10, 6), 2) == [
+        '2018-10-07 02:45 +11', '2018-10-08 02:15 +11']
+
+
+def test_fields():
+    # 2018-06-01 was a Friday.
+    after = utc(2018, 6, 1)
+    assert local_times(CronSchedule('0 9 * * mon-wed', 'Asia/Tokyo'), after, 4) == [
+        '2018-06-04 09:00 JST', '2018-06-05 09:00 JST', '2018-06-06 09:00 JST', '2018-06-11 09:00 JST']
+    # Day of month or day of week, as in Vixie cron; 7 is Sunday too.
+    assert local_times(CronSchedule('0 0 13 * 7', 'UTC'), after, 3) == [
+        '2018-06-03 00:00 UTC', '2018-06-10 00:00 UTC', '2018-06-13 00:00 UTC']
+    assert local_times(CronSchedule('0 0 */10 feb,JUN *', 'UTC'), after, 4) == [
+        '2018-06-11 00:00 UTC', '2018-06-21 00:00 UTC', '2019-02-01 00:00 UTC', '2019-02-11 00:00 UTC']
+    assert local_times(CronSchedule('0 0 29 2 *', 'UTC'), after, 2) == ['2020-02-29 00:00 UTC', '2024-02-29 00:00 UTC']
+    assert local_times(CronSchedule('@monthly', 'Europe/Paris'), after, 1) == ['2018-07-01 00:00 CEST']
+    assert CronSchedule('@hourly', '+05:30').next(after).local().strftime('%H:%M%z') == '06:00+0530'
+    assert CronSchedule('5-10/5,58 * * * *').times[:4] == [5, 10, 58, 65]
+    # Strictly after and before.
+    schedule = CronSchedule('0 9 * * *', 'UTC')
+    assert schedule.next(utc(2018, 6, 1, 9)) == CityTime(datetime.datetime(2018, 6, 2, 9), 'UTC')
+    assert schedule.previous(utc(2018, 6, 1, 9)) == CityTime(datetime.datetime(2018, 5, 31, 9), 'UTC')
+    assert schedule.next(CityTime(datetime.datetime(2018, 6, 1, 8, 59), 'UTC')).utc() == utc(2018, 6, 1, 9)
+    assert schedule.next(utc(2018, 6, 1).timestamp()).utc() == utc(2018, 6, 1, 9)
+    assert schedule.next().utc() > datetime.datetime.now(pytz.utc)
+    assert schedule.previous().utc() < datetime.datetime.now(pytz.utc)
+    assert schedule.next(after).timezone() == 'UTC'
+
+
+@pytest.mark.parametrize('expression', [
+    '', '* * * *', '* * * * * *', '60 * * * *', '* 24 * * *', '* * 0 * *', '* * * 13 *', '* * * * 8',
+    '5-1 * * * *', '*/0 * * * *', 'x * * * *', '* * * foo *', '@reboot',
+])
+def test_invalid(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_never_matches():
+    with pytest.raises(ValueError):
+        CronSchedule('0 0 30 2 *').next(utc(2018, 1, 1))
+    with pytest.raises(ValueError):
+        CronSchedule('0 0 31 4,6 *').previous(utc(2018, 1, 1))
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        CronSchedule('* * * * *', 'Mars/Olympus_Mons')
+
+
+def test_fire_times():
+    schedule = CronSchedule('0 9 * * *', 'Asia/Tokyo')
+    schedules = [schedule, ('0 9 * * *', 'Europe/London'), ('0 9 * * *', 'Europe/London'), schedule]
+    after = utc(2018, 6, 1, 12)
+    assert next_fire_times(schedules, after) == [
+        CityTime(datetime.datetime(2018, 6, 2, 9), 'Asia/Tokyo'),
+        CityTime(datetime.datetime(2018, 6, 2, 9), 'Europe/London'),
+        CityTime(datetime.datetime(2018, 6, 2, 9), 'Europe/London'),
+        CityTime(datetime.datetime(2018, 6, 2, 9), 'Asia/Tokyo'),
+    ]
+    assert previous_fire_times(schedules, after) == [
+        CityTime(datetime.datetime(2018, 6, 1, 9), 'Asia/Tokyo'),
+        CityTime(datetime.datetime(2018, 6, 1, 9), 'Europe/London'),
+        CityTime(datetime.datetime(2018, 6, 1, 9), 'Europe/London'),
+        CityTime(datetime.datetime(2018, 6, 1, 9), 'Asia/Tokyo'),
+    ]
+    assert get_schedule('0 9 * * *', 'Europe/London') is get_schedule('0 9 * * *', 'Europe/London')
+    assert next_fire_times([]) == []
+
+
+def test_exports():
+    assert citytime.CronSchedule is CronSchedule
+    assert citytime.next_fire_times is next_fire_times and citytime.previous_fire_times is previous_fire_times
+    assert repr(CronSchedule('@daily', 'Europe/Paris')) == "CronSchedule('@daily', 'Europe/Paris')"
@@ -0,0 +1,90 @@
+import datetime
+
+import hypothesis.strategies as st
+from hypothesis import given
+import pytz
+import pytest
+
+from citytime import CityTime
+from citytime.tables import convert_epochs, epochs
+
+LOCAL_TIME = datetime.datetime(2018, 6, 1, 12, 30, 15, 250)
+MICROS = 1527870615000250
+
+MICRO_VALUES = st.integers(min_value=-2 * 10 ** 15, max_value=4 * 10 ** 15)
+
+
+def test_epoch_units():
+    ct = CityTime(LOCAL_TIME, 'America/New_York')
+    assert ct.epoch() == 1527870615
+    assert ct.epoch_ms() == 1527870615000
+    assert ct.epoch_us() == MICROS
+    before = CityTime(datetime.datetime(1969, 12, 31, 23, 59, 59, 500000), 'UTC')
+    assert before.epoch() == 0
+    assert before.epoch_ms() == -500
+    assert before.epoch_us() == -500000
+    for method in (CityTime().epoch_ms, CityTime().epoch_us):
+        with pytest.raises(ValueError):
+            method()
+
+
+def test_from_epoch():
+    expected = CityTime(LOCAL_TIME, 'America/New_York')
+    assert CityTime.from_epoch(MICROS, 'America/New_York', unit='us') == expected
+    assert CityTime.from_epoch(MICROS * 1000 + 999, 'America/New_York', unit='ns') == expected
+    assert CityTime.from_epoch(MICROS / 1000, 'America/New_York', unit='ms') == expected
+    assert CityTime.from_epoch(MICROS / 10 ** 6, 'America/New_York') == expected
+    ms = CityTime.from_epoch(1527870615000, 'America/New_York', unit='ms')
+    assert ms.local().replace(tzinfo=None) == LOCAL_TIME.replace(microsecond=0)
+    assert ms.timezone() == 'America/New_York'
+    assert ms.utc().tzinfo is pytz.utc
+    zoneinfo = CityTime.from_epoch(1527870615, 'America/New_York', backend='zoneinfo')
+    assert zoneinfo.local().replace(tzinfo=None) == LOCAL_TIME.replace(microsecond=0)
+
+
+def test_from_epoch_errors():
+    with pytest.raises(ValueError):
+        CityTime.from_epoch(0, 'UTC', unit='days')
+    with pytest.raises(TypeError):
+        CityTime.from_epoch('0', 'UTC')
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        CityTime.from_epoch(0, 'Mars/Olympus_Mons')
+
+
+@given(MICRO_VALUES)
+def test_round_trip(micros):
+    ct = CityTime.from_epoch(micros, 'Europe/London', unit='us')
+    assert ct.epoch_us() == micros
+    assert ct.epoch_ms() == micros // 1000
+    assert CityTime.from_epoch(ct.epoch_ms(), 'Europe/London', unit='ms').epoch_us() == micros // 1000 * 1000
+    assert ct.epoch() == int((ct.utc() - datetime.datetime(1970, 1, 1, tzinfo=pytz.utc)).total_seconds())
+
+
+def test_from_epoch_many():
+    values = [1527870615000 + i * 60000 for i in range(10)]
+    result = CityTime.from_epoch_many(values, 'Asia/Tokyo', unit='ms')
+    assert result == [CityTime.from_epoch(value, 'Asia/Tokyo', unit='ms') for value in values]
+    assert all(ct.timezone() == 'Asia/Tokyo' for ct in result)
+    assert epochs(result, unit='ms') == values
+    assert CityTime.from_epoch_many([], 'UTC') == []
+
+
+def test_convert_epochs():
+    assert convert_epochs([1527870615250, -1], 'ms') == [1527870615, -1]
+    assert convert_epochs([1527870615250, -1], 'ms', 'ns') == [1527870615250000000, -1000000]
+    assert convert_epochs([1.5, -0.25], 's', 'ms') == [1500, -250]
+    assert convert_epochs([1.001], 's', 'ms') == [1001]
+    assert convert_epochs([], 'ms') == []
+    with pytest.raises(ValueError):
+        convert_epochs([1], 'ms', 'minutes')
+
+
+def test_epochs():
+    aware = datetime.datetime(2018, 6, 1, 16, 30, 15, 250, tzinfo=pytz.utc)
+    instants = [CityTime(LOCAL_TIME, 'America/New_York'), aware, aware.replace(tzinfo=None)]
+    assert epochs(instants) == [1527870615] * 3
+    assert epochs(instants, 'us') == [MICROS] * 3
+    assert epochs(instants, 'ns') == [MICROS * 1000] * 3
+    assert epochs([1527870615.5], 'ms') == [1527870615500]
+    with pytest.raises(TypeError):
+        epochs([aware, 'now'])
@@ -0,0 +1,106 @@
+import datetime
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+import pytz
+import pytest
+
+import citytime
+from citytime.equivalence import equivalence_classes, group_zones, window_signature
+from citytime.fields import histogram, histogram_by_zone, local_fields, local_fields_by_zone
+from citytime.registry import get_registry
+
+ZONES = [
+    'Africa/Lagos', 'Africa/Kinshasa', 'Africa/Algiers', 'Europe/Berlin', 'Europe/Paris', 'Europe/Rome',
+    'America/New_York', 'America/Toronto', 'America/Detroit', 'America/Chicago', 'Asia/Kolkata',
+    'Asia/Colombo', 'UTC', 'Etc/GMT', 'Africa/Abidjan', 'US/Eastern',
+]
+
+INSTANTS = st.lists(
+    st.floats(min_value=1.5e9, max_value=1.6e9, allow_nan=False, allow_infinity=False),
+    min_size=1, max_size=50,
+)
+
+START = datetime.datetime(2018, 1, 1)
+END = datetime.datetime(2019, 1, 1)
+
+
+def test_equivalence_classes():
+    classes = equivalence_classes(START, END, ZONES)
+    assert sorted(zone for group in classes for zone in group) == sorted(ZONES)
+    assert ['Africa/Lagos', 'Africa/Kinshasa', 'Africa/Algiers'] in classes
+    assert ['Europe/Berlin', 'Europe/Paris', 'Europe/Rome'] in classes
+    assert ['America/New_York', 'America/Toronto', 'America/Detroit', 'US/Eastern'] in classes
+    assert ['UTC', 'Etc/GMT', 'Africa/Abidjan'] in classes
+    assert ['America/Chicago'] in classes
+    assert citytime.equivalence_classes is equivalence_classes
+
+
+def test_classes_depend_on_window():
+    # Colombo was half an hour ahead of Kolkata until 2006.
+    assert ['Asia/Kolkata', 'Asia/Colombo'] in equivalence_classes(START, END, ZONES)
+    assert ['Asia/Kolkata'] in equivalence_classes(datetime.datetime(2000, 1, 1), END, ZONES)
+    # Algiers hasn't had DST since 1981, Paris has.
+    assert ['Africa/Algiers'] not in equivalence_classes(START, END, ZONES)
+    winter = equivalence_classes(datetime.datetime(2018, 12, 1), datetime.datetime(2018, 12, 31), ZONES)
+    assert ['Africa/Lagos', 'Africa/Kinshasa', 'Africa/Algiers', 'Europe/Berlin', 'Europe/Paris',
+            'Europe/Rome'] in winter
+
+
+def test_window_signature():
+    start = datetime.datetime(2018, 1, 1, tzinfo=pytz.utc)
+    end = datetime.datetime(2018, 12, 31, tzinfo=pytz.utc)
+    march = datetime.datetime(2018, 3, 11, 7, tzinfo=pytz.utc).timestamp()
+    november = datetime.datetime(2018, 11, 4, 6, tzinfo=pytz.utc).timestamp()
+    assert window_signature('America/New_York', start, end) == (-18000, march, -14400, november, -18000)
+    assert window_signature('Asia/Tokyo', start, end) == (32400,)
+    assert window_signature('Asia/Tokyo', 0, 0) == (32400,)
+
+
+def test_default_zones():
+    groups = group_zones(START, END)
+    assert sum(len(members) for members in groups.values()) == len(get_registry().zones())
+    assert len(groups) < len(get_registry().zones()) / 2
+
+
+def test_bad_window():
+    with pytest.raises(ValueError):
+        equivalence_classes(END, START, ZONES)
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        equivalence_classes(START, END, ['Mars/Olympus_Mons'])
+
+
+@settings(max_examples=50)
+@given(INSTANTS)
+def test_local_fields_by_zone(stamps):
+    results = local_fields_by_zone(stamps, ZONES)
+    assert set(results) == set(ZONES)
+    for zone in ZONES:
+        assert results[zone] == local_fields(stamps, zone)
+
+
+@settings(max_examples=50)
+@given(INSTANTS, st.sampled_from(['hour', 'weekday', 'minute_of_day']))
+def test_histogram_by_zone(stamps, by):
+    results = histogram_by_zone(stamps, ZONES, by)
+    for zone in ZONES:
+        assert results[zone] == histogram(stamps, zone, by)
+
+
+def test_by_zone_shares_results():
+    instants = [datetime.datetime(2018, 6, 1, tzinfo=pytz.utc) + datetime.timedelta(hours=i) for i in range(100)]
+    results = local_fields_by_zone(instants, ZONES)
+    assert results['Europe/Berlin'] is results['Europe/Paris']
+    assert results['Europe/Berlin'] is not results['America/Chicago']
+
+
+def test_by_zone_empty():
+    assert local_fields_by_zone([], ['UTC', 'Asia/Tokyo']) == {
+        'UTC': local_fields([], 'UTC'), 'Asia/Tokyo': local_fields([], 'Asia/Tokyo'),
+    }
+    assert histogram_by_zone([], ['UTC'], 'weekday') == {'UTC': [0] * 7}
+
+
+def test_histogram_by_zone_bad_bucket():
+    with pytest.raises(ValueError):
+        histogram_by_zone([0], ['UTC'], by='second')
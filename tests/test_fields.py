@@ -0,0 +1,112 @@
+import datetime
+
+import hypothesis.strategies as st
+import pytz
+from hypothesis import given
+from hypothesis.strategies import datetimes
+from pytest import raises
+
+from citytime import CityTime, histogram, local_fields
+from citytime.fields import local_seconds
+from citytime.tables import get_table
+
+TIMEZONES = pytz.common_timezones
+
+UTC_TIMES = datetimes(
+    min_value=datetime.datetime(1900, 1, 1),
+    max_value=datetime.datetime(2100, 1, 1),
+    timezones=st.none(),
+)
+
+
+def city_time(dt, zone):
+    ct = CityTime(dt, 'UTC')
+    ct.change_tz(zone)
+    return ct
+
+
+@given(st.lists(UTC_TIMES, min_size=1, max_size=20), st.sampled_from(TIMEZONES))
+def test_local_fields(dts, zone):
+    cts = [city_time(dt, zone) for dt in dts]
+    fields = local_fields(cts, zone)
+    for i, ct in enumerate(cts):
+        local = ct.local()
+        assert fields.year[i] == local.year
+        assert fields.month[i] == local.month
+        assert fields.day[i] == local.day
+        assert fields.hour[i] == local.hour
+        assert fields.minute[i] == local.minute
+        assert fields.weekday[i] == ct.weekday()
+        assert fields.iso_week[i] == local.isocalendar()[1]
+
+
+@given(st.lists(UTC_TIMES, min_size=1, max_size=20), st.sampled_from(TIMEZONES))
+def test_local_fields_timestamps(dts, zone):
+    cts = [city_time(dt, zone) for dt in dts]
+    stamps = [ct.utc().timestamp() for ct in cts]
+    assert local_fields(stamps, zone) == local_fields(cts, zone)
+
+
+@given(st.lists(UTC_TIMES, max_size=50), st.sampled_from(TIMEZONES))
+def test_histogram_hour(dts, zone):
+    cts = [city_time(dt, zone) for dt in dts]
+    expected = [0] * 24
+    for ct in cts:
+        expected[ct.local().hour] += 1
+    assert histogram(cts, zone, by='hour') == expected
+
+
+@given(st.lists(UTC_TIMES, max_size=50), st.sampled_from(TIMEZONES))
+def test_histogram_weekday(dts, zone):
+    cts = [city_time(dt, zone) for dt in dts]
+    expected = [0] * 7
+    for ct in cts:
+        expected[ct.weekday()] += 1
+    assert histogram(cts, zone, by='weekday') == expected
+
+
+@given(st.lists(UTC_TIMES, max_size=50), st.sampled_from(TIMEZONES))
+def test_histogram_minute_of_day(dts, zone):
+    cts = [city_time(dt, zone) for dt in dts]
+    expected = [0] * 1440
+    for ct in cts:
+        expected[ct.local_minute()] += 1
+    assert histogram(cts, zone, by='minute_of_day') == expected
+
+
+def test_local_seconds_fixed_zone():
+    assert local_seconds([0, 3600], 'Etc/GMT-3') == [10800, 14400]
+
+
+def test_local_seconds_dst():
+    # 2018-03-11 06:59:59 UTC is the last second of EST, 07:00:00 UTC the first of EDT.
+    before = datetime.datetime(2018, 3, 11, 6, 59, 59, tzinfo=pytz.utc)
+    after = datetime.datetime(2018, 3, 11, 7, 0, 0, tzinfo=pytz.utc)
+    assert local_seconds([before, after], 'America/New_York') == [
+        before.timestamp() - 5 * 3600,
+        after.timestamp() - 4 * 3600,
+    ]
+
+
+def test_get_table_cached():
+    assert get_table('Asia/Kolkata') is get_table('Asia/Kolkata')
+    assert get_table('UTC').is_fixed()
+
+
+def test_histogram_empty():
+    assert histogram([], 'UTC') == [0] * 24
+
+
+def test_histogram_bad_bucket():
+    with raises(ValueError):
+        histogram([0], 'UTC', by='month')
+
+
+def test_local_fields_bad_instant():
+    with raises(TypeError):
+        local_fields(['2018-01-01'], 'UTC')
+
+
+def test_local_fields_unknown_zone():
+    with raises(pytz.exceptions.UnknownTimeZoneError):
+        local_fields([0], 'Mars/Olympus_Mons')
@@ -0,0 +1,103 @@
+import datetime
+import pickle
+
+import hypothesis.strategies as st
+from hypothesis import given
+import pytz
+import pytest
+
+from citytime import CityTime, Range, get_zone, validate_local
+from citytime.tables import get_table, offset_name, parse_offset
+
+LOCAL_TIMES = st.datetimes(min_value=datetime.datetime(1900, 1, 2), max_value=datetime.datetime(2100, 1, 1))
+FIXED_ZONES = ['UTC', 'Etc/GMT-3', 'Etc/GMT+10', 'Etc/GMT-14', '+05:30', '-08:00', '+00:00']
+
+
+def test_parse_offset():
+    assert parse_offset('+05:30') == 19800
+    assert parse_offset('+0530') == 19800
+    assert parse_offset('-08') == -28800
+    assert parse_offset('-00:30') == -1800
+    for name in ('UTC', 'America/New_York', '+5:30', '+24:00', '+05:60', '05:30', '+05:30 '):
+        assert parse_offset(name) is None
+    assert offset_name(19800) == '+05:30'
+    assert offset_name(-1800) == '-00:30'
+    assert offset_name(0) == '+00:00'
+
+
+def test_fixed_offset_zone():
+    zone = get_zone('+0530')
+    assert zone is get_zone('+05:30')
+    assert zone.name == '+05:30'
+    assert zone.fixed_offset == datetime.timedelta(hours=5, minutes=30)
+    assert zone.canonical is zone
+    assert zone.table is get_table('+05:30')
+    assert zone.table.offsets[0] == 19800 and zone.table.is_fixed()
+    assert pickle.loads(pickle.dumps(zone)) is zone
+    assert get_zone('-08:00', backend='zoneinfo').tzinfo.utcoffset(None) == datetime.timedelta(hours=-8)
+
+
+def test_static_zones():
+    for name in ('UTC', 'Etc/GMT-3', 'Etc/GMT+10'):
+        assert get_zone(name).fixed_offset == get_zone(name, backend='zoneinfo').fixed_offset
+    assert get_zone('Etc/GMT-3').fixed_offset == datetime.timedelta(hours=3)
+    assert get_zone('UTC').fixed_offset == datetime.timedelta()
+    assert get_zone('America/New_York').fixed_offset is None
+    assert get_zone('America/New_York', backend='zoneinfo').fixed_offset is None
+
+
+def test_citytime_fixed_offset():
+    ct = CityTime(datetime.datetime(2018, 6, 1, 12, 30), '+05:30')
+    assert ct.utc() == datetime.datetime(2018, 6, 1, 7, tzinfo=pytz.utc)
+    assert ct.timezone() == '+05:30'
+    assert ct.local().replace(tzinfo=None) == datetime.datetime(2018, 6, 1, 12, 30)
+    assert ct.offset() == '+0530'
+    assert ct == CityTime(datetime.datetime(2018, 6, 1, 12, 30), 'Asia/Kolkata')
+    assert repr(ct) == 'CityTime("2018-06-01T07:00:00", "+05:30")'
+    assert ct.astimezone('-08:00').replace(tzinfo=None) == datetime.datetime(2018, 5, 31, 23)
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        CityTime(datetime.datetime(2018, 6, 1), '+25:00')
+
+
+@given(LOCAL_TIMES, st.sampled_from(FIXED_ZONES), st.sampled_from(['pytz', 'zoneinfo']))
+def test_same_as_astimezone(dt, zone, backend):
+    ct = CityTime(dt, zone, backend=backend)
+    tz = get_zone(zone, backend).tzinfo
+    if backend == 'pytz':
+        expected = tz.localize(dt)
+    else:
+        expected = dt.replace(tzinfo=tz)
+    assert ct.utc() == expected
+    local = ct.local()
+    assert local == expected.astimezone(tz)
+    assert local.tzinfo is tz
+    assert local.replace(tzinfo=None) == dt
+    assert (ct.weekday(), ct.time_string(), ct.local_minute()) == (dt.weekday(), dt.strftime('%H%M'),
+                                                                    dt.hour * 60 + dt.minute)
+
+
+def test_utc_short_circuit():
+    utc = datetime.datetime(2018, 6, 1, 12, tzinfo=pytz.utc)
+    ct = CityTime(utc, 'UTC')
+    assert ct.local() is ct.utc()
+    ct.increment(hours=25)
+    assert ct.utc() == utc + datetime.timedelta(hours=25)
+    assert ct.local_strftime('%Y-%m-%d %H:%M %Z') == '2018-06-02 13:00 UTC'
+
+
+def test_increment_and_range():
+    ct = CityTime(datetime.datetime(2018, 3, 11, 1, 30), 'Etc/GMT+5')
+    ct.increment(hours=1)
+    assert ct.local().replace(tzinfo=None) == datetime.datetime(2018, 3, 11, 2, 30)
+    later = ct + datetime.timedelta(days=1)
+    span = Range(ct, datetime.timedelta(hours=2))
+    assert span.delta() == datetime.timedelta(hours=2)
+    assert span.contains(ct)
+    assert later - ct == datetime.timedelta(days=1)
+
+
+def test_validate_fixed_offset():
+    wall_time = datetime.datetime(2018, 3, 11, 2, 30)
+    assert validate_local([wall_time], '-05:00').status == ['ok']
+    assert not CityTime().try_set(wall_time, 'America/New_York').ok
+    assert CityTime().try_set(wall_time, '-05:00').ok
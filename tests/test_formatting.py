@@ -0,0 +1,130 @@
+import datetime
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+import pytz
+import pytest
+
+import citytime
+from citytime import CityTime
+from citytime.formatting import ISO_8601, Formatter, compile_pattern, format_many, get_formatter
+
+ZONES = ['America/New_York', 'Europe/London', 'Asia/Kolkata', 'Australia/Lord_Howe', 'UTC', '+05:45',
+         'America/St_Johns', 'Africa/Monrovia']
+PATTERNS = [
+    ISO_8601, '%H%M', '%Y-%m-%d %H:%M:%S%z', '%Y-%m-%dT%H:%M:%S.%f%z', '%a %d %b %Y %I:%M %p %Z',
+    '%j %U %W %w %y %%H literal %% %X %x', '100%', '%c', '%s', '',
+]
+
+STAMPS = st.integers(min_value=-2 * 10 ** 15, max_value=4 * 10 ** 15)
+
+
+def expected(micros, zone, pattern):
+    utc = datetime.datetime(1970, 1, 1, tzinfo=pytz.utc) + datetime.timedelta(microseconds=micros)
+    local = CityTime(utc, 'UTC').astimezone(zone)
+    if pattern == '%s':
+        return local.strftime('%s')
+    text = local.strftime(pattern.replace('%:z', '%z'))
+    if '%:z' in pattern:
+        text = text[:-2] + ':' + text[-2:]
+    return text
+
+
+@settings(max_examples=200)
+@given(st.lists(STAMPS, min_size=1, max_size=20), st.sampled_from(ZONES), st.sampled_from(PATTERNS))
+def test_matches_strftime(micros, zone, pattern):
+    instants = [datetime.datetime(1970, 1, 1, tzinfo=pytz.utc) + datetime.timedelta(microseconds=value)
+                for value in micros]
+    assert format_many(instants, zone, pattern) == [expected(value, zone, pattern) for value in micros]
+
+
+def test_iso_8601():
+    ct = CityTime(datetime.datetime(2018, 6, 1, 12, 30), 'America/New_York')
+    assert format_many([ct], 'America/New_York') == [ct.local().isoformat()]
+    assert format_many([ct], 'America/New_York') == ['2018-06-01T12:30:00-04:00']
+    assert format_many([ct], 'UTC', '%Y-%m-%d %H:%M:%S%z') == ['2018-06-01 16:30:00+0000']
+    assert format_many([ct.utc().timestamp()], 'UTC', '%Y-%m-%d %H:%M:%S%z') == ['2018-06-01 16:30:00+0000']
+    assert format_many([ct], 'Asia/Kathmandu', '%H%M %Z') == ['2215 +0545']
+    assert format_many([], 'UTC') == []
+    assert citytime.format_many is format_many
+
+
+def test_transitions():
+    # New York falls back at 06:00 UTC, so 05:30 and 06:30 UTC are both 01:30 local.
+    instants = [datetime.datetime(2018, 11, 4, 5, 30, tzinfo=pytz.utc), datetime.datetime(2018, 11, 4, 6, 30, tzinfo=pytz.utc)]
+    assert format_many(instants, 'America/New_York', '%H:%M %Z %z') == ['01:30 EDT -0400', '01:30 EST -0500']
+
+
+def test_platform_directives():
+    instants = [datetime.datetime(2018, 6, 1, hour, 5, tzinfo=pytz.utc) for hour in (3, 15)]
+    local = [instant.astimezone(pytz.timezone('Asia/Tokyo')) for instant in instants]
+    assert format_many(instants, 'Asia/Tokyo', '%d %k|%l|%P') == [value.strftime('%d %k|%l|%P') for value in local]
+
+
+def test_strftime_with_iso_offset():
+    # %c and %-d are left to strftime, which doesn't know %:z before Python 3.12.
+    assert format_many([1.6e9], 'Asia/Kolkata', '%c %:z') == ['Sun Sep 13 17:56:40 2020 +05:30']
+    assert format_many([1.6e9], 'America/St_Johns', '%-d %:z%%:z %:z') == ['13 -02:30%:z -02:30']
+
+
+def test_pattern_cache():
+    assert compile_pattern('%H%M') is compile_pattern('%H%M')
+    assert compile_pattern('%H%M').time_codes == ['H', 'M']
+    assert compile_pattern('%c').mixed
+    assert not compile_pattern('%a %e %F %H:%M %:z').mixed
+    # Directives that aren't known to depend on the date alone, such as these glibc ones, are
+    # left to strftime.
+    for pattern in ('%k', '%l', '%P', '%-d'):
+        assert compile_pattern(pattern).mixed
+
+
+def test_unknown_zone():
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        format_many([0], 'Mars/Olympus_Mons')
+
+
+@settings(max_examples=200)
+@given(STAMPS, st.sampled_from(ZONES), st.sampled_from(PATTERNS + ['%Y %A %B %I%p %w %:z']))
+def test_formatter_matches_strftime(micros, zone, pattern):
+    utc = datetime.datetime(1970, 1, 1, tzinfo=pytz.utc) + datetime.timedelta(microseconds=micros)
+    ct = CityTime(utc, 'UTC')
+    ct.change_tz(zone)
+    assert ct.format(Formatter(pattern)) == expected(micros, zone, pattern)
+    assert ct.format(pattern) == expected(micros, zone, pattern)
+
+
+def test_formatter():
+    ct = CityTime(datetime.datetime(2018, 6, 1, 12, 30, 15, 250), 'America/New_York')
+    formatter = Formatter('%Y-%m-%d %H:%M:%S.%f %Z%:z 100%%')
+    assert ct.format(formatter) == '2018-06-01 12:30:15.000250 EDT-04:00 100%'
+    assert formatter.format(ct) == ct.format(formatter)
+    assert formatter.format(ct.local()) == ct.format(formatter)
+    assert ct.format('%H%M') == ct.local_strftime('%H%M') == ct.time_string()
+    assert get_formatter('%H%M') is get_formatter('%H%M')
+    assert get_formatter(formatter) is formatter
+    assert citytime.Formatter is Formatter
+    for backend in ('pytz', 'zoneinfo'):
+        summer = CityTime(datetime.datetime(2018, 6, 1, 12, 30), 'America/New_York', backend)
+        winter = CityTime(datetime.datetime(2018, 12, 1, 12, 30), 'America/New_York', backend)
+        assert [summer.format('%H:%M%z'), winter.format('%H:%M%z')] == ['12:30-0400', '12:30-0500']
+    with pytest.raises(ValueError):
+        CityTime().format(formatter)
+
+
+def test_formatter_strftime_with_iso_offset():
+    ct = CityTime(datetime.datetime(2020, 11, 1, 10), 'Asia/Kolkata')
+    assert Formatter('%c %:z').format(ct) == 'Sun Nov  1 10:00:00 2020 +05:30'
+    assert ct.format('%c %:z') == 'Sun Nov  1 10:00:00 2020 +05:30'
+    assert ct.format('%-d%%:z%:z') == '1%:z+05:30'
+
+
+def test_local_cache():
+    ct = CityTime(datetime.datetime(2018, 11, 4, 0, 30), 'America/Chicago')
+    ct.increment(hours=1)
+    assert ct.format('%H:%M %Z') == '01:30 CDT'
+    ct.increment(hours=1)
+    assert ct.format('%H:%M %Z') == '01:30 CST'
+    ct.change_tz('Asia/Tokyo')
+    assert ct.format('%H:%M %Z') == '16:30 JST'
+    assert ct.local() is ct.local()
+    assert CityTime.from_trusted(ct.epoch_us(), ct.zone()).format('%H:%M') == '16:30'
@@ -0,0 +1,109 @@
+import datetime
+import logging
+
+import pytz
+from pytz.exceptions import NonExistentTimeError
+from pytest import raises
+
+from citytime import CityTime, Range
+from citytime import instrumentation
+
+LOCAL_TIME = datetime.datetime(2018, 6, 1, 12, 0)
+
+
+def test_disabled_by_default():
+    assert not instrumentation.is_enabled()
+    assert CityTime.__dict__['set'].__module__ == 'citytime.citytime'
+
+
+def test_measure_counts_events():
+    with instrumentation.measure() as recorder:
+        ct = CityTime(LOCAL_TIME, 'America/New_York')
+        ct.local()
+    counters = recorder.snapshot()['counters']
+    assert counters['CityTime.set']['zone_lookup'] == 1
+    assert counters['CityTime.set']['localize'] == 1
+    assert counters['CityTime.local']['astimezone'] == 1
+
+
+def test_measure_latency():
+    with instrumentation.measure() as recorder:
+        ct = CityTime(LOCAL_TIME, 'America/New_York')
+        for _ in range(3):
+            ct.increment(minutes=1)
+        Range(ct, datetime.timedelta(hours=1)).overlaps(Range(ct, datetime.timedelta(hours=2)))
+    latency = recorder.snapshot()['latency']
+    # Each Range made with a timedelta increments its end time once.
+    assert latency['CityTime.increment']['count'] == 5
+    assert sum(latency['CityTime.increment']['buckets'].values()) == 5
+    assert latency['CityTime.set']['count'] == 1
+    assert latency['Range.overlaps']['count'] == 1
+    assert latency['Range._create_range_timedelta']['count'] == 2
+
+
+def test_measure_counts_exceptions():
+    with instrumentation.measure() as recorder:
+        with raises(NonExistentTimeError):
+            CityTime(datetime.datetime(2018, 3, 11, 2, 30), 'America/New_York')
+    counters = recorder.snapshot()['counters']
+    assert counters['CityTime.set']['exception:NonExistentTimeError'] == 1
+    # Not again for CityTime.__init__, which it propagated through.
+    assert 'exception:NonExistentTimeError' not in counters.get('CityTime.__init__', {})
+    with instrumentation.measure() as recorder:
+        for _ in range(2):
+            with raises(NonExistentTimeError):
+                CityTime(datetime.datetime(2018, 3, 11, 2, 30), 'America/New_York')
+    assert recorder.snapshot()['counters']['CityTime.set']['exception:NonExistentTimeError'] == 2
+
+
+def test_measure_restores_originals():
+    original_set = CityTime.__dict__['set']
+    original_timezone = pytz.timezone
+    with instrumentation.measure():
+        assert CityTime.__dict__['set'] is not original_set
+        assert instrumentation.is_enabled()
+    assert CityTime.__dict__['set'] is original_set
+    assert pytz.timezone is original_timezone
+    assert not instrumentation.is_enabled()
+
+
+def test_enable_snapshot_reset():
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        CityTime(LOCAL_TIME, 'Asia/Tokyo')
+    finally:
+        instrumentation.disable()
+    CityTime(LOCAL_TIME, 'Asia/Tokyo')
+    assert instrumentation.snapshot()['latency']['CityTime.set']['count'] == 1
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {'counters': {}, 'latency': {}}
+
+
+def test_periodic_dump(caplog):
+    instrumentation.reset()
+    instrumentation.enable(dump_interval=0)
+    try:
+        with caplog.at_level(logging.INFO, logger='citytime'):
+            CityTime(LOCAL_TIME, 'Asia/Tokyo')
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+    assert any('CityTime instrumentation' in record.getMessage() for record in caplog.records)
+
+
+def test_histogram_buckets():
+    histogram = instrumentation.Histogram()
+    for ns in (1, 700, 1024, 1025):
+        histogram.add(ns)
+    snapshot = histogram.snapshot()
+    assert snapshot['buckets'] == {1: 1, 1024: 2, 2048: 1}
+    assert snapshot['min_ns'] == 1
+    assert snapshot['max_ns'] == 1025
+
+
+def test_measure_zoneinfo_backend():
+    with instrumentation.measure() as recorder:
+        CityTime(LOCAL_TIME, 'America/New_York', backend='zoneinfo')
+    counters = recorder.snapshot()['counters']
+    assert counters['CityTime.set'] == {'zone_lookup': 1, 'localize': 1}
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import citytime
+from citytime._lazy import LazyModule
+
+
+def run_python(code):
+    env = dict(os.environ)
+    source = os.path.dirname(os.path.dirname(os.path.abspath(citytime.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [source, env.get('PYTHONPATH')]))
+    return subprocess.run([sys.executable, '-c', code], env=env, stdout=subprocess.PIPE,
+                          universal_newlines=True, check=True).stdout.split()
+
+
+def test_import_does_not_load_pytz():
+    code = 'import sys\nfrom citytime import CityTime, Range\nprint("pytz" in sys.modules, "calendar" in sys.modules)'
+    assert run_python(code) == ['False', 'False']
+
+
+def test_import_does_not_load_logformat():
+    code = ('import sys\nimport citytime\nprint("citytime.logformat" in sys.modules)\n'
+            'citytime.ZoneFormatter\nprint("citytime.logformat" in sys.modules)')
+    assert run_python(code) == ['False', 'True']
+
+
+def test_import_does_not_load_asyncio():
+    code = ('import datetime, sys\nimport citytime\n'
+            'print("asyncio" in sys.modules, "citytime.scheduler" in sys.modules)\n'
+            'scheduler = citytime.Scheduler()\nprint("asyncio" in sys.modules)\n'
+            'scheduler.call_daily(datetime.time(9), "UTC", print)\nprint("asyncio" in sys.modules)')
+    assert run_python(code) == ['False', 'False', 'False', 'True']
+
+
+def test_import_does_not_load_submodules():
+    # formatting and validation are also in _SUBMODULES, but CityTime itself needs them.
+    deferred = ['clock', 'cron', 'equivalence', 'fields', 'localindex', 'logformat', 'offsets', 'scheduler', 'warmup']
+    code = 'import sys\nimport citytime\nprint([name for name in {!r} if "citytime." + name in sys.modules])'
+    assert run_python(code.format(deferred)) == ['[]']
+
+
+def test_submodule_names():
+    import importlib
+    for name, submodule in citytime._SUBMODULES.items():
+        assert getattr(citytime, name) is getattr(importlib.import_module('citytime.' + submodule), name)
+    with pytest.raises(AttributeError):
+        citytime.no_such_name
+
+
+def test_first_use_loads_pytz():
+    code = ('import datetime, sys\nfrom citytime import CityTime\n'
+            'CityTime(datetime.datetime(2018, 1, 1), "Asia/Kolkata")\nprint("pytz" in sys.modules)')
+    assert run_python(code) == ['True']
+
+
+def test_lazy_module_rebinds():
+    namespace = {}
+    namespace['json'] = LazyModule('json', namespace)
+    assert namespace['json'].dumps([1]) == '[1]'
+    import json
+    assert namespace['json'] is json
+
+
+def test_legacy_module_attributes():
+    import pytz
+    from citytime import citytime as module
+    assert module.UnknownTimeZoneError is pytz.exceptions.UnknownTimeZoneError
+    assert module.NonExistentTimeError is pytz.exceptions.NonExistentTimeError
+    assert module.AmbiguousTimeError is pytz.exceptions.AmbiguousTimeError
+    assert module.day_name[0] == 'Monday'
@@ -0,0 +1,91 @@
+import datetime
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+import pytz
+import pytest
+
+import citytime
+from citytime import CityTime
+from citytime.localindex import LocalTimeIndex, zones_at_local_time
+from citytime.registry import get_registry
+
+ZONES = [
+    'America/New_York', 'US/Eastern', 'America/Chicago', 'Europe/London', 'Europe/Berlin', 'Asia/Kolkata',
+    'Asia/Kathmandu', 'Australia/Lord_Howe', 'Pacific/Kiritimati', 'Pacific/Pago_Pago', 'Etc/GMT+12', 'UTC',
+]
+
+
+def brute_force(stamp, start, end, zones):
+    instant = datetime.datetime.fromtimestamp(stamp, pytz.utc)
+    result = []
+    for zone in zones:
+        local = instant.astimezone(pytz.timezone(zone)).time()
+        if start <= end:
+            if start <= local < end:
+                result.append(zone)
+        elif local >= start or local < end:
+            result.append(zone)
+    return sorted(result)
+
+
+@settings(max_examples=300)
+@given(
+    st.integers(min_value=946684800, max_value=2000000000),
+    st.times(),
+    st.times(),
+)
+def test_matches_astimezone(stamp, start, end):
+    index = LocalTimeIndex(ZONES)
+    assert sorted(index.zones_at(stamp, start, end)) == brute_force(stamp, start, end, ZONES)
+
+
+def test_window():
+    index = LocalTimeIndex(ZONES)
+    instant = datetime.datetime(2024, 7, 1, 13, 2, tzinfo=pytz.utc)
+    assert index.zones_at(instant, datetime.time(9), datetime.time(9, 5)) == ['America/New_York', 'US/Eastern']
+    assert index.zones_at(instant, datetime.time(18, 32), datetime.time(18, 33)) == ['Asia/Kolkata']
+    # Etc/GMT+12 is at 01:02 and Pago Pago at 02:02; Lord Howe is at 23:32 and Kiritimati at
+    # 03:02 the next day.
+    assert index.zones_at(instant, datetime.time(23), datetime.time(3, 30)) == [
+        'Etc/GMT+12', 'Pacific/Pago_Pago', 'Australia/Lord_Howe', 'Pacific/Kiritimati']
+    assert index.zones_at(instant, datetime.time(9), datetime.time(9)) == []
+    with pytest.raises(TypeError):
+        index.zones_at(instant, '09:00', datetime.time(9, 5))
+
+
+def test_rebuilt_at_transitions_only():
+    index = LocalTimeIndex(ZONES)
+    start = datetime.datetime(2024, 7, 1, tzinfo=pytz.utc).timestamp()
+    for minute in range(0, 24 * 60, 5):
+        index.zones_at(start + minute * 60, datetime.time(9), datetime.time(9, 5))
+    assert index.rebuilds == 1
+    # New York springs forward at 2024-03-10 07:00 UTC.
+    before = datetime.datetime(2024, 3, 10, 6, 59, tzinfo=pytz.utc)
+    after = datetime.datetime(2024, 3, 10, 7, 0, tzinfo=pytz.utc)
+    assert 'America/New_York' in index.zones_at(before, datetime.time(1, 59), datetime.time(2))
+    assert 'America/New_York' in index.zones_at(after, datetime.time(3), datetime.time(3, 1))
+    assert index.rebuilds == 3
+
+
+def test_offsets():
+    index = LocalTimeIndex(['Asia/Kolkata', 'UTC', 'America/New_York'])
+    offsets = index.offsets(datetime.datetime(2024, 1, 1))
+    assert offsets == [(-18000, 'America/New_York'), (0, 'UTC'), (19800, 'Asia/Kolkata')]
+
+
+def test_default_zones():
+    instant = CityTime()
+    instant.set(datetime.datetime(2024, 1, 15, 14, 0), 'Europe/Berlin')
+    zones = zones_at_local_time(instant, datetime.time(14), datetime.time(14, 1))
+    assert 'Europe/Berlin' in zones
+    assert 'Europe/Amsterdam' in zones
+    assert 'Africa/Lagos' in zones
+    assert 'Europe/London' not in zones
+    assert set(zones) <= set(get_registry().names())
+    assert citytime.zones_at_local_time is zones_at_local_time
+
+
+def test_unknown_zone():
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        LocalTimeIndex(['Mars/Olympus_Mons'])
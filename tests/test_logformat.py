@@ -0,0 +1,87 @@
+import datetime
+import logging
+import sys
+
+import pytz
+import pytest
+
+import citytime
+from citytime import CityTime
+from citytime.logformat import ZoneFormatter
+
+
+def record(when, msg='hello'):
+    item = logging.LogRecord('test', logging.INFO, __file__, 1, msg, None, None)
+    item.created = when.timestamp()
+    item.msecs = when.microsecond // 1000
+    return item
+
+
+def test_default_format():
+    formatter = ZoneFormatter('%(asctime)s %(message)s', zones=['America/New_York', 'Asia/Kolkata'])
+    when = datetime.datetime(2018, 6, 1, 16, 30, 5, 123456, tzinfo=pytz.utc)
+    assert formatter.format(record(when)) == (
+        '2018-06-01 12:30:05,123 EDT 2018-06-01 22:00:05,123 IST hello')
+    assert formatter.format(record(when + datetime.timedelta(milliseconds=500))) == (
+        '2018-06-01 12:30:05,623 EDT 2018-06-01 22:00:05,623 IST hello')
+    assert citytime.ZoneFormatter is ZoneFormatter
+
+
+def test_datefmt():
+    formatter = ZoneFormatter('[%(asctime)s] %(message)s', '%H:%M:%S%z 100%%', zones=['Europe/Paris', 'UTC'],
+                              separator=' | ')
+    when = datetime.datetime(2018, 12, 1, 16, 30, 5, 123456, tzinfo=pytz.utc)
+    assert formatter.format(record(when)) == '[17:30:05+0100 100% | 16:30:05+0000 100%] hello'
+    assert formatter.formatTime(record(when), '%H') == '17 | 16'
+    micro = ZoneFormatter('%(asctime)s', '%S.%f', zones=['UTC'])
+    assert micro.format(record(when)) == '05.123456'
+    # %c is left to strftime, which doesn't know %:z before Python 3.12.
+    mixed = ZoneFormatter('%(asctime)s', '%c %:z', zones=['Asia/Kolkata'])
+    when = datetime.datetime(2020, 11, 1, 4, 30, tzinfo=pytz.utc)
+    assert mixed.format(record(when)) == 'Sun Nov  1 10:00:00 2020 +05:30'
+
+
+def test_across_transition():
+    # New York falls back at 06:00 UTC.
+    formatter = ZoneFormatter('%(asctime)s', '%H:%M:%S %Z', zones=['America/New_York'])
+    start = datetime.datetime(2018, 11, 4, 5, 59, 58, tzinfo=pytz.utc)
+    times = [formatter.format(record(start + datetime.timedelta(seconds=i))) for i in range(4)]
+    assert times == ['01:59:58 EDT', '01:59:59 EDT', '01:00:00 EST', '01:00:01 EST']
+    for i in range(4):
+        instant = start + datetime.timedelta(seconds=i)
+        assert times[i] == CityTime(instant, 'UTC').astimezone('America/New_York').strftime('%H:%M:%S %Z')
+
+
+def test_cache_is_bounded():
+    formatter = ZoneFormatter('%(asctime)s', zones=['UTC'])
+    start = datetime.datetime(2018, 6, 1, tzinfo=pytz.utc)
+    for i in range(100):
+        formatter.format(record(start + datetime.timedelta(seconds=i)))
+    assert len(formatter._seconds) <= formatter.cached_seconds
+
+
+def test_handler():
+    formatter = ZoneFormatter('%(asctime)s %(levelname)s %(message)s', zones=['Asia/Tokyo'])
+    handler = logging.StreamHandler()
+    handler.setFormatter(formatter)
+    line = handler.format(logging.LogRecord('test', logging.WARNING, __file__, 1, 'x', None, None))
+    assert line.endswith(' JST WARNING x')
+
+
+def test_validate(monkeypatch):
+    with pytest.raises(ValueError):
+        ZoneFormatter('no fields')
+    assert ZoneFormatter('no fields', validate=False).format(record(datetime.datetime.now(pytz.utc))) == 'no fields'
+    # logging.Formatter only takes validate from Python 3.8.
+    init = logging.Formatter.__init__
+
+    def init_37(self, fmt=None, datefmt=None, style='%'):
+        init(self, fmt, datefmt, style, validate=False)
+    monkeypatch.setattr(logging.Formatter, '__init__', init_37)
+    monkeypatch.setattr(sys, 'version_info', (3, 7, 0))
+    assert ZoneFormatter('no fields', zones=['UTC']).zones == [citytime.get_zone('UTC')]
+
+
+def test_unknown_zone():
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        ZoneFormatter(zones=['Mars/Olympus_Mons'])
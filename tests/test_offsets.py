@@ -0,0 +1,101 @@
+import datetime
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+import pytz
+import pytest
+
+import citytime
+from citytime import CityTime, Range
+from citytime.offsets import Transition, transitions, upcoming_transitions
+
+ZONES = ['America/New_York', 'Europe/London', 'Australia/Sydney', 'Australia/Lord_Howe', 'Asia/Tokyo', 'UTC']
+
+
+def _range(start, end):
+    return Range(CityTime(start, 'UTC'), CityTime(end, 'UTC'))
+
+
+def brute_force(zone, start, end):
+    # The offset of every hour, plus the exact instant of each change found by bisection.
+    tz = pytz.timezone(zone)
+    offset = lambda moment: int(pytz.utc.localize(moment).astimezone(tz).utcoffset().total_seconds())
+    result = []
+    moment = start
+    while moment < end:
+        low, high = moment, min(moment + datetime.timedelta(hours=1), end)
+        if offset(low) != offset(high):
+            while high - low > datetime.timedelta(seconds=1):
+                middle = low + (high - low) // 2
+                if offset(middle) == offset(low):
+                    low = middle
+                else:
+                    high = middle
+            stamp = int((high - datetime.datetime(1970, 1, 1)).total_seconds())
+            result.append(Transition(zone, stamp, offset(low), offset(high)))
+        moment += datetime.timedelta(hours=1)
+    return result
+
+
+def test_new_york_2018():
+    found = transitions('America/New_York', _range(datetime.datetime(2018, 1, 1), datetime.datetime(2019, 1, 1)))
+    assert found == [
+        Transition('America/New_York', 1520751600, -18000, -14400),
+        Transition('America/New_York', 1541311200, -14400, -18000),
+    ]
+    spring, autumn = found
+    assert spring.is_gap() and not autumn.is_gap()
+    assert spring.utc() == datetime.datetime(2018, 3, 11, 7)
+    local = spring.citytime()
+    assert local.timezone() == 'America/New_York'
+    assert local.local() == pytz.timezone('America/New_York').localize(datetime.datetime(2018, 3, 11, 3))
+    assert citytime.transitions is transitions
+
+
+@settings(max_examples=15, deadline=None)
+@given(st.sampled_from(ZONES), st.datetimes(min_value=datetime.datetime(1990, 1, 1),
+                                            max_value=datetime.datetime(2030, 1, 1)))
+def test_matches_astimezone(zone, start):
+    end = start + datetime.timedelta(days=400)
+    assert transitions(zone, _range(start, end)) == brute_force(zone, start, end)
+
+
+def test_range_bounds_included():
+    spring = datetime.datetime(2018, 3, 11, 7)
+    assert len(transitions('America/New_York', _range(spring, spring + datetime.timedelta(hours=1)))) == 1
+    assert len(transitions('America/New_York', _range(spring - datetime.timedelta(hours=1), spring))) == 1
+    assert transitions('America/New_York', _range(spring + datetime.timedelta(seconds=1),
+                                                  spring + datetime.timedelta(days=1))) == []
+    assert transitions('UTC', _range(datetime.datetime(1900, 1, 1), datetime.datetime(2100, 1, 1))) == []
+
+
+def test_unset_range():
+    with pytest.raises(ValueError):
+        transitions('America/New_York', Range())
+
+
+def test_upcoming_transitions():
+    now = datetime.datetime(2018, 10, 1, tzinfo=pytz.utc)
+    found = upcoming_transitions(ZONES, within=datetime.timedelta(days=40), now=now)
+    assert [(transition.zone, transition.utc()) for transition in found] == [
+        ('Australia/Lord_Howe', datetime.datetime(2018, 10, 6, 15, 30)),
+        ('Australia/Sydney', datetime.datetime(2018, 10, 6, 16)),
+        ('Europe/London', datetime.datetime(2018, 10, 28, 1)),
+        ('America/New_York', datetime.datetime(2018, 11, 4, 6)),
+    ]
+    # Lord Howe moves by half an hour.
+    assert found[0].after - found[0].before == 1800
+    assert upcoming_transitions(ZONES, within=datetime.timedelta(days=1), now=now) == []
+    with pytest.raises(ValueError):
+        upcoming_transitions(ZONES, within=datetime.timedelta(days=-1))
+    assert citytime.upcoming_transitions is upcoming_transitions
+
+
+def test_upcoming_transitions_default_zones():
+    now = datetime.datetime(2018, 10, 27, tzinfo=pytz.utc)
+    zones = {transition.zone for transition in upcoming_transitions(within=datetime.timedelta(days=2), now=now)}
+    assert 'Europe/London' in zones
+    assert 'Europe/Berlin' in zones
+    assert 'America/New_York' not in zones
+    assert 'GB' not in zones
+    assert upcoming_transitions(within=datetime.timedelta(days=7)) is not None
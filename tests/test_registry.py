@@ -0,0 +1,108 @@
+import datetime
+
+import pytz
+import pytest
+
+import citytime
+from citytime import CityTime, registry, tables
+from citytime.fields import local_fields
+from citytime.registry import Registry, canonical_name, get_registry, parse_links, same_rules
+from citytime.tables import get_table
+from citytime.zones import get_zone
+
+TZDATA = '''# version 2026e
+R U 1918 1919 - Mar lastSu 2 1 D
+Z America/New_York -4:56:2 - LMT 1883 N 18 12:3:58
+-5 U E%sT
+Z Europe/Brussels 0:17:30 - LMT 1880
+1 - CET
+L America/New_York US/Eastern
+L Europe/Brussels Europe/Amsterdam
+L US/Eastern EST5EDT_alias
+'''
+
+
+def test_parse_links():
+    zones, links = parse_links(TZDATA.splitlines())
+    assert zones == ['America/New_York', 'Europe/Brussels']
+    assert links == {'US/Eastern': 'America/New_York', 'Europe/Amsterdam': 'Europe/Brussels',
+                     'EST5EDT_alias': 'US/Eastern'}
+
+
+def test_registry():
+    reg = Registry(*parse_links(TZDATA.splitlines()))
+    assert len(reg) == 5
+    assert reg.zones() == ['America/New_York', 'Europe/Brussels']
+    assert reg.names() == ['America/New_York', 'EST5EDT_alias', 'Europe/Amsterdam', 'Europe/Brussels', 'US/Eastern']
+    assert reg.name('us/EASTERN') == 'US/Eastern'
+    assert reg.canonical('us/eastern') == 'America/New_York'
+    assert reg.canonical('est5edt_alias') == 'America/New_York'
+    assert reg.canonical('America/New_York') == 'America/New_York'
+    assert reg.is_link('Europe/Amsterdam')
+    assert not reg.is_link('europe/brussels')
+    assert reg.aliases('US/Eastern') == ['America/New_York', 'EST5EDT_alias', 'US/Eastern']
+    assert 'europe/amsterdam' in reg
+    assert 'Mars/Olympus_Mons' not in reg
+    assert None not in reg
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        reg.canonical('Mars/Olympus_Mons')
+
+
+def test_default_registry():
+    reg = get_registry()
+    assert get_registry() is reg
+    assert len(reg) == len(pytz.all_timezones)
+    assert all(name in reg for name in pytz.all_timezones)
+    assert canonical_name('US/Eastern') == 'America/New_York'
+    assert canonical_name('us/pacific') == 'America/Los_Angeles'
+    assert canonical_name('Asia/Calcutta') == 'Asia/Kolkata'
+    assert canonical_name('UTC') == canonical_name('Etc/UTC')
+    assert citytime.canonical_name is canonical_name
+
+
+def test_same_rules():
+    assert same_rules('US/Eastern', 'america/new_york')
+    assert same_rules('Asia/Kolkata', 'Asia/Calcutta')
+    assert not same_rules('America/New_York', 'America/Chicago')
+    assert same_rules('Etc/GMT-3', 'Etc/GMT-3')
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        same_rules('UTC', 'Mars/Olympus_Mons')
+
+
+def test_same_rules_by_table():
+    # Distinct zones with identical compiled tables also have the same rules.
+    reg = Registry(['UTC', 'Etc/UTC'], {})
+    assert reg.canonical('Etc/UTC') == 'Etc/UTC'
+    assert reg.same_rules('UTC', 'Etc/UTC')
+
+
+def test_tables_shared_between_links():
+    table = get_table('America/New_York')
+    assert get_table('US/Eastern') is table
+    assert get_table('us/eastern') is table
+    instants = [datetime.datetime(2018, 3, 11, 6) + datetime.timedelta(minutes=17 * i) for i in range(100)]
+    assert local_fields(instants, 'US/Eastern') == local_fields(instants, 'America/New_York')
+
+
+def test_unknown_table():
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        get_table('Mars/Olympus_Mons')
+    assert 'Mars/Olympus_Mons' not in tables._TABLES
+
+
+def test_zone_canonical():
+    link = get_zone('US/Eastern')
+    assert link.name == 'US/Eastern'
+    assert link.canonical is get_zone('America/New_York')
+    assert link.canonical.canonical is link.canonical
+    assert CityTime(datetime.datetime(2018, 6, 1), 'us/eastern').zone().canonical is link.canonical
+    assert get_zone('US/Eastern', 'zoneinfo').canonical is get_zone('America/New_York', 'zoneinfo')
+
+
+def test_missing_tzdata(monkeypatch):
+    def open_resource(name):
+        raise IOError(name)
+    monkeypatch.setattr(pytz, 'open_resource', open_resource)
+    reg = registry.load_registry()
+    assert reg.canonical('US/Eastern') == 'US/Eastern'
+    assert len(reg) == len(pytz.all_timezones)
@@ -0,0 +1,155 @@
+import asyncio
+import datetime
+import time
+
+import pytz
+import pytest
+
+import citytime
+from citytime import CityTime, Scheduler
+
+
+def stamp(year, month, day, hour, minute=0):
+    return datetime.datetime(year, month, day, hour, minute, tzinfo=pytz.utc).timestamp()
+
+
+def fire_times(trigger, count):
+    # The next count fire times, as local times, without an event loop.
+    result = []
+    when = trigger.when
+    for _ in range(count):
+        result.append(CityTime.from_trusted(round(when * 1000000), trigger.zone).local().strftime('%Y-%m-%d %H:%M %Z'))
+        when = trigger._next_after(when)
+    return result
+
+
+def test_daily_across_dst():
+    # 2018-03-11: New York clocks go from 02:00 to 03:00. 2018-11-04: from 02:00 back to 01:00.
+    scheduler = Scheduler(time_function=lambda: stamp(2018, 3, 9, 12))
+    skipped = scheduler.call_daily(datetime.time(2, 30), 'America/New_York', print)
+    assert fire_times(skipped, 4) == [
+        '2018-03-10 02:30 EST', '2018-03-11 03:30 EDT', '2018-03-12 02:30 EDT', '2018-03-13 02:30 EDT']
+    morning = scheduler.call_daily(datetime.time(8), 'America/New_York', print)
+    assert fire_times(morning, 3) == ['2018-03-09 08:00 EST', '2018-03-10 08:00 EST', '2018-03-11 08:00 EDT']
+
+    scheduler = Scheduler(time_function=lambda: stamp(2018, 11, 3, 12))
+    repeated = scheduler.call_daily(datetime.time(1, 30), 'America/New_York', print)
+    assert fire_times(repeated, 3) == ['2018-11-04 01:30 EDT', '2018-11-05 01:30 EST', '2018-11-06 01:30 EST']
+    assert len(scheduler) == 1
+
+
+def test_daily_weekdays_and_zones():
+    # 2018-06-01 was a Friday.
+    scheduler = Scheduler(time_function=lambda: stamp(2018, 6, 1, 0))
+    trigger = scheduler.call_daily(datetime.time(9), 'Asia/Kolkata', print, weekdays=[0, 2])
+    assert fire_times(trigger, 3) == ['2018-06-04 09:00 IST', '2018-06-06 09:00 IST', '2018-06-11 09:00 IST']
+    assert trigger.next_fire_time() == CityTime(datetime.datetime(2018, 6, 4, 9), 'Asia/Kolkata')
+    # Already past 08:00 in Tokyo, not yet in Los Angeles.
+    assert fire_times(scheduler.call_daily(datetime.time(8), 'Asia/Tokyo', print), 1) == ['2018-06-02 08:00 JST']
+    assert fire_times(scheduler.call_daily(datetime.time(8), 'America/Los_Angeles', print), 1) == ['2018-06-01 08:00 PDT']
+    with pytest.raises(ValueError):
+        scheduler.call_daily(datetime.time(8), 'UTC', print, weekdays=[])
+    with pytest.raises(TypeError):
+        scheduler.call_daily('08:00', 'UTC', print)
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        scheduler.call_daily(datetime.time(8), 'Mars/Olympus_Mons', print)
+
+
+def test_fires_in_order_and_cancels():
+    fired = []
+
+    async def coroutine(name):
+        fired.append(name)
+
+    async def main():
+        scheduler = Scheduler()
+        now = datetime.datetime.now(pytz.utc)
+        scheduler.call_at(now + datetime.timedelta(milliseconds=60), fired.append, 'third')
+        scheduler.call_at(CityTime(now + datetime.timedelta(milliseconds=20), 'UTC'), fired.append, 'first')
+        scheduler.call_at(now + datetime.timedelta(milliseconds=40), coroutine, 'second')
+        cancelled = scheduler.call_at(now + datetime.timedelta(milliseconds=30), fired.append, 'cancelled')
+        cancelled.cancel()
+        cancelled.cancel()
+        assert cancelled.next_fire_time() is None
+        assert len(scheduler) == 3
+        await asyncio.sleep(0.2)
+        assert len(scheduler) == 0
+        assert scheduler.fired == 3
+        scheduler.close()
+
+    asyncio.run(main())
+    assert fired == ['first', 'second', 'third']
+
+
+def test_daily_fires_and_reschedules():
+    fired = []
+
+    async def main():
+        scheduler = Scheduler()
+        # One second from now, in a zone with a fixed offset.
+        local = (datetime.datetime.now(pytz.utc) + datetime.timedelta(seconds=1)).astimezone(pytz.FixedOffset(330))
+        trigger = scheduler.call_daily(local.time().replace(tzinfo=None), '+05:30', fired.append, 'daily')
+        first = trigger.when
+        await asyncio.sleep(1.3)
+        assert fired == ['daily']
+        assert trigger.when == pytest.approx(first + 86400)
+        trigger.cancel()
+        assert len(scheduler) == 0
+        scheduler.close()
+
+    asyncio.run(main())
+
+
+def test_start():
+    fired = []
+    scheduler = Scheduler()
+    scheduler.call_at(datetime.datetime.now(pytz.utc) + datetime.timedelta(milliseconds=20), fired.append, 'early')
+
+    async def main():
+        scheduler.start()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(main())
+    assert fired == ['early']
+
+
+def test_start_without_get_running_loop(monkeypatch):
+    # Python 3.6 has no asyncio.get_running_loop(); adding triggers before the loop runs doesn't
+    # need it either.
+    fired = []
+    monkeypatch.delattr(asyncio, 'get_running_loop')
+    scheduler = Scheduler()
+    for name in ('early', 'earlier'):
+        scheduler.call_at(datetime.datetime.now(pytz.utc) + datetime.timedelta(milliseconds=20), fired.append, name)
+
+    async def main():
+        scheduler.start()
+        await asyncio.sleep(0.1)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(main())
+    finally:
+        loop.close()
+    assert fired == ['early', 'earlier']
+
+
+def test_many_triggers():
+    zones = citytime.registry.get_registry().zones()
+    scheduler = Scheduler(time_function=lambda: stamp(2018, 6, 1, 0))
+    start = time.perf_counter()
+    triggers = [scheduler.call_daily(datetime.time(i % 24, i % 60), zones[i % len(zones)], print) for i in range(100000)]
+    assert time.perf_counter() - start < 60
+    assert len(scheduler) == 100000
+    for trigger in triggers[::3]:
+        trigger.cancel()
+    assert len(scheduler) == 100000 - len(triggers[::3])
+    assert all(trigger.when > stamp(2018, 6, 1, 0) for trigger in triggers if not trigger.cancelled)
+    scheduler.close()
+    assert len(scheduler) == 0
+
+
+def test_exports():
+    assert citytime.Scheduler is Scheduler
+    with pytest.raises(TypeError):
+        Scheduler().call_at(datetime.datetime(2018, 6, 1), print)
@@ -0,0 +1,201 @@
+import datetime
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+
+import pytz
+import pytest
+
+import citytime
+from citytime import registry, snapshot, tables
+from citytime.fields import local_fields
+from citytime.registry import canonical_name
+from citytime.snapshot import (
+    Snapshot, SnapshotError, attach_shared, build_snapshot, open_default, open_snapshot, publish_shared,
+    use_snapshot,
+)
+from citytime.tables import compile_table, get_table
+
+ZONES = ['America/New_York', 'Europe/London', 'Asia/Kolkata', 'Australia/Lord_Howe', 'UTC', 'EST']
+
+
+@pytest.fixture(autouse=True)
+def reset_tables():
+    yield
+    tables._snapshot = tables._UNSET
+    tables.clear_tables()
+
+
+@pytest.fixture
+def path(tmp_path):
+    return build_snapshot(str(tmp_path / 'zones.bin'), ZONES)
+
+
+def test_snapshot_matches_compiled_tables(path):
+    snap = Snapshot(path)
+    assert snap.version == pytz.OLSON_VERSION
+    # Links are stored with their canonical zone, whose table is included.
+    assert snap.zones() == sorted(set(ZONES) | {canonical_name(zone) for zone in ZONES})
+    assert len(snap) == len(snap.zones())
+    for zone in ZONES:
+        table = snap.table(zone)
+        compiled = compile_table(zone, pytz.timezone(zone))
+        assert list(table.transitions) == compiled.transitions
+        assert list(table.offsets) == compiled.offsets
+        assert list(table.dst_offsets) == compiled.dst_offsets
+        assert table.abbreviations == compiled.abbreviations
+    with pytest.raises(KeyError):
+        snap.table('Asia/Tokyo')
+
+
+def test_get_table_uses_snapshot(path):
+    assert use_snapshot(path) is not None
+    table = get_table('America/New_York')
+    assert isinstance(table.transitions, memoryview)
+    assert get_table('America/New_York') is table
+    # Zones missing from the snapshot are compiled as usual.
+    assert isinstance(get_table('Asia/Tokyo').transitions, list)
+
+
+def test_links_without_registry(path, monkeypatch):
+    canonical = {zone: canonical_name(zone) for zone in ZONES}
+    use_snapshot(path)
+    monkeypatch.setattr(registry, '_registry', None)
+    for zone in ZONES:
+        assert get_table(zone) is get_table(canonical[zone])
+        assert get_table(zone).name == canonical[zone]
+    assert registry._registry is None
+    # Other spellings aren't in the snapshot and go through the registry.
+    assert get_table('utc') is get_table('UTC')
+
+
+def test_local_fields_with_snapshot(path):
+    instants = [datetime.datetime(2018, 3, 11, 6) + datetime.timedelta(minutes=17 * i) for i in range(200)]
+    expected = {zone: local_fields(instants, zone) for zone in ZONES}
+    use_snapshot(path)
+    for zone in ZONES:
+        assert local_fields(instants, zone) == expected[zone]
+
+
+def test_stale_snapshot(path, monkeypatch, caplog):
+    monkeypatch.setattr(pytz, 'OLSON_VERSION', '1999z')
+    with caplog.at_level(logging.INFO, logger='citytime'):
+        assert open_snapshot(path) is None
+    assert 'tzdata' in caplog.text
+    assert use_snapshot(path) is None
+    assert isinstance(get_table('America/New_York').transitions, list)
+
+
+def test_missing_snapshot(tmp_path):
+    assert open_snapshot(str(tmp_path / 'missing.bin')) is None
+
+
+@pytest.mark.parametrize('content', [b'', b'CTZT', b'nonsense' * 10])
+def test_corrupt_snapshot(tmp_path, caplog, content):
+    corrupt = tmp_path / 'corrupt.bin'
+    corrupt.write_bytes(content)
+    assert open_snapshot(str(corrupt)) is None
+    assert 'Ignoring' in caplog.text
+
+
+def test_truncated_snapshot(path, tmp_path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    truncated = tmp_path / 'truncated.bin'
+    truncated.write_bytes(data[:-100])
+    with pytest.raises(SnapshotError):
+        Snapshot(str(truncated))
+
+
+def test_environment_variable(path, monkeypatch):
+    monkeypatch.setenv(snapshot.ENVIRONMENT_VARIABLE, path)
+    assert snapshot.default_path() == path
+    assert isinstance(get_table('Europe/London').transitions, memoryview)
+    monkeypatch.setenv(snapshot.ENVIRONMENT_VARIABLE, '')
+    assert open_snapshot() is None
+
+
+def test_default_path(monkeypatch, tmp_path):
+    monkeypatch.delenv(snapshot.ENVIRONMENT_VARIABLE, raising=False)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert snapshot.default_path() == str(tmp_path / 'citytime' / 'zones-{}.bin'.format(pytz.OLSON_VERSION))
+
+
+def test_main(tmp_path, capsys):
+    target = str(tmp_path / 'cli' / 'zones.bin')
+    snapshot.main([target, '-z', 'Asia/Tokyo', '-z', 'UTC'])
+    assert target in capsys.readouterr().out
+    assert Snapshot(target).zones() == sorted({'Asia/Tokyo', 'UTC', canonical_name('UTC')})
+
+
+def test_unknown_zone(tmp_path):
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        build_snapshot(str(tmp_path / 'zones.bin'), ['Mars/Olympus_Mons'])
+
+
+def shared_table(zone):
+    table = get_table(zone)
+    return isinstance(table.transitions, memoryview), list(table.offsets), local_fields([1.5e9], zone).hour
+
+
+@pytest.mark.parametrize('method', ['fork', 'spawn'])
+def test_shared_tables_in_pool(method):
+    with publish_shared(['Asia/Kolkata', 'Europe/Berlin']):
+        with multiprocessing.get_context(method).Pool(2) as pool:
+            results = pool.map(shared_table, ['Asia/Kolkata', 'Europe/Berlin', 'Asia/Tokyo'])
+    expected = [compile_table(zone, pytz.timezone(zone)).offsets for zone in ['Asia/Kolkata', 'Europe/Berlin', 'Asia/Tokyo']]
+    assert [shared for shared, _, _ in results] == [True, True, False]
+    assert [offsets for _, offsets, _ in results] == expected
+    assert [hour for _, _, hour in results] == [[8], [4], [11]]
+
+
+def test_publish_shared():
+    with publish_shared(ZONES) as shared:
+        assert os.environ[snapshot.SHARED_ENVIRONMENT_VARIABLE] == shared.name
+        assert tables._snapshot is shared.snapshot
+        assert isinstance(get_table('Europe/London').transitions, memoryview)
+        with attach_shared(install=False) as attached:
+            assert not attached.owner
+            assert attached.snapshot.zones() == sorted(set(ZONES) | {canonical_name(zone) for zone in ZONES})
+            assert list(attached.snapshot.table('Asia/Kolkata').offsets) == list(get_table('Asia/Kolkata').offsets)
+    assert snapshot.SHARED_ENVIRONMENT_VARIABLE not in os.environ
+    assert tables._snapshot is tables._UNSET
+    with pytest.raises(FileNotFoundError):
+        attach_shared(shared.name)
+
+
+def test_attach_from_another_process():
+    # A process that multiprocessing didn't start has a resource tracker of its own, which must
+    # neither unlink the block when the process exits nor warn about it.
+    env = dict(os.environ)
+    source = os.path.dirname(os.path.dirname(os.path.abspath(citytime.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [source, env.get('PYTHONPATH')]))
+    with publish_shared(['Asia/Kolkata']) as shared:
+        code = ('from citytime.snapshot import attach_shared\nfrom citytime.tables import get_table\n'
+                'attach_shared({!r})\nprint(list(get_table("Asia/Kolkata").offsets))').format(shared.name)
+        for _ in range(2):
+            result = subprocess.run([sys.executable, '-c', code], env=env, stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE, universal_newlines=True, check=True)
+            assert result.stdout.strip() == str(list(get_table('Asia/Kolkata').offsets))
+            assert result.stderr == ''
+        with attach_shared(shared.name, install=False) as attached:
+            assert attached.snapshot.zones() == ['Asia/Kolkata']
+
+
+def test_shared_tables_are_read_only():
+    with publish_shared(['UTC']) as shared:
+        with pytest.raises(TypeError):
+            shared.snapshot.table('UTC').offsets[0] = 1
+
+
+def test_stale_shared_tables(monkeypatch, caplog):
+    with publish_shared(['UTC']) as shared:
+        tables._snapshot = tables._UNSET
+        monkeypatch.setattr(pytz, 'OLSON_VERSION', '1999z')
+        monkeypatch.setenv(snapshot.ENVIRONMENT_VARIABLE, '')
+        with pytest.raises(SnapshotError):
+            attach_shared(shared.name)
+        assert open_default() is None
+        assert 'Ignoring shared zone tables' in caplog.text
@@ -0,0 +1,62 @@
+import datetime
+import pickle
+
+import pytz
+import pytest
+
+from citytime import CityTime, get_zone
+
+LOCAL_TIME = datetime.datetime(2018, 6, 1, 12, 30, 15, 250)
+MICROS = 1527870615000250
+
+
+def test_from_trusted():
+    expected = CityTime(LOCAL_TIME, 'America/New_York')
+    zone = get_zone('America/New_York')
+    for ct in (CityTime.from_trusted(MICROS, zone), CityTime.from_trusted(MICROS, zone.id)):
+        assert ct == expected
+        assert ct.is_set()
+        assert ct.zone() is zone
+        assert ct.local() == expected.local()
+        assert ct.utc().tzinfo is pytz.utc
+        assert str(ct) == str(expected)
+        assert pickle.loads(pickle.dumps(ct)) == expected
+    assert CityTime.from_trusted(-1, get_zone('UTC')).utc() == datetime.datetime(
+        1969, 12, 31, 23, 59, 59, 999999, tzinfo=pytz.utc)
+
+
+def test_from_trusted_zoneinfo():
+    zone = get_zone('America/New_York', backend='zoneinfo')
+    ct = CityTime.from_trusted(MICROS, zone)
+    assert ct == CityTime(LOCAL_TIME, 'America/New_York', backend='zoneinfo')
+    assert ct.local().replace(tzinfo=None) == LOCAL_TIME
+    assert ct.utc().tzinfo is zone.backend.utc
+
+
+def test_from_trusted_unknown_id():
+    with pytest.raises(IndexError):
+        CityTime.from_trusted(MICROS, -1)
+
+
+def test_from_utc():
+    zone = get_zone('Asia/Tokyo')
+    expected = CityTime(LOCAL_TIME, 'America/New_York')
+    ct = CityTime.from_utc(expected.utc(), zone)
+    assert ct == expected
+    assert ct.timezone() == 'Asia/Tokyo'
+    assert ct.local().hour == 1
+
+
+def test_from_trusted_many():
+    zone = get_zone('Europe/London')
+    micros = [MICROS + i * 3600000000 for i in range(5)]
+    result = CityTime.from_trusted_many(micros, zone)
+    assert result == [CityTime.from_trusted(value, zone) for value in micros]
+    assert all(ct.zone() is zone for ct in result)
+    assert CityTime.from_trusted_many(micros, zone.id) == result
+
+    zone_ids = [get_zone(name).id for name in ('Asia/Tokyo', 'UTC', 'Asia/Tokyo', 'Europe/London', 'UTC')]
+    mixed = CityTime.from_trusted_many(micros, zone_ids)
+    assert mixed == result
+    assert [ct.timezone() for ct in mixed] == ['Asia/Tokyo', 'UTC', 'Asia/Tokyo', 'Europe/London', 'UTC']
+    assert CityTime.from_trusted_many([], zone) == []
@@ -0,0 +1,130 @@
+import datetime
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+import pytz
+import pytest
+
+import citytime
+from citytime import CityTime
+from citytime.tables import get_table
+from citytime.validation import AMBIGUOUS, NON_EXISTENT, OK, resolve_offset, validate_local
+
+ZONES = ['America/New_York', 'Europe/London', 'Australia/Lord_Howe', 'Asia/Kolkata', 'America/St_Johns', 'UTC']
+
+WALL_TIMES = st.datetimes(min_value=datetime.datetime(1900, 1, 2), max_value=datetime.datetime(2100, 1, 1))
+
+
+def pytz_status(wall_time, zone):
+    tz = pytz.timezone(zone)
+    try:
+        tz.localize(wall_time, is_dst=None)
+        return OK
+    except pytz.exceptions.AmbiguousTimeError:
+        return AMBIGUOUS
+    except pytz.exceptions.NonExistentTimeError:
+        return NON_EXISTENT
+
+
+@settings(max_examples=300)
+@given(st.sampled_from(ZONES), WALL_TIMES)
+def test_matches_pytz(zone, wall_time):
+    result = validate_local([wall_time], zone)
+    status, candidates = result.status[0], result.candidates[0]
+    assert status == pytz_status(wall_time, zone)
+    tz = pytz.timezone(zone)
+    if status == OK:
+        assert candidates == (tz.localize(wall_time).astimezone(pytz.utc),)
+    else:
+        assert set(candidates) == {tz.localize(wall_time, is_dst=dst).astimezone(pytz.utc) for dst in (True, False)}
+        assert candidates[0] < candidates[1]
+
+
+@settings(max_examples=100)
+@given(st.sampled_from(ZONES), st.datetimes(min_value=datetime.datetime(2000, 1, 1),
+                                            max_value=datetime.datetime(2030, 1, 1)))
+def test_hours_around_transitions(zone, wall_time):
+    # Most random wall times are far from a transition; check every quarter hour of a day.
+    day = [wall_time + datetime.timedelta(minutes=15 * i) for i in range(96)]
+    assert validate_local(day, zone).status == [pytz_status(moment, zone) for moment in day]
+
+
+def test_new_york():
+    wall_times = [
+        datetime.datetime(2018, 3, 11, 1, 59),
+        datetime.datetime(2018, 3, 11, 2, 30),
+        datetime.datetime(2018, 11, 4, 1, 30),
+        datetime.datetime(2018, 11, 4, 2, 30),
+    ]
+    result = validate_local(wall_times, 'America/New_York')
+    assert result.status == [OK, NON_EXISTENT, AMBIGUOUS, OK]
+    assert result.candidates[1] == (
+        datetime.datetime(2018, 3, 11, 6, 30, tzinfo=pytz.utc),
+        datetime.datetime(2018, 3, 11, 7, 30, tzinfo=pytz.utc),
+    )
+    assert result.candidates[2] == (
+        datetime.datetime(2018, 11, 4, 5, 30, tzinfo=pytz.utc),
+        datetime.datetime(2018, 11, 4, 6, 30, tzinfo=pytz.utc),
+    )
+    assert citytime.validate_local is validate_local
+
+
+def test_unknown_zone():
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        validate_local([datetime.datetime(2018, 1, 1)], 'Mars/Olympus_Mons')
+
+
+def test_try_set():
+    ct = CityTime()
+    result = ct.try_set(datetime.datetime(2018, 3, 11, 2, 30), 'America/New_York')
+    assert not result.ok
+    assert result.status == NON_EXISTENT
+    assert not ct.is_set()
+
+    result = ct.try_set(datetime.datetime(2018, 11, 4, 1, 30), 'America/New_York')
+    assert result.status == AMBIGUOUS
+    assert not ct.is_set()
+    ct.set(result.candidates[0], 'America/New_York')
+    assert ct.local().tzname() == 'EDT'
+
+    result = ct.try_set(datetime.datetime(2018, 6, 1, 12, 30, 15, 250), 'America/New_York')
+    assert result.ok
+    assert ct == CityTime(datetime.datetime(2018, 6, 1, 12, 30, 15, 250), 'America/New_York')
+    assert ct.utc() == result.candidates[0]
+    assert ct.timezone() == 'America/New_York'
+
+    utc = datetime.datetime(2018, 6, 1, 12, tzinfo=pytz.utc)
+    assert ct.try_set(utc, 'Asia/Tokyo').ok
+    assert ct.utc() == utc and ct.timezone() == 'Asia/Tokyo'
+
+
+def test_try_set_leaves_object_alone():
+    ct = CityTime(datetime.datetime(2018, 6, 1, 12), 'Europe/London')
+    before = ct.copy()
+    assert not ct.try_set(datetime.datetime(2018, 3, 25, 1, 30), 'Europe/London').ok
+    assert ct == before and ct.timezone() == 'Europe/London'
+
+
+def test_try_set_errors():
+    ct = CityTime()
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        ct.try_set(datetime.datetime(2018, 1, 1), 'Mars/Olympus_Mons')
+    with pytest.raises(TypeError):
+        ct.try_set('2018-01-01', 'UTC')
+
+
+def test_try_set_zoneinfo():
+    ct = CityTime()
+    result = ct.try_set(datetime.datetime(2018, 6, 1, 12), 'America/New_York', backend='zoneinfo')
+    assert result.ok
+    assert ct == CityTime(datetime.datetime(2018, 6, 1, 12), 'America/New_York')
+    assert not ct.try_set(datetime.datetime(2018, 3, 11, 2, 30), 'America/New_York', backend='zoneinfo').ok
+
+
+def test_resolve_offset():
+    table = get_table('America/New_York')
+    assert resolve_offset(table, datetime.datetime(2018, 6, 1, 12)) == -4 * 3600
+    # Skipped: taken with the offset before the gap, i.e. an hour later on the wall clock.
+    assert resolve_offset(table, datetime.datetime(2018, 3, 11, 2, 30)) == -5 * 3600
+    # Repeated: the first occurrence.
+    assert resolve_offset(table, datetime.datetime(2018, 11, 4, 1, 30)) == -4 * 3600
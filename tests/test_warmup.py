@@ -0,0 +1,69 @@
+import logging
+
+import pytz
+import pytest
+
+import citytime
+from citytime import get_zone, zones
+from citytime.tables import get_table
+from citytime.warmup import WarmUpReport, warm_up, warm_up_in_background
+
+ZONES = ['Asia/Kolkata', 'America/New_York', 'Europe/Berlin']
+
+
+def test_warm_up():
+    report = warm_up(ZONES)
+    assert isinstance(report, WarmUpReport)
+    assert report.zones == ZONES
+    assert report.unknown == []
+    assert set(report.per_zone) == set(ZONES)
+    assert report.seconds >= sum(report.per_zone.values())
+    for zone in ZONES:
+        interned = zones._LOOKUP['pytz', zone]
+        assert interned is get_zone(zone, 'pytz')
+        assert interned.tzinfo is pytz.timezone(zone)
+        assert interned._table is get_table(zone)
+
+
+def test_warm_up_unknown_zone(caplog):
+    report = warm_up(['Mars/Olympus_Mons', 'UTC'])
+    assert report.zones == ['UTC']
+    assert report.unknown == ['Mars/Olympus_Mons']
+    assert 'Mars/Olympus_Mons' in caplog.text
+
+
+def test_warm_up_common_zones(caplog):
+    with caplog.at_level(logging.INFO, logger='citytime'):
+        report = warm_up(tables=False)
+    assert report.zones == list(pytz.common_timezones)
+    assert 'Warmed up {} zones'.format(len(report.zones)) in caplog.text
+
+
+def test_warm_up_zoneinfo():
+    zoneinfo = pytest.importorskip('zoneinfo')
+    warm_up(['Asia/Tokyo'], backend='zoneinfo', tables=False)
+    tz = zones._LOOKUP['zoneinfo', 'Asia/Tokyo'].tzinfo
+    assert isinstance(tz, zoneinfo.ZoneInfo)
+    # Kept alive, so zoneinfo hands out the cached instance.
+    for i in range(20):
+        zoneinfo.ZoneInfo('Etc/GMT+{}'.format(i % 12))
+    assert zoneinfo.ZoneInfo('Asia/Tokyo') is tz
+
+
+def test_warm_up_in_background():
+    thread = warm_up_in_background(ZONES, tables=False)
+    assert thread.daemon
+    report = thread.wait(timeout=30)
+    assert not thread.is_alive()
+    assert report is thread.report
+    assert report.zones == ZONES
+
+
+def test_package_exports():
+    assert citytime.warm_up is warm_up
+    assert citytime.warm_up_in_background is warm_up_in_background
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        warm_up(ZONES, backend='dateutil')
@@ -0,0 +1,94 @@
+import datetime
+
+import hypothesis.strategies as st
+from hypothesis import given, settings
+import pytz
+import pytest
+
+from citytime import CityTime, worldclock
+from citytime.tables import clear_tables
+from citytime.worldclock import ZoneTimes, local_times
+from citytime.zones import get_zone
+
+UTC_TIMES = st.datetimes(
+    min_value=datetime.datetime(1800, 1, 1),
+    max_value=datetime.datetime(2100, 1, 1),
+    timezones=st.just(pytz.utc),
+)
+
+ZONES = ['America/New_York', 'US/Eastern', 'Europe/London', 'Asia/Kolkata', 'Australia/Lord_Howe',
+         'Pacific/Chatham', 'America/St_Johns', 'EST', 'UTC', 'Etc/GMT+5', 'Africa/Casablanca']
+
+
+def city_time(dt, backend='pytz'):
+    return CityTime(dt, 'UTC', backend=backend)
+
+
+@settings(max_examples=30)
+@given(UTC_TIMES)
+def test_astimezone_all(dt):
+    ct = city_time(dt)
+    times = ct.astimezone_all()
+    assert isinstance(times, ZoneTimes)
+    assert times.zones == list(pytz.common_timezones)
+    for zone, local, offset, abbreviation in zip(*times):
+        expected = ct.astimezone(zone)
+        assert local == expected
+        assert local.tzinfo is expected.tzinfo
+        assert local.replace(tzinfo=None) == expected.replace(tzinfo=None)
+        assert offset == expected.utcoffset().total_seconds()
+        assert abbreviation == expected.tzname()
+
+
+@given(UTC_TIMES, st.sampled_from(['pytz', 'zoneinfo']))
+def test_astimezone_many(dt, backend):
+    ct = city_time(dt, backend)
+    times = ct.astimezone_many(ZONES)
+    for zone, local, offset, abbreviation in zip(ZONES, times.local, times.offsets, times.abbreviations):
+        expected = ct.astimezone(zone)
+        assert local.replace(tzinfo=None) == expected.replace(tzinfo=None)
+        assert local.tzinfo is expected.tzinfo
+        assert offset == expected.utcoffset().total_seconds()
+        assert abbreviation == expected.tzname()
+
+
+def test_dst_boundary():
+    before = datetime.datetime(2018, 3, 11, 6, 59, 59, 999999, tzinfo=pytz.utc)
+    after = datetime.datetime(2018, 3, 11, 7, tzinfo=pytz.utc)
+    assert local_times(before, ['America/New_York']).local[0].hour == 1
+    assert local_times(after, ['America/New_York']).offsets == [-4 * 3600]
+    assert local_times(after, ['America/New_York']).local[0].hour == 3
+
+
+def test_zone_objects_and_names():
+    ct = city_time(datetime.datetime(2018, 6, 1, tzinfo=pytz.utc))
+    times = ct.astimezone_many([get_zone('asia/tokyo'), 'us/eastern'])
+    assert times.zones == ['Asia/Tokyo', 'US/Eastern']
+    assert [local.hour for local in times.local] == [9, 20]
+
+
+def test_entries_follow_tables():
+    # One entry per interned Zone, whatever name it was given by, and none of them survive a
+    # change of the tables.
+    utc = datetime.datetime(2018, 6, 1, tzinfo=pytz.utc)
+    local_times(utc, ['Asia/Tokyo', 'asia/tokyo', get_zone('Asia/Tokyo')])
+    assert [zone.name for zone in worldclock._ENTRIES].count('Asia/Tokyo') == 1
+    clear_tables()
+    assert worldclock._ENTRIES == {}
+    assert local_times(utc, ['asia/tokyo']).offsets == [9 * 3600]
+    assert worldclock._ENTRIES[get_zone('Asia/Tokyo')][1] is get_zone('Asia/Tokyo').table.transitions
+
+
+def test_other_timezone_input():
+    dt = datetime.datetime(2018, 6, 1, 12, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+    assert local_times(dt, ['UTC']).local[0] == dt
+    assert local_times(dt, ['UTC']).local[0].hour == 10
+
+
+def test_empty_and_errors():
+    ct = city_time(datetime.datetime(2018, 6, 1, tzinfo=pytz.utc))
+    assert ct.astimezone_many([]) == ZoneTimes([], [], [], [])
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        ct.astimezone_many(['UTC', 'Mars/Olympus_Mons'])
+    with pytest.raises(ValueError):
+        CityTime().astimezone_many(['UTC'])
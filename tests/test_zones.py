@@ -0,0 +1,106 @@
+import datetime
+import pickle
+from collections import defaultdict
+
+import pytz
+import pytest
+
+from citytime import CityTime, zones
+from citytime.backends import get_backend
+from citytime.tables import clear_tables, get_table
+from citytime.zones import Zone, get_zone, zone_by_id
+
+LOCAL_TIME = datetime.datetime(2018, 6, 1, 12, 30)
+
+
+def test_get_zone_is_interned():
+    zone = get_zone('Asia/Kolkata')
+    assert isinstance(zone, Zone)
+    assert get_zone('Asia/Kolkata') is zone
+    assert get_zone('asia/kolkata') is zone
+    assert get_zone(zone) is zone
+    assert zone.name == 'Asia/Kolkata'
+    assert str(zone) == 'Asia/Kolkata'
+    assert repr(zone) == 'Zone("Asia/Kolkata")'
+    assert zone.tzinfo is pytz.timezone('Asia/Kolkata')
+    assert zone.backend is get_backend('pytz')
+    assert zone_by_id(zone.id) is zone
+
+
+def test_zone_per_backend():
+    pytz_zone = get_zone('Europe/Paris', 'pytz')
+    zoneinfo_zone = get_zone('Europe/Paris', 'zoneinfo')
+    assert pytz_zone is not zoneinfo_zone
+    assert pytz_zone.id != zoneinfo_zone.id
+    assert get_zone(pytz_zone, 'zoneinfo') is zoneinfo_zone
+    assert get_zone('europe/paris', 'zoneinfo') is zoneinfo_zone
+
+
+def test_unknown_zone():
+    with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+        get_zone('Mars/Olympus_Mons')
+    with pytest.raises(IndexError):
+        zone_by_id(-1)
+    with pytest.raises(IndexError):
+        zone_by_id(len(zones._BY_ID))
+
+
+def test_zone_table():
+    zone = get_zone('America/Sao_Paulo')
+    assert zone.table is get_table('America/Sao_Paulo')
+    assert zone.table is zone.table
+    stale = zone.table
+    clear_tables()
+    assert zone.table is get_table('America/Sao_Paulo') and zone.table is not stale
+
+
+def test_citytimes_share_zone():
+    a = CityTime(LOCAL_TIME, 'Asia/Tokyo')
+    b = CityTime(LOCAL_TIME + datetime.timedelta(hours=5), 'asia/tokyo')
+    assert a.zone() is b.zone()
+    assert b.timezone() == 'Asia/Tokyo'
+    for other in (a.copy(), CityTime(a), a + datetime.timedelta(hours=1), a - datetime.timedelta(hours=1)):
+        assert other.zone() is a.zone()
+    c = CityTime(LOCAL_TIME, 'UTC')
+    c.change_tz('Asia/Tokyo')
+    assert c.zone() is a.zone()
+
+
+def test_citytime_with_zone_object():
+    zone = get_zone('Australia/Sydney')
+    ct = CityTime(LOCAL_TIME, zone)
+    assert ct.zone() is zone
+    assert ct == CityTime(LOCAL_TIME, 'Australia/Sydney')
+    assert ct.astimezone(get_zone('UTC')) == ct.utc()
+    assert CityTime('2018-06-01T12:30:00', zone).zone() is zone
+
+
+def test_citytime_zone_of_other_backend():
+    ct = CityTime(LOCAL_TIME, get_zone('Asia/Tokyo', 'zoneinfo'), backend='pytz')
+    assert ct.zone() is get_zone('Asia/Tokyo', 'pytz')
+
+
+def test_group_by_zone():
+    names = ['Asia/Tokyo', 'Europe/Berlin', 'America/Chicago']
+    times = [CityTime(LOCAL_TIME + datetime.timedelta(hours=i), names[i % 3]) for i in range(30)]
+    groups = defaultdict(list)
+    for ct in times:
+        groups[ct.zone()].append(ct)
+    assert sorted(zone.name for zone in groups) == sorted(names)
+    assert all(len(group) == 10 for group in groups.values())
+
+
+def test_pickle():
+    for backend in ('pytz', 'zoneinfo'):
+        ct = CityTime(LOCAL_TIME, 'Europe/Berlin', backend=backend)
+        clone = pickle.loads(pickle.dumps(ct))
+        assert clone == ct
+        assert clone.zone() is ct.zone()
+        assert clone.local() == ct.local()
+
+
+def test_blank_citytime_has_no_zone():
+    ct = CityTime()
+    assert not ct.is_set()
+    with pytest.raises(ValueError):
+        ct.zone()